@@ -0,0 +1,279 @@
+# api.py
+"""
+API JSON headless (ASGI: Starlette + uvicorn) di samping UI Streamlit.
+
+Memakai resource proses yang sama dengan app.py (resources.get_resources():
+katalog terkompilasi, pool kandidat, scaler + model, grid status) — tanpa
+re-eksekusi script Streamlit per request. Langkah CPU-bound (prediksi,
+scoring/sampling, PDF) dijalankan di thread pool terpisah sehingga event loop
+tetap menerima koneksi; prediksi di luar grid ikut di-batch oleh
+inference.BatchingPredictor, PDF memakai cache + worker report_pdf.
+
+Batas: render PDF (ReportLab, Python murni) memegang GIL, jadi thread pool tidak
+membuat /v1/report.pdf paralel — render yang cache-nya miss tetap berjalan satu
+per satu per proses (thread hanya menjaga event loop dan endpoint lain tetap
+responsif). Throughput PDF naik lewat --processes, bukan --threads.
+
+    python api.py --port 8600 [--threads 8] [--processes 1]
+
+Endpoint (body JSON: gender "Male"/"Female", age bulat 15–59, height m 1.5–2.0,
+weight kg 40–130, activity = label PAL form):
+    GET  /healthz
+    GET  /metrics            histogram per tahap (telemetry, format Prometheus)
+    POST /v1/status          {gender, age, height, weight}
+    POST /v1/energy          + activity [, status]
+    POST /v1/recommend       + activity [, top_n=10, seed]
+    POST /v1/report.pdf      sama dengan /v1/recommend → application/pdf
+
+Konfigurasi via environment:
+    EDUNUTRI_API_THREADS   ukuran thread pool (default 8)
+
+Load test: benchmarks/bench_api.py.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+import telemetry
+from energy import PAL_LEVELS, estimasi_waktu_perubahan_berat
+from nutrition_profile import get_profile
+from recommender import STATUS_GIZI, recommend_menu_demographic
+from report_pdf import REPORTLAB_AVAILABLE, get_pdf_bytes, pdf_inputs
+from resources import get_resources
+from status_grid import predict_status
+
+DEFAULT_THREADS = int(os.environ.get('EDUNUTRI_API_THREADS', 8))
+MAX_TOP_N = 50
+
+_executor = None
+
+
+# ---------------------------------------------
+# Validasi input (domain sama dengan form app.py)
+# ---------------------------------------------
+def _number(body, key, lo, hi, cast=float):
+    # JSON true/false bukan angka (float(True) == 1.0 akan lolos diam-diam)
+    if isinstance(body.get(key), bool):
+        raise ValueError(f"'{key}' harus berupa angka")
+    try:
+        value = cast(body[key])
+    except KeyError:
+        raise ValueError(f"'{key}' wajib diisi")
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' harus berupa angka")
+    if not lo <= value <= hi:
+        raise ValueError(f"'{key}' harus di rentang {lo}–{hi}")
+    return value
+
+
+def _integer(body, key, lo, hi):
+    # Seperti number_input form (step 1): 25.9 ditolak, bukan dipotong jadi 25
+    value = _number(body, key, lo, hi)
+    if not value.is_integer():
+        raise ValueError(f"'{key}' harus bilangan bulat")
+    return int(value)
+
+
+def parse_user(body, need_activity=True):
+    if not isinstance(body, dict):
+        raise ValueError("body harus objek JSON")
+    gender = body.get('gender')
+    if gender not in ("Male", "Female"):
+        raise ValueError("'gender' harus 'Male' atau 'Female'")
+    user = {
+        'gender': gender,
+        'age': _integer(body, 'age', 15, 59),
+        'height': _number(body, 'height', 1.5, 2.0),
+        'weight': _number(body, 'weight', 40, 130),
+    }
+    if need_activity:
+        if body.get('activity') not in PAL_LEVELS:
+            raise ValueError(f"'activity' harus salah satu dari: {', '.join(PAL_LEVELS)}")
+        user['activity'] = body['activity']
+    return user
+
+
+# ---------------------------------------------
+# Langkah sinkron (dijalankan di thread pool)
+# ---------------------------------------------
+def status_of(user, res=None):
+    res = res or get_resources()
+    with telemetry.stage('predict'):
+        status = predict_status(res, user['gender'], user['age'], user['height'], user['weight'])
+    return {'status': status, 'bmi': user['weight'] / user['height'] ** 2}
+
+
+def energy_of(user, status):
+    """(NutritionProfile, estimasi minggu) — profil yang sama dipakai scoring menu dan PDF."""
+    with telemetry.stage('energy'):
+        profil = get_profile(user['gender'], user['age'], user['height'], user['weight'], user['activity'], status)
+        energi = profil.energi
+        minggu = estimasi_waktu_perubahan_berat(status, user['weight'], energi.berat_min, energi.berat_max,
+                                                energi.tee, energi.tee_min, energi.tee_max)
+    return profil, [float(x) for x in minggu]
+
+
+def _energy_json(profil):
+    return {**profil.energi.to_dict(), 'kalori_target': profil.kalori_target}
+
+
+def recommend(user, top_n=10, seed=None):
+    res = get_resources()
+    out = status_of(user, res)
+    profil, minggu = energy_of(user, out['status'])
+    with telemetry.stage('recommend'):
+        menus = recommend_menu_demographic(res.catalog, out['status'], user['gender'], user['age'],
+                                           user['activity'], top_n=top_n, rng=np.random.default_rng(seed),
+                                           profile=profil)
+    return {**out, 'energy': _energy_json(profil), 'weeks_to_target': minggu,
+            'menus': menus.to_dict(orient='records')}, profil, menus
+
+
+def report_pdf(user, top_n=10, seed=None):
+    _, profil, menus = recommend(user, top_n, seed)
+    user_inputs, metrics = pdf_inputs(profil)
+    df = menus[['image', 'Menu', 'kcal', 'protein', 'fat', 'carbs', 'fibre']]
+    return get_pdf_bytes(user_inputs, metrics, df)
+
+
+# ---------------------------------------------
+# Handler ASGI
+# ---------------------------------------------
+async def _run(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+async def _body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        raise ValueError("body bukan JSON yang valid")
+
+
+def _error(exc, code=400):
+    return JSONResponse({'error': str(exc)}, status_code=code)
+
+
+def _options(body):
+    top_n = _integer(body, 'top_n', 1, MAX_TOP_N) if 'top_n' in body else 10
+    seed = body.get('seed')
+    # np.random.default_rng hanya menerima bilangan bulat >= 0 (JSON int = int Python; bool ditolak)
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        raise ValueError("'seed' harus bilangan bulat >= 0")
+    return top_n, seed
+
+
+async def server_error(request, exc):
+    # Error tak terduga di handler/thread pool → bentuk JSON yang sama dengan error 400
+    return _error(f"kesalahan internal server ({type(exc).__name__})", 500)
+
+
+async def healthz(request):
+    return JSONResponse({'ok': True})
+
+
+async def metrics(request):
+    return PlainTextResponse(telemetry.to_prometheus())
+
+
+async def status_endpoint(request):
+    try:
+        user = parse_user(await _body(request), need_activity=False)
+    except ValueError as exc:
+        return _error(exc)
+    return JSONResponse(await _run(status_of, user))
+
+
+async def energy_endpoint(request):
+    try:
+        body = await _body(request)
+        user = parse_user(body)
+        status = body.get('status')
+        if status is not None and status not in STATUS_GIZI:
+            raise ValueError(f"'status' harus salah satu dari: {', '.join(STATUS_GIZI)}")
+    except ValueError as exc:
+        return _error(exc)
+    if status is None:
+        status = (await _run(status_of, user))['status']
+    profil, minggu = energy_of(user, status)  # aritmetika skalar, tidak perlu thread pool
+    return JSONResponse({'status': status, 'energy': _energy_json(profil), 'weeks_to_target': minggu})
+
+
+async def recommend_endpoint(request):
+    try:
+        body = await _body(request)
+        user = parse_user(body)
+        top_n, seed = _options(body)
+    except ValueError as exc:
+        return _error(exc)
+    result, _, _ = await _run(recommend, user, top_n, seed)
+    return JSONResponse(result)
+
+
+async def report_endpoint(request):
+    if not REPORTLAB_AVAILABLE:
+        return _error("reportlab belum terpasang", 503)
+    try:
+        body = await _body(request)
+        user = parse_user(body)
+        top_n, seed = _options(body)
+    except ValueError as exc:
+        return _error(exc)
+    # Render terikat GIL: thread pool hanya menjaga event loop, paralelisme lewat --processes
+    data = await _run(report_pdf, user, top_n, seed)
+    return Response(data, media_type='application/pdf')
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global _executor
+    _executor = ThreadPoolExecutor(max_workers=DEFAULT_THREADS, thread_name_prefix='edunutri-api')
+    # Muat katalog + model sebelum menerima request pertama
+    await _run(get_resources)
+    yield
+    _executor.shutdown(wait=False, cancel_futures=True)
+
+
+app = Starlette(
+    routes=[
+        Route('/healthz', healthz),
+        Route('/metrics', metrics),
+        Route('/v1/status', status_endpoint, methods=['POST']),
+        Route('/v1/energy', energy_endpoint, methods=['POST']),
+        Route('/v1/recommend', recommend_endpoint, methods=['POST']),
+        Route('/v1/report.pdf', report_endpoint, methods=['POST']),
+    ],
+    exception_handlers={Exception: server_error},
+    lifespan=lifespan,
+)
+
+
+def main(argv=None):
+    global DEFAULT_THREADS
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8600)
+    ap.add_argument('--threads', type=int, default=DEFAULT_THREADS, help='thread pool per proses')
+    ap.add_argument('--processes', type=int, default=1,
+                    help='proses uvicorn (tiap proses memuat resource sendiri; untuk >1 core)')
+    args = ap.parse_args(argv)
+
+    import uvicorn
+    os.environ['EDUNUTRI_API_THREADS'] = str(args.threads)
+    DEFAULT_THREADS = args.threads
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    uvicorn.run('api:app' if args.processes > 1 else app, host=args.host, port=args.port,
+                workers=args.processes, log_level='warning')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,367 +1,105 @@
 # app.py
-import joblib
 import streamlit as st
 import pandas as pd
 import numpy as np
-import re
 from scipy.stats import randint
 import plotly.graph_objects as go
-from PIL import Image, UnidentifiedImageError
-import os
+from PIL import Image
 import time
 # import base64
 # import streamlit.components.v1 as components
-import io
 import datetime
-# ==== Optional PDF engine (ReportLab) ====
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer, Image as RLImage
-    from reportlab.lib.styles import getSampleStyleSheet
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
+import hashlib
+import io
+import os
+from resources import get_resources, warmup
+from status_grid import predict_status
+from report_pdf import REPORTLAB_AVAILABLE, get_pdf_bytes, pdf_inputs, prefetch_pdf
+from thumbnails import SIZE_UI, get_thumbnail_index, thumbnail_url
+from recommender import NUTRIENT_COLS, recommend_menu_demographic
+from meal_plan import NO_REPEAT_DAYS, WeeklyPlanner, optimize_daily_plan, plan_targets
+from energy import DEFAULT_ACTIVITY, PAL_LEVELS, estimasi_waktu_perubahan_berat, kalori_target
+from nutrition_profile import get_profile
+from session_cache import get_session_cache
+from cohort import analyze_cohort
+import telemetry
 
 
 # ---------------------------------------------
 # 1. Load & Prepare Data + Model (Offline)
 # ---------------------------------------------
-bmi_df = pd.read_csv('bmi_dataset.csv')
-nutri_df = pd.read_csv('dataset_nutrients.csv')
-
-# Rename kolom bmi dataset agar seragam
-bmi_df.rename(columns={
-    'Weight (kg)': 'WeightKg',
-    'Height (m)': 'HeightM'
-}, inplace=True)
-
-# Hitung BMI jika belum ada
-if 'BMI' not in bmi_df.columns:
-    bmi_df['BMI'] = bmi_df['WeightKg'] / (bmi_df['HeightM'] ** 2)
-
-# Label encoding gender
-le = "Models/label_encoder.pkl"
-
-# Klasifikasi BMI → status gizi
-def klasifikasi_bmi(bmi):
-    if bmi < 18.5:   return 'Underweight'
-    if bmi < 25.0:   return 'Normal'
-    if bmi < 30.0:   return 'Overweight'
-    return 'Obesity'
-bmi_df['WeightStatus'] = bmi_df['BMI'].apply(klasifikasi_bmi)
-
-# Persiapkan fitur & target
-features = ['Gender', 'Age', 'HeightM', 'WeightKg']
-X = bmi_df[features]
-y = bmi_df['WeightStatus']
-
-# Standardisasi
-scaler = joblib.load('Models/scaler.pkl')
-
-# Tuning Random Forest (RandomizedSearchCV)
-best_rf = joblib.load('Models/random_forest_model.pkl')
-
-# Siapkan kolom Menu di nutri_df
-
-
-def extract_menu_name(filename):
-    """
-    Ekstrak nama menu bersih dari filename:
-    1) Buang ekstensi (.jpg/.jpeg/.png)
-    2) Hapus segmen terakhir (setelah hyphen terakhir) — biasanya hash atau angka acak
-    3) Hapus semua angka yang tersisa
-    4) Ganti '-' dan '_' menjadi spasi; rapikan spasi ganda
-    """
-    # Abaikan file generik
-    if filename.startswith("recipe-image-legacy-id"):
-        return None
-
-    # 1) Hapus ekstensi gambar
-    name = re.sub(r'\.(jpe?g|png)$', '', filename, flags=re.IGNORECASE)
-
-    # 2) Hapus segmen terakhir (setelah hyphen terakhir)
-    #    Contoh: "cod-cucumber-avocado-mango-salsa-salad-517846e" -> "cod-cucumber-avocado-mango-salsa-salad"
-    name = re.sub(r'-[^-]+$', '', name)
-
-    # 3) Hapus semua digit yang tersisa di seluruh string
-    name = re.sub(r'\d+', '', name)
-
-    # 4) Ganti '-' dan '_' menjadi spasi
-    name = name.replace('-', ' ').replace('_', ' ')
-
-    # Rapikan spasi ganda dan trim
-    name = re.sub(r'\s+', ' ', name).strip()
-
-    return name
-
-nutri_df['Menu'] = nutri_df['image'].apply(extract_menu_name)
-nutri_df.dropna(subset=['Menu'], inplace=True)
-nutri_df.drop_duplicates(subset=['Menu'], inplace=True)
-
-# ===============================
-# Tabel AKG berdasar Permenkes 2019
-# ===============================
-akg_df = pd.DataFrame([
-    # Baris untuk laki-laki (Male)
-    {"Gender": "Male", "AgeMin": 13, "AgeMax": 15, "Energy": 2400, "Protein": 70, "Fat": 80, "Carbs": 350, "Fibre": 34},
-    {"Gender": "Male", "AgeMin": 16, "AgeMax": 18, "Energy": 2650, "Protein": 75, "Fat": 85, "Carbs": 400, "Fibre": 37},
-    {"Gender": "Male", "AgeMin": 19, "AgeMax": 29, "Energy": 2650, "Protein": 65, "Fat": 75, "Carbs": 430, "Fibre": 37},
-    {"Gender": "Male", "AgeMin": 30, "AgeMax": 49, "Energy": 2550, "Protein": 65, "Fat": 70, "Carbs": 415, "Fibre": 36},
-    {"Gender": "Male", "AgeMin": 50, "AgeMax": 64, "Energy": 2150, "Protein": 65, "Fat": 60, "Carbs": 340, "Fibre": 30},
-
-    # Baris untuk perempuan (Female)
-    {"Gender": "Female", "AgeMin": 13, "AgeMax": 15, "Energy": 2050, "Protein": 65, "Fat": 70, "Carbs": 300, "Fibre": 29},
-    {"Gender": "Female", "AgeMin": 16, "AgeMax": 18, "Energy": 2100, "Protein": 65, "Fat": 70, "Carbs": 300, "Fibre": 29},
-    {"Gender": "Female", "AgeMin": 19, "AgeMax": 29, "Energy": 2250, "Protein": 60, "Fat": 65, "Carbs": 360, "Fibre": 32},
-    {"Gender": "Female", "AgeMin": 30, "AgeMax": 49, "Energy": 2150, "Protein": 60, "Fat": 60, "Carbs": 340, "Fibre": 30},
-    {"Gender": "Female", "AgeMin": 50, "AgeMax": 64, "Energy": 1800, "Protein": 60, "Fat": 50, "Carbs": 280, "Fibre": 25},
-])
-
-# ============================================
-# Fungsi untuk mengambil AKG user dari tabel di atas
-# ============================================
-def get_user_akg(gender: str, age: int) -> dict:
-    # Filter baris dari akg_df yang sesuai gender dan rentang umur
-    row = akg_df[
-        (akg_df['Gender'] == gender) &
-        (akg_df['AgeMin'] <= age) &
-        (akg_df['AgeMax'] >= age)
-    ]
-    # Jika cocok, kembalikan sebagai dict
-    return row.iloc[0].to_dict() if not row.empty else None
-
-# ==============================================================
-# Fungsi utama untuk memberikan rekomendasi makanan berbasis demografi
-# ==============================================================
-
-def recommend_menu_demographic(nutri_df, status_gizi, gender, age, activity, top_n=10):
-    # 1. Ambil nilai AKG user dari tabel berdasarkan gender dan umur
-    akg = get_user_akg(gender, age)
-    if akg is None:
-        return pd.DataFrame(columns=['Menu', 'kcal', 'protein', 'fat', 'carbs', 'fibre'])
-
-    # 2. Penyesuaian kalori berdasarkan status gizi
-    kalori_target = akg['Energy']
-    if status_gizi == 'Underweight':
-        kalori_target += 500
-    elif status_gizi in ['Overweight', 'Obesity']:
-        kalori_target -= 500
-    # Untuk status Normal → tidak diubah
-
-    # 3. Hitung target makro menggunakan % IOM 2005 (tengah)
-    karbo_target = (0.55 * kalori_target) / 4
-    protein_target = (0.20 * kalori_target) / 4
-    lemak_target = (0.25 * kalori_target) / 9
-
-    # 4. FILTERING awal — buang menu terlalu rendah nutrisinya
-    filt = nutri_df[
-        (nutri_df['kcal'] > 50) &
-        (nutri_df['protein'] > 1) &
-        (nutri_df['fat'] > 1) &
-        (nutri_df['carbs'] > 5)
-    ].copy()
-
-    # 5. SCORING nutrisi — skor tinggi jika lebih dekat ke target
-    # contoh kasar: tol_karbo = 0.65-0.45 = 0.20, tol_protein = 0.35-0.10 = 0.25, tol_lemak = 0.35-0.20 = 0.15
-    w_cals = 1/0.10   # misal toleransi kalori 10% dari target
-    w_c   = 1/0.20
-    w_p   = 1/0.25
-    w_f   = 1/0.15
-    # normalisasi agar jumlah=1
-    s = w_cals + w_c + w_p + w_f
-    w_cals, w_c, w_p, w_f = w_cals/s, w_c/s, w_p/s, w_f/s
-
-    filt['score_raw'] = (
-        w_cals*abs(filt['kcal'] - kalori_target)/kalori_target +
-        w_p   *abs(filt['protein'] - protein_target)/protein_target +
-        w_f   *abs(filt['fat'] - lemak_target)/lemak_target +
-        w_c   *abs(filt['carbs'] - karbo_target)/karbo_target
-    )
-    
-    # filt['score_raw'] = (
-    #     abs(filt['kcal'] - kalori_target) * 0.4
-    #     + abs(filt['protein'] - protein_target) * 0.2
-    #     + abs(filt['fat'] - lemak_target) * 0.2
-    #     + abs(filt['carbs'] - karbo_target) * 0.2
-    # )
-    
-    # 5b. Konversi ke skor positif (semakin kecil selisih → makin besar skor)
-    filt['score'] = filt['score_raw'].max() - filt['score_raw']
-
-    # 6. SORTING & SAMPLING berbobot
-    # Hanya ambil kandidat dengan skor positif
-    top_candidates = filt[filt['score'] > 0].sort_values(by='score', ascending=False).drop_duplicates('Menu').head(100)
-
-
-    # Ambil top_n menu secara acak dari 100 kandidat terbaik, berbasis skor sebagai bobot
-    rekom = top_candidates.sample(n=min(top_n, len(top_candidates)), weights='score', replace=False)
-
-    return rekom[['Menu', 'image', 'kcal', 'protein', 'fat', 'carbs', 'fibre']]
-
-# Fungsi untuk estimasi waktu perubahan berat (evidence-based, 7700 kkal = 1 kg)
-def estimasi_waktu_perubahan_berat(status, berat, berat_min, berat_max, tee, tee_min, tee_max):
-    def hitung_estimasi(kg_target, kal_per_hari_min, kal_per_hari_max):
-        kalori_minggu_min = kal_per_hari_min * 7
-        kalori_minggu_max = kal_per_hari_max * 7
-        minggu_min = (kg_target * 7700) / kalori_minggu_max
-        minggu_max = (kg_target * 7700) / kalori_minggu_min
-        return minggu_min, minggu_max
-
-    if status == "Underweight":
-        target_kg = berat_min - berat
-        surplus_min = tee_min - tee
-        surplus_max = tee_max - tee
-        return hitung_estimasi(target_kg, surplus_min, surplus_max)
-
-    elif status == "Overweight":
-        target_kg = berat - berat_max
-        defisit_min = tee - tee_max
-        defisit_max = tee - tee_min
-        return hitung_estimasi(target_kg, defisit_min, defisit_max)
-
-    elif status == "Obesity":
-        target_kg_min = berat * 0.05
-        target_kg_max = berat * 0.10
-        defisit_min = tee - tee_max
-        defisit_max = tee - tee_min
-        minggu_5 = hitung_estimasi(target_kg_min, defisit_min, defisit_max)
-        minggu_10 = hitung_estimasi(target_kg_max, defisit_min, defisit_max)
-        return minggu_5 + minggu_10
-
-    else:
-        return (0, 0)
-
-# ---------------------------------------------
-# PDF Helper: Laporan Lengkap (rata kiri + range-aware + error handling gambar)
-# ---------------------------------------------
-def pdf_laporan_lengkap(user_inputs: dict, metrics: dict, df, image_root: str = "nutrients/images"):
-    """
-    - Input & Hasil → tabel 2 kolom, rata kiri, tanpa border
-    - Makro (target) → rata kiri, tanpa border; tampil "min–max" jika tersedia, else single value
-    - Tabel rekomendasi → dengan thumbnail, aman untuk gambar hilang/korup
-    metrics boleh berisi:
-    - single: carb_g, protein_g, fat_g, fiber_g
-    - range : carb_min, carb_max, protein_min, protein_max, fat_min, fat_max, fiber_min, fiber_max
-    """
-    if not REPORTLAB_AVAILABLE:
-        return None
-
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buffer, pagesize=A4,
-        leftMargin=36, rightMargin=36, topMargin=36, bottomMargin=36
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    # ===== Header
-    story.append(Paragraph("Rekomendasi Menu – EduNutri", styles["Heading1"]))
-    story.append(Paragraph(datetime.datetime.now().strftime("%Y-%m-%d %H:%M"), styles["Normal"]))
-    story.append(Spacer(1, 12))
-
-    # Util: K/V table rata kiri, tanpa border
-    def kv_table(rows, col0_width=130):
-        t = Table(rows, colWidths=[col0_width, None], hAlign='LEFT')  # <- left align flowable
-        t.setStyle(TableStyle([
-            ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-            ('FONTSIZE', (0,0), (-1,-1), 10),
-            ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
-            ('ALIGN', (0,0), (-1,-1), 'LEFT'),  # cell content left
-            ('LEFTPADDING', (0,0), (-1,-1), 0),
-            ('RIGHTPADDING', (0,0), (-1,-1), 0),
-            ('TOPPADDING', (0,0), (-1,-1), 2),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 2),
-        ]))
-        return t
-
-    # Util: format rentang jika ada; jika tidak, fallback ke single value
-    def fmt_range(minv, maxv, single=None):
-        def is_num(x): return isinstance(x, (int, float)) and not (x is None)
-        if is_num(minv) and is_num(maxv) and (minv > 0 or maxv > 0):
-            return f"{float(minv):.0f} – {float(maxv):.0f}"
-        if is_num(single):
-            return f"{float(single):.0f}"
-        return "-"
-
-    # ===== Input Pengguna
-    story.append(Paragraph("Input Pengguna", styles["Heading2"]))
-    story.append(kv_table([
-        ["Usia",          f"{user_inputs.get('usia','-')} th"],
-        ["Jenis Kelamin", f"{user_inputs.get('jk','-')}"],
-        ["Tinggi",        f"{user_inputs.get('tb','-')} m"],
-        ["Berat",         f"{user_inputs.get('bb','-')} kg"],
-        ["Aktivitas",     f"{user_inputs.get('pal','-')}"],
-    ]))
-    story.append(Spacer(1, 10))
-
-    # ===== Hasil Perhitungan
-    m = metrics
-    story.append(Paragraph("Hasil Perhitungan", styles["Heading2"]))
-    story.append(kv_table([
-        ["BMI",           f"{m.get('bmi',0):.1f} ({m.get('kategori','-')})"],
-        ["BMR (MSJ)",     f"{m.get('bmr',0):.0f} kcal"],
-        ["TEE",           f"{m.get('tee',0):.0f} kcal"],
-        ["Target Kalori", f"{m.get('target_kalori',0):.0f} kcal/hari"],
-    ]))
-
-    # ===== Makro (target) – rata kiri, tanpa border; range-aware
-    story.append(Spacer(1, 4))
-    story.append(Paragraph("Makro (target)", styles["Heading2"]))
-    story.append(kv_table([
-        ["Karbo (g)",   fmt_range(m.get('carb_min'),   m.get('carb_max'),   m.get('carb_g'))],
-        ["Protein (g)", fmt_range(m.get('protein_min'),m.get('protein_max'),m.get('protein_g'))],
-        ["Lemak (g)",   fmt_range(m.get('fat_min'),    m.get('fat_max'),    m.get('fat_g'))],
-        ["Serat (g)",   fmt_range(m.get('fiber_min'),  m.get('fiber_max'),  m.get('fiber_g'))],
-    ]))
-    story.append(Spacer(1, 12))
-
-    # ===== Tabel Rekomendasi (gambar aman)
-    story.append(Paragraph("Tabel Rekomendasi Menu", styles["Heading2"]))
-    story.append(Spacer(1, 6))
-
-    headers = ["Gambar", "Menu", "kcal", "Protein", "Fat", "Carbs", "Fibre"]
-    data = [headers]
-
-    for _, row in df.iterrows():
-        img_cell = Paragraph("⚠ not found", styles["BodyText"])
-        img_path = os.path.join(image_root, str(row.get("image","")))
-        if os.path.exists(img_path):
-            try:
-                from PIL import Image as PILImage  # local import to avoid global conflict
-                with PILImage.open(img_path) as im:
-                    im.verify()
-                img_cell = RLImage(img_path, width=45, height=45)
-            except Exception:
-                img_cell = Paragraph("⚠ image error", styles["BodyText"])
-
-        data.append([
-            img_cell,
-            str(row.get("Menu","-")),
-            f"{float(row.get('kcal',0)):.0f}",
-            f"{float(row.get('protein',0)):.1f}",
-            f"{float(row.get('fat',0)):.1f}",
-            f"{float(row.get('carbs',0)):.1f}",
-            f"{float(row.get('fibre',0)):.1f}",
-        ])
-
-    tbl = Table(data, repeatRows=1, colWidths=[55, None, 45, 50, 45, 50, 50], hAlign='LEFT')
-    tbl.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('ALIGN', (2,1), (-1,-1), 'CENTER'),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.whitesmoke, colors.white]),
-        ('TOPPADDING', (0,0), (-1,-1), 4),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-    ]))
-    story.append(tbl)
-
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
-
+# Dataset, scaler & model dimuat sekali per proses server (lihat resources.py),
+# bukan di setiap rerun script. Warm-up berjalan di background sejak eksekusi
+# pertama sehingga halaman Home tidak perlu menunggu.
+warmup()
+
+# Panel latensi di sidebar hanya tampil bila server dijalankan dengan EDUNUTRI_ADMIN=1
+ADMIN_MODE = os.environ.get('EDUNUTRI_ADMIN', '0') == '1'
+
+# Rencana mingguan (mode "Weekly"): fragment → tombol Swap hanya me-rerun bagian ini,
+# dan WeeklyPlanner di session_state hanya memperbaiki hari yang menunya ditukar
+@st.fragment
+def tampilkan_rencana_mingguan():
+    planner = st.session_state.get("weekly_planner")
+    if planner is None:
+        return
+    info = f"Rencana {planner.days} hari disusun dalam {planner.solve_seconds * 1e3:.1f} ms"
+    if planner.repair_seconds is not None:
+        info += f" · perbaikan tukar menu terakhir {planner.repair_seconds * 1e3:.2f} ms"
+    st.caption(info)
+
+    tabs = st.tabs([f"Day {d + 1}" for d in range(planner.days)])
+    for day, (tab, plan) in enumerate(zip(tabs, planner.plans)):
+        with tab:
+            st.dataframe(plan.items[['Menu'] + NUTRIENT_COLS], hide_index=True, use_container_width=True)
+            st.write("**Total:** " + " · ".join(f"{c} {plan.totals[c]:.0f}" for c in NUTRIENT_COLS))
+            if not plan.feasible:
+                st.warning("⚠ Hari ini tidak punya kombinasi yang tepat masuk semua rentang; "
+                           "ditampilkan kombinasi yang paling mendekati.")
+            col_sel, col_btn = st.columns([3, 1])
+            menu_swap = col_sel.selectbox("Menu to swap", plan.items['Menu'], key=f"swap_menu_{day}")
+            if col_btn.button("Swap", key=f"swap_btn_{day}"):
+                planner.swap(day, menu_swap)
+                st.rerun(scope="fragment")
+
+# Tabel hasil rekomendasi: satu st.dataframe (kolom gambar = URL thumbnail) per halaman,
+# "Show more" hanya me-rerun fragment ini
+RESULTS_PAGE_SIZE = 10
+TOP_N_OPTIONS = [10, 20, 30, 40, 50]
+
+
+def _tampilkan_lebih_banyak(shown):
+    st.session_state.menu_results_shown = shown + RESULTS_PAGE_SIZE
+
+
+@st.fragment
+def tampilkan_hasil_menu():
+    menu_rec = st.session_state.get("menu_results")
+    if menu_rec is None:
+        return
+    shown = min(st.session_state.get("menu_results_shown", RESULTS_PAGE_SIZE), len(menu_rec))
+    with telemetry.stage('render_images'):
+        thumbs = get_thumbnail_index()
+        page = menu_rec.iloc[:shown]
+        grid = pd.DataFrame({
+            "image": [thumbnail_url(img, SIZE_UI, thumbs) for img in page['image']],
+            "Menu": page['Menu'].to_numpy(),
+            **{col: page[col].to_numpy() for col in ['kcal', 'protein', 'fat', 'fibre', 'carbs']},
+        })
+        st.dataframe(grid, hide_index=True, width="stretch", row_height=72, column_config={
+            "image": st.column_config.ImageColumn("", width="small"),
+            "Menu": st.column_config.TextColumn("Menu", width="large"),
+            "kcal": st.column_config.NumberColumn("Calories", format="%.1f kcal"),
+            "protein": st.column_config.NumberColumn("Protein", format="%.1f g"),
+            "fat": st.column_config.NumberColumn("Fat", format="%.1f g"),
+            "fibre": st.column_config.NumberColumn("Fibre", format="%.1f g"),
+            "carbs": st.column_config.NumberColumn("Carbs", format="%.1f g"),
+        })
+    if shown < len(menu_rec):
+        col_info, col_more = st.columns([3, 1])
+        col_info.caption(f"Menampilkan {shown} dari {len(menu_rec)} menu")
+        # Callback jalan sebelum rerun fragment yang dipicu tombol ini
+        col_more.button("Show more", key="menu_results_more", on_click=_tampilkan_lebih_banyak, args=(shown,))
 
 # def encode_img_to_base64(img_path):
 #     with open(img_path, "rb") as img_file:
@@ -460,6 +198,7 @@ st.sidebar.markdown("### Pilih Halaman:")
 render_sidebar_button("Home", "🏠 Home")
 render_sidebar_button("Recommendation", "📝 Rekomendasi Menu")
 render_sidebar_button("Information", "📊 Resource")
+render_sidebar_button("Cohort", "📈 Kohort")
 menu = st.session_state.menu
 
 if menu == "🏠 Home":
@@ -542,6 +281,11 @@ elif menu == "📝 Rekomendasi Menu" :
                 "Very Active (6–7 times/week)",
                 "Extremely Active (twice daily or intense)"
             ])
+            mode = st.radio("Recommendation Mode", options=[
+                "Top menus", "Daily meal plan (3–5 menus)", "Weekly meal plan (7 days)"
+            ])
+            top_n = st.select_slider("Top menus: number of menus", options=TOP_N_OPTIONS, value=TOP_N_OPTIONS[0])
+            no_repeat = st.slider("Weekly plan: no repeated menu within (days)", 1, 7, NO_REPEAT_DAYS)
 
             submitted = st.form_submit_button("Recommend Menu")
             # st.markdown("<br><br><br><br><br><br><br><br><br>", unsafe_allow_html=True)
@@ -550,17 +294,25 @@ elif menu == "📝 Rekomendasi Menu" :
             # with col_submit:
             #     submitted = st.form_submit_button("Recommend Menu")
 
-    if submitted:
+    # Hasil per input form disimpan di cache sesi: rerun lain (tombol unduh, sidebar,
+    # "Show more") menggambar ulang dari cache tanpa prediksi/sampling ulang
+    hasil_cache = get_session_cache(st.session_state)
+    form_key = (umur, jenis_kelamin, tinggi, berat, activity, mode,
+                top_n if mode.startswith("Top") else None, no_repeat if mode.startswith("Weekly") else None)
+
+    if submitted or form_key in hasil_cache:
         if None in (umur, tinggi, berat):
             st.warning("⚠️ Silakan isi semua data (umur, tinggi, dan berat) terlebih dahulu.")
         else:
-            # Encode input
-            g = 1 if jenis_kelamin=="Laki-laki" else 0
-            input_vec = np.array([[g, umur, tinggi, berat]])
-            input_scaled = scaler.transform(input_vec)
+            res = get_resources()
+            hasil = hasil_cache.get(form_key) or {}
+            dari_cache = 'menus' in hasil
 
-            # Predict status gizi
-            status = best_rf.predict(input_scaled)[0]
+            # Predict status gizi (lookup grid; Random Forest hanya untuk input di luar grid)
+            if 'status' not in hasil:
+                with telemetry.stage('predict'):
+                    hasil['status'] = predict_status(res, jenis_kelamin, umur, tinggi, berat)
+            status = hasil['status']
 
             # 1) Tampilkan status & BMI
             bmi_user = berat / (tinggi ** 2)
@@ -640,84 +392,26 @@ elif menu == "📝 Rekomendasi Menu" :
             # col_t1, col_t2 = st.columns([1.5, 2.5])
             
             with col_t1:
-                # 2) Hitung BMR (Harris-Benedict dan Mifflin-St Jeor)
-                if jenis_kelamin == "Male":
-                    bmr_hb = 88.362 + (13.397 * berat) + (4.799 * tinggi * 100) - (5.677 * umur)
-                    bmr_msj = (10 * berat) + (6.25 * tinggi * 100) - (5 * umur) + 5
-                else:
-                    bmr_hb = 447.593 + (9.247 * berat) + (3.098 * tinggi * 100) - (4.330 * umur)
-                    bmr_msj = (10 * berat) + (6.25 * tinggi * 100) - (5 * umur) - 161
-                
-                # 3) Hitung TEE berdasarkan PAL
-                pal_levels = {
-                    "Sedentary (little to no activity)": 1.2,
-                    "Lightly Active (1–2 times/week)": 1.375,
-                    "Moderately Active (3–5 times/week)": 1.55,
-                    "Very Active (6–7 times/week)": 1.725,
-                    "Extremely Active (twice daily or intense)": 1.9
-                }
-                pal_value = pal_levels[activity]
-                tee = bmr_msj * pal_value
-                
-                # 4) Surplus/Defisit Kalori
-                if status == "Underweight":
-                    tee_min, tee_max = tee + 500, tee + 1000
-
-                elif status in ["Overweight", "Obesity"]:
-                    defisit1 = tee - 1000
-                    defisit2 = tee - 500
-                    # Jika defisit terlalu dalam (melewati BMR), gunakan defisit ringan
-                    if defisit1 < bmr_msj or defisit2 < bmr_msj:
-                        tee_min = tee - 300
-                        tee_max = tee - 200
-                    else:
-                        tee_min = defisit1
-                        tee_max = defisit2
-                else:  # Normal
-                    tee_min = tee_max = tee
+                # 2–5, 8) BMR, TEE (PAL × BMR Mifflin-St Jeor), surplus/defisit kalori,
+                # kebutuhan makro dan AKG Permenkes 2019 — satu NutritionProfile
+                # (nutrition_profile.py) yang juga dipakai scoring menu dan PDF
+                # Tahap 'energy' diukur dalam dua potong (di sini dan estimasi berat di bawah)
+                t_energy = time.perf_counter()
+                if 'profil' not in hasil:
+                    hasil['profil'] = get_profile(jenis_kelamin, umur, tinggi, berat, activity, status)
+                profil = hasil['profil']
+                energi = profil.energi
+                bmr_hb, bmr_msj, tee = energi.bmr_hb, energi.bmr_msj, energi.tee
+                tee_min, tee_max = energi.tee_min, energi.tee_max
+                karbo_min, karbo_max = energi.karbo_min, energi.karbo_max
+                protein_min, protein_max = energi.protein_min, energi.protein_max
+                lemak_min, lemak_max = energi.lemak_min, energi.lemak_max
+                serat_min, serat_max = energi.serat_min, energi.serat_max
+                pal_levels = PAL_LEVELS
                 
                 # 5) Rekomendasi AKG Permenkes 2019
-                def get_akg(gender, age):
-                    akg_data = {
-                        'Male': {
-                            (13, 15): [2400, 70, 80, 350, 34],
-                            (16, 18): [2650, 75, 85, 400, 37],
-                            (19, 29): [2650, 65, 75, 430, 37],
-                            (30, 49): [2550, 65, 70, 415, 36],
-                            (50, 64): [2150, 65, 60, 340, 30]
-                        },
-                        'Female': {
-                            (13, 15): [2050, 65, 70, 300, 29],
-                            (16, 18): [2100, 65, 70, 300, 29],
-                            (19, 29): [2250, 60, 65, 360, 32],
-                            (30, 49): [2150, 60, 60, 340, 30],
-                            (50, 64): [1800, 60, 50, 280, 25]
-                        }
-                    }
-                    for (min_age, max_age), values in akg_data[gender].items():
-                        if min_age <= age <= max_age:
-                            return values
-                    return [None] * 5
-                
-                # 8) Kebutuhan zat gizi makro (IOM 2005)
-                karbo_min = (0.45 * tee_min) / 4
-                karbo_max = (0.65 * tee_max) / 4
-                protein_min = (0.10 * tee_min) / 4
-                protein_max = (0.30 * tee_max) / 4
-                lemak_min = (0.20 * tee_min) / 9
-                lemak_max = (0.30 * tee_max) / 9
-                serat_min = 25
-                serat_max = 37
-                
-                akg_values = get_akg(jenis_kelamin, umur)
-                akg_kalori = akg_values[0]
-                akg_dict = {
-                    "Energy (kcal)": akg_values[0],
-                    "Protein (g)": akg_values[1],
-                    "Fat (g)": akg_values[2],
-                    "Carbs (g)": akg_values[3],
-                    "Fibre (g)": akg_values[4]
-                }
+                akg_dict = profil.akg_table()
+                energy_seconds = time.perf_counter() - t_energy
 
                 user_dict = {
                     "Energy (kcal)": f"{tee_min:.0f} – {tee_max:.0f}",
@@ -749,8 +443,8 @@ elif menu == "📝 Rekomendasi Menu" :
             
             with col_info1:
                 # 6) Rentang berat ideal berdasarkan BMI normal
-                berat_min = 18.5 * (tinggi ** 2)
-                berat_max = 24.9 * (tinggi ** 2)
+                t_energy = time.perf_counter()
+                berat_min, berat_max = energi.berat_min, energi.berat_max
                 
                 # 7) Estimasi minggu perubahan berat badan (Evidence-Based)
                 if status == "Underweight":
@@ -761,6 +455,7 @@ elif menu == "📝 Rekomendasi Menu" :
 
                 elif status == "Obesity":
                     minggu_5_min, minggu_5_max, minggu_10_min, minggu_10_max = estimasi_waktu_perubahan_berat(status, berat, berat_min, berat_max, tee, tee_min, tee_max)
+                telemetry.observe('energy', energy_seconds + time.perf_counter() - t_energy)
 
                 # Fungsi tambahan untuk tampilkan estimasi perubahan berat badan
                 def tampilkan_estimasi_perubahan_berat(status, berat, berat_min, berat_max, tee_min, tee_max, bmr_msj):
@@ -853,6 +548,7 @@ elif menu == "📝 Rekomendasi Menu" :
                 st.write(f"- **BMR (Mifflin-St Jeor)**: `{bmr_msj:.0f} kcal`")
                 st.write(f"- **TEE (PAL x BMR Mifflin-St Jeor)**: `{tee:.0f} kcal`")
                 st.write(f"- **AKG (Permenkes 2019)**: `{akg_dict['Energy (kcal)']} kcal`")
+                st.write(f"- **Target kalori menu**: `{profil.kalori_target:.0f} kcal`")
 
                 if status == "Underweight":
                     st.info(f"💡 **Surplus Kalori:**\nKebutuhan kalori berkisar antara **{tee_min:.0f} – {tee_max:.0f} kcal**")
@@ -873,45 +569,68 @@ elif menu == "📝 Rekomendasi Menu" :
             st.markdown("---")
             
             # menu_rec = recommend_by_status(status, nutri_df, top_n=10)
-            menu_rec = recommend_menu_demographic(nutri_df, status, jenis_kelamin, umur, activity, top_n=10)
-            st.markdown("### Recommended Food Menu")
+            # Menu hanya diundi bila belum ada di cache sesi (atau sesudah "Reroll")
+            menus = hasil.get('menus')
+            if mode.startswith("Daily"):
+                # Mode rencana harian: 3–5 menu yang totalnya masuk rentang kebutuhan di atas
+                targets = plan_targets(tee_min, tee_max, karbo_min, karbo_max, protein_min, protein_max,
+                                       lemak_min, lemak_max, serat_min, serat_max)
+                if menus is None:
+                    with telemetry.stage('recommend'):
+                        menus = {'plan': optimize_daily_plan(res.catalog, targets, rng=np.random.default_rng())}
+                plan = menus['plan']
+                menu_rec = plan.items
+                st.markdown("### Daily Meal Plan")
+                st.dataframe(pd.DataFrame({
+                    "Total": [plan.totals[c] for c in NUTRIENT_COLS],
+                    "Min": targets.lo,
+                    "Max": targets.hi,
+                }, index=["Energy (kcal)", "Protein (g)", "Fat (g)", "Carbs (g)", "Fibre (g)"]).round(0))
+                if not plan.feasible:
+                    st.warning("⚠ Tidak ada kombinasi 3–5 menu yang tepat masuk semua rentang; "
+                               "ditampilkan kombinasi yang paling mendekati.")
+            elif mode.startswith("Weekly"):
+                # Mode rencana mingguan: tiap hari masuk rentang, tanpa pengulangan menu dalam N hari
+                if menus is None:
+                    targets = plan_targets(tee_min, tee_max, karbo_min, karbo_max, protein_min, protein_max,
+                                           lemak_min, lemak_max, serat_min, serat_max)
+                    planner = WeeklyPlanner(res.catalog, targets, no_repeat_days=no_repeat, rng=np.random.default_rng())
+                    with telemetry.stage('recommend'):
+                        planner.solve()
+                    # PDF memuat rencana seperti saat disusun (tukar menu sesudahnya hanya di tampilan)
+                    menus = {'planner': planner, 'menu_rec': pd.concat([p.items for p in planner.plans])}
+                st.session_state.weekly_planner = menus['planner']
+                st.markdown("### Weekly Meal Plan")
+                tampilkan_rencana_mingguan()
+                menu_rec = menus['menu_rec']
+            else:
+                if menus is None:
+                    with telemetry.stage('recommend'):
+                        menus = {'menu_rec': recommend_menu_demographic(res.catalog, status, jenis_kelamin, umur,
+                                                                        activity, top_n=top_n, profile=profil)}
+                menu_rec = menus['menu_rec']
+                st.markdown("### Recommended Food Menu")
+            hasil['menus'] = menus
+            hasil_cache.put(form_key, hasil)
             
-            # ——————————————————————————————
-            # Heading untuk tiap kolom hasil rekomendasi
-            # ——————————————————————————————
-            col_img_h, col_menu_h, col_kcal_h, col_prot_h, col_fat_h, col_fib_h, col_carbs_h = st.columns([2, 3, 1.5, 1, 1, 1, 1])
-            col_kcal_h.markdown("**Calories**")
-            col_prot_h.markdown("**Protein**")
-            col_fat_h.markdown("**Fat**")
-            col_fib_h.markdown("**Fibre**")
-            col_carbs_h.markdown("**Carbs**")
-
-            # Loop menampilkan setiap item
-            for idx, row in menu_rec.iterrows():
-                col_img, col_menu, col_kcal, col_prot, col_fat, col_fib, col_carbs = st.columns([2, 3, 1.5, 1, 1, 1, 1])
-                # Tampilkan gambar
-                img_path = os.path.join('nutrients', 'images', row['image'])
-                if os.path.exists(img_path):
-                    try:
-                        col_img.image(img_path, use_container_width=True)
-                    except UnidentifiedImageError:
-                        col_img.warning("⚠ Corrupted or unrecognizable image")
-                else:
-                    col_img.warning("⚠ Image not found")
-                # Tampilkan nilai masing‑masing kolom
-                col_menu.markdown(f"**{row['Menu']}**")
-                col_kcal.markdown(f"{row['kcal']} kcal")
-                col_prot.markdown(f"{row['protein']} g")
-                col_fat.markdown(f"{row['fat']} g")
-                col_fib.markdown(f"{row['fibre']} g")
-                col_carbs.markdown(f"{row['carbs']} g")
+            # Mode mingguan sudah ditampilkan per hari di fragment di atas
+            if not mode.startswith("Weekly"):
+                if st.session_state.get("menu_results") is not menu_rec:
+                    st.session_state.menu_results = menu_rec
+                    st.session_state.menu_results_shown = RESULTS_PAGE_SIZE
+                tampilkan_hasil_menu()
+
+            # Reroll: status & profil gizi tetap dari cache, menu diundi ulang pada rerun berikutnya
+            st.button("🎲 Reroll menus", key="reroll_menus", on_click=hasil_cache.drop, args=(form_key, 'menus'))
 
             # Selesai pengukuran waktu
             end_time = time.perf_counter()
             elapsed_time = end_time - start_time
+            telemetry.observe('total_cached' if dari_cache else 'total', elapsed_time)
+            telemetry.flush()
 
             # Tampilkan ke pengguna
-            st.success(f"Waktu pemrosesan: {elapsed_time:.3f} detik")
+            st.success(f"Waktu pemrosesan: {elapsed_time:.3f} detik" + (" (cache sesi)" if dari_cache else ""))
 
             # ============ Download: Laporan Lengkap (PDF dengan Gambar) ============
             # Siapkan DataFrame dengan kolom 'image' + nutrisi
@@ -923,39 +642,18 @@ elif menu == "📝 Rekomendasi Menu" :
             if not REPORTLAB_AVAILABLE:
                 st.warning("Fitur unduh PDF membutuhkan paket **reportlab**. Jalankan: `pip install reportlab` di environment.")
             elif reco_df_pdf is not None and len(reco_df_pdf) > 0:
-                # Hitung target kalori dan makro (pakai titik tengah rentang bila ada)
-                if status == "Normal":
-                    target_kal = tee
-                else:
-                    target_kal = (tee_min + tee_max) / 2 if isinstance(tee_min, (int,float)) and isinstance(tee_max, (int,float)) else tee
-
-                # titik tengah (opsional, kalau mau single target):
-                carb_g   = (karbo_min + karbo_max) / 2
-                protein_g= (protein_min + protein_max) / 2
-                fat_g    = (lemak_min + lemak_max) / 2
-                fiber_g  = (serat_min + serat_max) / 2
-                
-                user_inputs = {"usia": umur, "jk": jenis_kelamin, "tb": tinggi, "bb": berat, "pal": activity}
-                metrics = {
-                    "bmi": bmi_user, "kategori": status, "bmr": bmr_msj, "tee": tee,
-                    "target_kalori": target_kal,
-                    # single (fallback)
-                    "carb_g": carb_g, "protein_g": protein_g, "fat_g": fat_g, "fiber_g": fiber_g,
-                    # range (agar match dengan UI)
-                    "carb_min": karbo_min, "carb_max": karbo_max,
-                    "protein_min": protein_min, "protein_max": protein_max,
-                    "fat_min": lemak_min, "fat_max": lemak_max,
-                    "fiber_min": serat_min, "fiber_max": serat_max
-                }
-
-                pdf_bytes_full = pdf_laporan_lengkap(user_inputs, metrics, reco_df_pdf, image_root="nutrients/images")
-                if pdf_bytes_full is not None:
-                    st.download_button(
-                        label="📥 Download Rekomendasi Menu (PDF)",
-                        data=pdf_bytes_full.getvalue(),
-                        file_name=f"EduNutri_Laporan_{datetime.datetime.now():%Y-%m-%d_%H%M}.pdf",
-                        mime="application/pdf"
-                    )
+                # Target kalori & makro dari profil yang sama — sama dengan api.py / bulk_pdf.py
+                user_inputs, metrics = pdf_inputs(profil)
+
+                # PDF tidak dibangun di sini: worker background menyiapkannya, dan tombol
+                # unduh memanggil get_pdf_bytes() hanya saat diklik (hasil di-cache)
+                hasil['pdf_key'] = prefetch_pdf(user_inputs, metrics, reco_df_pdf)
+                st.download_button(
+                    label="📥 Download Rekomendasi Menu (PDF)",
+                    data=lambda: get_pdf_bytes(user_inputs, metrics, reco_df_pdf),
+                    file_name=f"EduNutri_Laporan_{datetime.datetime.now():%Y-%m-%d_%H%M}.pdf",
+                    mime="application/pdf"
+                )
 
 elif menu == "📊 Resource":
     st.title("Information — EduNutri")
@@ -1169,5 +867,103 @@ elif menu == "📊 Resource":
         )
 
 
+elif menu == "📈 Kohort":
+    st.title("Cohort Dashboard — EduNutri")
+    st.markdown(
+        "Upload CSV kohort dengan kolom `age, gender, height, weight[, activity]` atau gaya "
+        "`bmi_dataset.csv` (`Age, Gender, Height (m), Weight (kg)[, PAL]`). Status gizi dan kebutuhan "
+        "energi dihitung untuk semua baris sekaligus (cohort.py)."
+    )
+    col_up, col_opt = st.columns([3, 2])
+    uploaded = col_up.file_uploader("Cohort CSV", type="csv")
+    default_activity = col_opt.selectbox("Default activity (tanpa kolom PAL/activity)", list(PAL_LEVELS),
+                                         index=list(PAL_LEVELS).index(DEFAULT_ACTIVITY))
+    if uploaded is None:
+        col_opt.caption("Belum ada upload — ditampilkan contoh `bmi_dataset.csv`.")
+        with open("bmi_dataset.csv", "rb") as f:
+            raw = f.read()
+    else:
+        raw = uploaded.getvalue()
+
+    # Hasil per (isi file, default activity) di cache sesi — rerun lain tidak menghitung ulang
+    kohort_cache = get_session_cache(st.session_state, name="cohort_cache")
+    kohort_key = (hashlib.sha1(raw).hexdigest(), default_activity)
+    hasil_kohort = kohort_cache.get(kohort_key)
+    if hasil_kohort is None:
+        try:
+            kohort, timings = analyze_cohort(pd.read_csv(io.BytesIO(raw)), default_activity, get_resources())
+        except (ValueError, pd.errors.ParserError) as exc:
+            st.error(f"CSV tidak bisa dianalisis: {exc}")
+            st.stop()
+        hasil_kohort = {'kohort': kohort, 'timings': timings}
+        kohort_cache.put(kohort_key, hasil_kohort)
+    kohort, timings = hasil_kohort['kohort'], hasil_kohort['timings']
+    detik = sum(timings.values())
+    st.caption(f"{len(kohort):,} baris dalam {detik * 1e3:.0f} ms ({len(kohort) / max(detik, 1e-9):,.0f} baris/detik; "
+               f"status {timings['status'] * 1e3:.0f} ms, energi {timings['energy'] * 1e3:.0f} ms)")
+    dilewati = kohort['dilewati'] != ''
+    if dilewati.any():
+        with st.expander(f"⚠️ {int(dilewati.sum()):,} baris dilewati (input kosong / tidak valid)"):
+            st.dataframe(kohort.loc[dilewati, ['age', 'gender', 'height', 'weight', 'dilewati']],
+                         use_container_width=True)
+    kohort_valid = kohort[~dilewati]
+    if kohort_valid.empty:
+        st.warning("Tidak ada baris dengan age, gender (Male/Female), height dan weight lengkap.")
+        st.stop()
+
+    # Target kalori harian = energy.kalori_target (sama dengan profil gizi, scoring menu dan PDF)
+    kohort = kohort_valid.assign(target_kalori=kalori_target(kohort_valid['tee_min'], kohort_valid['tee_max']))
+    status_count = kohort['status'].value_counts(sort=False)
+
+    col_s, col_k = st.columns(2)
+    with col_s:
+        st.markdown("### Distribusi Status Gizi")
+        fig = go.Figure(go.Bar(x=status_count.index.astype(str), y=status_count.values,
+                               marker_color=["gray", "green", "orange", "crimson"]))
+        fig.update_layout(height=320, margin=dict(t=20, b=20), yaxis_title="Jumlah")
+        st.plotly_chart(fig, use_container_width=True)
+    with col_k:
+        st.markdown("### Distribusi Kebutuhan Kalori Harian")
+        fig = go.Figure([
+            go.Histogram(x=kohort.loc[kohort['status'] == s, 'target_kalori'], name=s, opacity=0.6, nbinsx=40)
+            for s in status_count.index if status_count[s] > 0
+        ])
+        fig.update_layout(barmode="overlay", height=320, margin=dict(t=20, b=20), xaxis_title="kcal / hari",
+                          yaxis_title="Jumlah")
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### Ringkasan per Status")
+    ringkasan = kohort.groupby('status', observed=True).agg(
+        n=('bmi', 'size'),
+        bmi_median=('bmi', 'median'),
+        tee_median=('tee', 'median'),
+        kalori_min_median=('tee_min', 'median'),
+        kalori_max_median=('tee_max', 'median'),
+        protein_min_median=('protein_min', 'median'),
+        protein_max_median=('protein_max', 'median'),
+    ).round(1)
+    st.dataframe(ringkasan, use_container_width=True)
+    st.download_button("📥 Download hasil kohort (CSV)", kohort.to_csv(index=False).encode(),
+                       file_name="EduNutri_Kohort.csv", mime="text/csv")
+
+# Panel latensi per tahap — hanya untuk admin (EDUNUTRI_ADMIN=1), di akhir script
+# agar submit yang baru saja berjalan ikut terhitung
+if ADMIN_MODE:
+    with st.sidebar.expander("⏱ Latency per stage (admin)"):
+        stages = telemetry.snapshot()
+        if stages:
+            st.dataframe(pd.DataFrame(stages).T[['count', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']].round(2),
+                         use_container_width=True)
+            st.download_button("Prometheus text", telemetry.to_prometheus(), file_name="edunutri.prom",
+                               mime="text/plain")
+            st.download_button("JSON", telemetry.to_json(), file_name="edunutri_metrics.json",
+                               mime="application/json")
+        else:
+            st.caption("Belum ada submit di proses ini.")
+        if "result_cache" in st.session_state:
+            c = st.session_state.result_cache.stats()
+            st.caption(f"Cache hasil sesi ini: {c['entries']}/{c['max_entries']} entri, "
+                       f"{c['bytes'] / 1024:.0f} KB, hit {c['hits']} · miss {c['misses']}")
+
 st.markdown("---")
 st.caption("© 2025 EduNutri by Fajar Agus | Universitas Gunadarma")
@@ -0,0 +1,241 @@
+# batch.py
+"""
+Rekomendasi menu massal untuk satu kohort (mis. satu sekolah).
+
+Semua status gizi diprediksi sekaligus (lookup grid status, sisanya — hanya baris
+fitur unik — dalam SATU panggilan scaler.transform + model.predict),
+scoring dilakukan sebagai satu operasi matriks (target × menu), dan top_n menu per
+user diambil dengan Gumbel top-k — setara sampling berbobot tanpa pengembalian
+seperti .sample(weights=...) di UI, tapi tervektorisasi untuk semua user.
+
+CSV input minimal berisi kolom: age, gender (Male/Female), height (m), weight (kg);
+kolom activity dan user_id opsional (ikut disalin ke output). Target kalori per user
+sama dengan nutrition_profile (titik tengah rentang TEE; activity default
+energy.DEFAULT_ACTIVITY), hanya user dengan baris AKG yang mendapat rekomendasi.
+Baris dengan gender/age/height/weight kosong atau tidak masuk akal (INPUT_LIMITS),
+activity yang tidak dikenal atau PAL di luar PAL_LIMITS dilewati — tidak
+menggagalkan seluruh kohort — dan jumlahnya dilaporkan.
+
+    python batch.py siswa.csv -o rekomendasi.csv
+    python batch.py siswa.csv -o rekomendasi.parquet --top-n 10 --seed 42
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from energy import PAL_LEVELS, hitung_energi_batch, kalori_target as kalori_target_dari, pal_dari_frame
+from recommender import NUTRIENT_COLS, bin_kalori, lookup_akg_rows, rank_candidates_many
+from resources import FEATURES, encode_gender, get_resources
+
+REQUIRED_COLS = ['age', 'gender', 'height', 'weight']
+GENDERS = ("Male", "Female")
+# Batas nilai yang masih masuk akal per kolom numerik. Lebih longgar dari form
+# (bmi_dataset.csv berisi umur 5–100, tinggi 1.2–3.0 m, berat 20–200 kg);
+# baris di luar batas ini tidak diprediksi dan dilaporkan sebagai dilewati.
+INPUT_LIMITS = {'age': (1, 120), 'height': (0.5, 3.0), 'weight': (10, 300)}
+# Rentang faktor PAL numerik (bmi_dataset.csv: 1.0–2.5); kosong = energy.DEFAULT_ACTIVITY
+PAL_LIMITS = (1.0, 2.5)
+
+
+def validate_users(users_df):
+    """
+    Konversi kolom age/height/weight ke angka dan cek tiap baris, termasuk kolom
+    aktivitas yang dipakai energy.pal_dari_frame (PAL numerik, atau label activity).
+    Return (salinan users_df dengan kolom numerik, array alasan per baris);
+    alasan '' = baris valid, selain itu teks singkat kenapa baris dilewati.
+    """
+    users_df = users_df.copy()
+    reason = np.full(len(users_df), '', dtype=object)
+    if 'PAL' in users_df.columns:
+        lo, hi = PAL_LIMITS
+        pal = pd.to_numeric(users_df['PAL'], errors='coerce').to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            bad = users_df['PAL'].notna().to_numpy() & ~((pal >= lo) & (pal <= hi))
+        reason[bad] = f"PAL bukan angka {lo}–{hi}"
+    elif 'activity' in users_df.columns:
+        activity = users_df['activity']
+        reason[(activity.notna() & ~activity.isin(list(PAL_LEVELS))).to_numpy()] = "activity tidak dikenal"
+    for col, (lo, hi) in reversed(INPUT_LIMITS.items()):  # alasan kolom pertama menang
+        users_df[col] = pd.to_numeric(users_df[col], errors='coerce')  # kolom int tetap int
+        values = users_df[col].to_numpy(dtype=float)
+        with np.errstate(invalid='ignore'):
+            reason[~((values >= lo) & (values <= hi))] = f"{col} kosong atau di luar {lo}–{hi}"
+    reason[~users_df['gender'].isin(GENDERS).to_numpy()] = "gender bukan Male/Female"
+    return users_df, reason
+
+
+def _features(users_df):
+    # DataFrame berkolom FEATURES: scaler di-fit dengan nama kolom ini
+    return pd.DataFrame({
+        'Gender': encode_gender(users_df['gender'].to_numpy()),
+        'Age': users_df['age'].to_numpy(dtype=float),
+        'HeightM': users_df['height'].to_numpy(dtype=float),
+        'WeightKg': users_df['weight'].to_numpy(dtype=float),
+    }, columns=FEATURES)
+
+
+def _predict_unique(res, X):
+    """Prediksi model hanya untuk baris fitur unik (kohort sering berisi baris kembar), lalu disebar balik."""
+    unique, inverse = np.unique(X.to_numpy(), axis=0, return_inverse=True)
+    unique = pd.DataFrame(unique, columns=FEATURES)
+    return res.model_for(len(unique)).predict(res.scaler.transform(unique))[inverse.ravel()]
+
+
+def predict_status_batch(users_df, res=None):
+    """
+    Prediksi status gizi semua user: lookup grid (status_grid.py) untuk input di
+    dalam domain grid, sisanya (hanya baris fitur unik) dalam satu panggilan scaler +
+    model (Resources.model_for: sklearn untuk batch besar, hutan datar untuk beberapa
+    baris). Baris yang
+    tidak lolos validate_users() tidak diprediksi dan berstatus NaN.
+    """
+    res = get_resources() if res is None else res
+    users_df, reason = validate_users(users_df)
+    valid = reason == ''
+    status = np.full(len(users_df), np.nan, dtype=object)
+    if not valid.any():
+        return status
+
+    X = _features(users_df[valid])
+    if res.status_grid is None:
+        status[valid] = _predict_unique(res, X)
+        return status
+
+    cols = X.to_numpy()
+    grid_status, on_grid = res.status_grid.lookup_many(cols[:, 0], cols[:, 1], cols[:, 2], cols[:, 3])
+    if not on_grid.all():
+        grid_status[~on_grid] = _predict_unique(res, X[~on_grid])
+    status[valid] = grid_status
+    return status
+
+
+def skip_reasons(users_df):
+    """
+    validate_users() ditambah cek tabel AKG: alasan '' = user mendapat
+    rekomendasi, "di luar tabel AKG" = input valid tapi tidak ada baris AKG.
+    Return (users_df numerik, array alasan).
+    """
+    users_df, reason = validate_users(users_df)
+    valid = np.flatnonzero(reason == '')
+    no_akg = lookup_akg_rows(users_df['gender'].to_numpy()[valid], users_df['age'].to_numpy()[valid]) < 0
+    reason[valid[no_akg]] = "di luar tabel AKG"
+    return users_df, reason
+
+
+def gumbel_top_k(weights, k, rng):
+    """
+    Sampling berbobot tanpa pengembalian untuk setiap baris sekaligus.
+    argmax(log w + Gumbel) berurutan = sampling sekuensial ∝ w (Plackett–Luce),
+    jadi top-k dari key tersebut sama distribusinya dengan .sample(weights=w).
+    Bobot 0 mendapat key -inf dan hanya terambil jika slot valid habis.
+    """
+    with np.errstate(divide='ignore'):
+        keys = np.log(weights) + rng.gumbel(size=weights.shape)
+    k = min(k, weights.shape[1])
+    top = np.argpartition(-keys, k - 1, axis=1)[:, :k] if k < weights.shape[1] else np.argsort(-keys, axis=1)
+    order = np.argsort(-np.take_along_axis(keys, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def recommend_batch(users_df, top_n=10, rng=None, res=None):
+    """
+    Rekomendasi untuk seluruh users_df (kolom: age, gender, height, weight[, activity, user_id]).
+    Return DataFrame long-format: satu baris per (user, rank). User yang tidak lolos
+    validate_users() atau di luar tabel AKG tidak muncul (alasannya: skip_reasons).
+    """
+    missing = [c for c in REQUIRED_COLS if c not in users_df.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {missing}")
+    res = get_resources() if res is None else res
+    rng = np.random.default_rng() if rng is None else rng
+    catalog = res.catalog
+    users_df, reason = skip_reasons(users_df.reset_index(drop=True))
+    user_id = users_df['user_id'].to_numpy() if 'user_id' in users_df.columns else np.arange(len(users_df))
+
+    # 1. Prediksi status gizi — satu panggilan model untuk semua user valid
+    status = predict_status_batch(users_df, res)
+
+    # 2. Target kalori per user — sama dengan NutritionProfile.kalori_target (rentang TEE),
+    #    hanya untuk user valid yang punya baris AKG
+    has_akg = reason == ''
+    kalori_target = np.full(len(users_df), np.nan)
+    if has_akg.any():
+        v = users_df[has_akg]
+        energi = hitung_energi_batch(v['gender'].to_numpy(), v['age'].to_numpy(), v['height'].to_numpy(),
+                                     v['weight'].to_numpy(), pal_dari_frame(v), status[has_akg])
+        kalori_target[has_akg] = kalori_target_dari(energi['tee_min'], energi['tee_max'])
+
+    # 3. Scoring target × menu dalam satu operasi broadcast. Target dibulatkan ke
+    #    KCAL_BIN seperti CandidatePoolCache (≤ ~80 bin per kohort), jadi cukup scoring
+    #    bin unik lalu di-gather per user.
+    valid_users = np.flatnonzero(has_akg)
+    uniq, inverse = np.unique(bin_kalori(kalori_target[valid_users]), return_inverse=True)
+    pool_idx, pool_w = rank_candidates_many(catalog, uniq)
+
+    # 4. Gumbel top-k per user
+    user_pool_idx = pool_idx[inverse]
+    user_pool_w = pool_w[inverse]
+    slot = gumbel_top_k(user_pool_w, top_n, rng)
+    picked = np.take_along_axis(user_pool_idx, slot, axis=1)               # (u, top_n), -1 = kosong
+    picked_w = np.take_along_axis(user_pool_w, slot, axis=1)
+    keep = picked_w > 0
+
+    # 5. Susun output long-format
+    rows_user = np.repeat(valid_users, slot.shape[1])[keep.ravel()]
+    rank = np.tile(np.arange(1, slot.shape[1] + 1), len(valid_users))[keep.ravel()]
+    menu_idx = picked[keep]
+    out = pd.DataFrame({
+        'user_id': user_id[rows_user],
+        'status': status[rows_user],
+        'kalori_target': kalori_target[rows_user],
+        'rank': rank,
+        'Menu': catalog.menu[menu_idx],
+        'image': catalog.image[menu_idx],
+    })
+    nutrients = catalog.rows(menu_idx)[NUTRIENT_COLS].to_numpy()
+    for j, col in enumerate(NUTRIENT_COLS):
+        out[col] = nutrients[:, j]
+    if 'activity' in users_df.columns:
+        out.insert(2, 'activity', users_df['activity'].to_numpy()[rows_user])
+    return out
+
+
+def write_output(df, path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        # to_parquet butuh pyarrow (requirements.txt) atau fastparquet
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('users_csv', help='CSV kohort: age, gender, height, weight[, activity, user_id]')
+    ap.add_argument('-o', '--output', default='rekomendasi_batch.csv', help='file output (.csv atau .parquet)')
+    ap.add_argument('--top-n', type=int, default=10)
+    ap.add_argument('--seed', type=int, default=None, help='seed RNG agar hasil bisa direproduksi')
+    args = ap.parse_args(argv)
+
+    users_df = pd.read_csv(args.users_csv)
+    res = get_resources()
+
+    t0 = time.perf_counter()
+    out = recommend_batch(users_df, top_n=args.top_n, rng=np.random.default_rng(args.seed), res=res)
+    elapsed = time.perf_counter() - t0
+
+    write_output(out, args.output)
+    n = len(users_df)
+    print(f"{n} user → {len(out)} baris rekomendasi dalam {elapsed:.3f} s "
+          f"({n / elapsed:,.0f} user/detik) → {args.output}", file=sys.stderr)
+    _, reason = skip_reasons(users_df)
+    for alasan, count in pd.Series(reason[reason != '']).value_counts().items():
+        print(f"  dilewati: {count} user — {alasan}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
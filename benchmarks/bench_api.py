@@ -0,0 +1,129 @@
+# benchmarks/bench_api.py
+"""
+Uji beban lokal api.py: server uvicorn dijalankan di subprocess, lalu N klien
+bersamaan (thread, koneksi keep-alive http.client) mengirim request acak dalam
+domain form ke tiap endpoint. Menampilkan throughput (req/s) dan latensi
+p50/p99 per endpoint, plus histogram tahap dari /metrics.
+
+    python benchmarks/bench_api.py --clients 16 --seconds 10 --endpoints status,recommend,report.pdf
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+
+from energy import PAL_LEVELS  # noqa: E402
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def random_body(rng):
+    return {
+        'gender': str(rng.choice(["Male", "Female"])),
+        'age': int(rng.integers(15, 60)),
+        'height': int(rng.integers(150, 201)) / 100,
+        'weight': int(rng.integers(40, 131)),
+        'activity': str(rng.choice(list(PAL_LEVELS))),
+    }
+
+
+def start_server(port, threads, processes):
+    proc = subprocess.Popen(
+        [sys.executable, 'api.py', '--port', str(port), '--threads', str(threads), '--processes', str(processes)],
+        cwd=ROOT,
+    )
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/healthz')
+            if conn.getresponse().status == 200:
+                return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("server api.py tidak siap dalam 120 s")
+
+
+def run_load(port, endpoint, clients, seconds, seed):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def client(i):
+        rng = np.random.default_rng(seed + i)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local, bad = [], 0
+        while time.perf_counter() < stop:
+            body = json.dumps(random_body(rng))
+            t0 = time.perf_counter()
+            conn.request('POST', f'/v1/{endpoint}', body=body, headers={'Content-Type': 'application/json'})
+            resp = conn.getresponse()
+            resp.read()
+            local.append(time.perf_counter() - t0)
+            bad += resp.status != 200
+        with lock:
+            latencies.extend(local)
+            errors.append(bad)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    ms = np.array(latencies) * 1e3
+    return {
+        'requests': len(ms), 'errors': sum(errors), 'rps': len(ms) / elapsed,
+        'p50_ms': float(np.percentile(ms, 50)), 'p99_ms': float(np.percentile(ms, 99)),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--clients', type=int, default=16)
+    ap.add_argument('--seconds', type=float, default=10)
+    ap.add_argument('--endpoints', default='status,energy,recommend,report.pdf')
+    ap.add_argument('--threads', type=int, default=8, help='thread pool server')
+    ap.add_argument('--processes', type=int, default=1, help='proses uvicorn')
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    port = _free_port()
+    proc = start_server(port, args.threads, args.processes)
+    try:
+        print(f"{args.clients} klien, {args.seconds:.0f} s per endpoint, server {args.processes} proses "
+              f"× {args.threads} thread")
+        print(f"{'endpoint':12} | {'request':>7} | {'req/s':>8} | {'p50':>9} | {'p99':>9} | error")
+        for endpoint in args.endpoints.split(','):
+            r = run_load(port, endpoint, args.clients, args.seconds, args.seed)
+            print(f"{endpoint:12} | {r['requests']:7d} | {r['rps']:8.1f} | {r['p50_ms']:6.1f} ms "
+                  f"| {r['p99_ms']:6.1f} ms | {r['errors']}")
+
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        conn.request('GET', '/metrics')
+        counts = [line for line in conn.getresponse().read().decode().splitlines() if '_count' in line]
+        print("\n" + "\n".join(counts))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
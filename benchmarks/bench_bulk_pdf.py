@@ -0,0 +1,89 @@
+# benchmarks/bench_bulk_pdf.py
+"""
+Skala bulk_pdf.py terhadap jumlah worker: laporan/detik dan RSS puncak (proses
+induk dan worker terbesar) untuk roster sintetis, dengan dan tanpa preload
+thumbnail di proses induk.
+
+Tiap konfigurasi dijalankan di subprocess sendiri agar ru_maxrss tidak
+tercampur. Angka laporan/detik hanya naik bersama worker bila core tersedia
+(lihat kolom "cpu" di header).
+
+    python benchmarks/bench_bulk_pdf.py --users 400 --workers 0,1,2,4
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from bulk_pdf import build_jobs, preload_images, read_roster, write_zip  # noqa: E402
+from energy import PAL_LEVELS  # noqa: E402
+
+
+def write_synthetic_roster(path, users, seed=0):
+    rng = np.random.default_rng(seed)
+    pd.DataFrame({
+        'user_id': np.arange(1, users + 1),
+        'age': rng.integers(15, 60, users),
+        'gender': rng.choice(["Male", "Female"], users),
+        'height': rng.integers(150, 201, users) / 100,
+        'weight': rng.integers(40, 131, users),
+        'activity': rng.choice(list(PAL_LEVELS), users),
+    }).to_csv(path, index=False)
+
+
+def run_one(roster_path, workers, preload, batch_size):
+    t0 = time.perf_counter()
+    jobs, skipped = build_jobs(read_roster(roster_path), rng=np.random.default_rng(0))
+    jpegs = preload_images(img for *_, df in jobs for img in df['image']) if preload else None
+    prep = time.perf_counter() - t0
+    with tempfile.TemporaryDirectory() as tmp:
+        stats = write_zip(jobs, os.path.join(tmp, 'laporan.zip'), workers=workers, batch_size=batch_size,
+                          jpegs=jpegs, skipped=skipped)
+    stats['prep_s'] = prep
+    print(json.dumps(stats))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--users', type=int, default=400)
+    ap.add_argument('--workers', default='0,1,2,4', help='daftar jumlah worker (0 = serial)')
+    ap.add_argument('--batch-size', type=int, default=8)
+    ap.add_argument('--run', nargs=3, metavar=('ROSTER', 'WORKERS', 'PRELOAD'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.run:
+        run_one(args.run[0], int(args.run[1]), args.run[2] == '1', args.batch_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roster = os.path.join(tmp, 'roster.csv')
+        write_synthetic_roster(roster, args.users)
+        print(f"{args.users} user, batch {args.batch_size}, cpu {os.cpu_count()}")
+        print(f"{'worker':>6} | {'preload':>7} | {'persiapan':>9} | {'render':>8} | {'laporan/s':>9} "
+              f"| {'RSS induk':>9} | {'RSS worker':>10}")
+        for workers in map(int, args.workers.split(',')):
+            for preload in ('1', '0'):
+                out = subprocess.run(
+                    [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--batch-size', str(args.batch_size),
+                     '--run', roster, str(workers), preload],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                worker_rss = f"{r['peak_rss_worker_mb']:7.0f} MB" if r['peak_rss_worker_mb'] else f"{'-':>10}"
+                print(f"{workers:6d} | {'ya' if preload == '1' else 'tidak':>7} | {r['prep_s']:7.2f} s "
+                      f"| {r['seconds']:6.2f} s | {r['reports_per_s']:9.1f} | {r['peak_rss_parent_mb']:6.0f} MB "
+                      f"| {worker_rss}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/bench_forest.py
+"""
+Pickle Random Forest vs artefak datar (forest_artifact.py): waktu muat, RSS
+dan latensi prediksi per ukuran batch, dari 1 baris (request online) sampai
+batch kohort puluhan ribu baris.
+
+- pickle : joblib.load(Models/random_forest_model.pkl) → best_rf.predict (n_jobs bawaan pickle)
+- datar  : forest_artifact.load_forest() (mmap Models/forest.bin) → FlatForest.predict
+
+Kolom `rute` = model yang dipilih Resources.model_for() untuk ukuran batch itu
+(hutan datar s.d. FLAT_FOREST_MAX_ROWS baris, sklearn di atasnya) dan ditandai
+`!` bila model lain lebih cepat — tanda batas EDUNUTRI_FLAT_FOREST_MAX_ROWS perlu
+digeser untuk mesin ini.
+
+Tiap model dimuat di subprocess sendiri (numpy/joblib/resources sudah diimpor
+lebih dulu di keduanya) agar RSS tidak tercampur. RSS anon = memori privat
+proses; halaman mmap forest.bin masuk RSS file-backed dan dibagi antar worker
+lewat page cache. Di akhir: paritas label/proba pada baris acak yang sama.
+
+Butuh artefak: python forest_artifact.py build
+
+    python benchmarks/bench_forest.py [--batches 1,8,64,256,512,4096,50000] [--repeat 50]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import joblib  # noqa: E402
+import numpy as np  # noqa: E402
+
+import resources  # noqa: E402
+from forest_artifact import FLAT_FOREST_MAX_ROWS, load_forest  # noqa: E402
+
+MODES = ('pickle', 'datar')
+
+
+def _rss_mb():
+    """(RSS total, RSS anon) proses ini dalam MB, dari /proc/self/status."""
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon'):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields['VmRSS'], fields['RssAnon']
+
+
+def _sample_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([rng.integers(0, 2, n), rng.integers(15, 80, n), rng.uniform(1.4, 2.1, n),
+                         rng.uniform(35, 140, n)])
+    return joblib.load(resources.SCALER_PKL).transform(X)
+
+
+def _load(mode):
+    if mode == 'pickle':
+        return joblib.load(resources.MODEL_PKL)
+    model = load_forest()
+    if model is None:
+        sys.exit("artefak hutan datar tidak ada / tidak cocok — jalankan: python forest_artifact.py build")
+    return model
+
+
+def run_one(mode, batches, repeat):
+    X = _sample_rows(max(batches))
+    rss0 = _rss_mb()
+    t0 = time.perf_counter()
+    model = _load(mode)
+    load_s = time.perf_counter() - t0
+    rss_load = _rss_mb()
+
+    latency = {}
+    for b in batches:
+        chunk = X[:b]
+        if b <= 4096:
+            model.predict(chunk)  # pemanasan
+        times = []
+        for _ in range(repeat if b <= 512 else max(1, repeat // 10) if b <= 4096 else 1):
+            t = time.perf_counter()
+            model.predict(chunk)
+            times.append(time.perf_counter() - t)
+        latency[b] = statistics.median(times)
+    rss_pred = _rss_mb()
+    print(json.dumps({
+        'load_s': load_s,
+        'rss_load_mb': rss_load[0] - rss0[0], 'anon_load_mb': rss_load[1] - rss0[1],
+        'rss_pred_mb': rss_pred[0] - rss0[0], 'anon_pred_mb': rss_pred[1] - rss0[1],
+        'latency': latency,
+    }))
+
+
+def parity(rows):
+    X = _sample_rows(rows, seed=1)
+    best_rf = _load('pickle')
+    best_rf.n_jobs = 1  # urutan akumulasi proba antar pohon deterministik
+    forest = _load('datar')
+    labels = int((forest.predict(X) != best_rf.predict(X)).sum())
+    proba = int((forest.predict_proba(X) != best_rf.predict_proba(X)).any(axis=1).sum())
+    return labels, proba
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--batches', default='1,8,64,256,512,4096,50000', help='ukuran batch prediksi')
+    ap.add_argument('--repeat', type=int, default=50,
+                    help='ulangan latensi per batch (÷10 untuk batch > 512, 1× untuk batch > 4096)')
+    ap.add_argument('--parity-rows', type=int, default=20000)
+    ap.add_argument('--run', choices=MODES, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    warnings.filterwarnings('ignore')
+    batches = [int(b) for b in args.batches.split(',')]
+
+    if args.run:
+        run_one(args.run, batches, args.repeat)
+        return
+
+    results = {}
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--batches', args.batches,
+             '--repeat', str(args.repeat), '--run', mode],
+            capture_output=True, text=True, check=True,
+        )
+        results[mode] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    print(f"pickle {os.path.getsize(resources.MODEL_PKL) / 1024:.0f} KiB, "
+          f"forest.bin {os.path.getsize('Models/forest.bin') / 1024:.0f} KiB, cpu {os.cpu_count()}\n")
+    print(f"{'model':<7} | {'muat':>9} | {'RSS muat':>8} | {'anon muat':>9} | {'RSS +predict':>12} "
+          f"| {'anon +predict':>13}")
+    for mode in MODES:
+        r = results[mode]
+        print(f"{mode:<7} | {r['load_s'] * 1e3:6.1f} ms | {r['rss_load_mb']:5.1f} MB | {r['anon_load_mb']:6.1f} MB "
+              f"| {r['rss_pred_mb']:9.1f} MB | {r['anon_pred_mb']:10.1f} MB")
+    print(f"muat {results['pickle']['load_s'] / results['datar']['load_s']:.0f}x lebih cepat\n")
+
+    print(f"{'batch':>6} | {'pickle':>10} | {'datar':>10} | rasio | {'ribu baris/s':>12} | rute "
+          f"(FLAT_FOREST_MAX_ROWS={FLAT_FOREST_MAX_ROWS})")
+    for b in batches:
+        t_pkl, t_flat = results['pickle']['latency'][str(b)], results['datar']['latency'][str(b)]
+        route, t_route, t_other = (('datar', t_flat, t_pkl) if b <= FLAT_FOREST_MAX_ROWS
+                                   else ('pickle', t_pkl, t_flat))
+        print(f"{b:6d} | {t_pkl * 1e3:7.2f} ms | {t_flat * 1e3:7.2f} ms | {t_pkl / t_flat:5.1f}x | "
+              f"{b / t_route / 1e3:12.1f} | {route}{' !' if t_other < t_route else ''}")
+
+    labels, proba = parity(args.parity_rows)
+    print(f"\nparitas {args.parity_rows} baris acak: {labels} label beda, {proba} baris proba beda")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_inference.py
+"""
+Uji beban prediksi status gizi dari banyak sesi bersamaan:
+panggilan langsung res.model_for(1).predict per baris vs BatchingPredictor (micro-batching).
+Menampilkan throughput dan latensi p50/p99 untuk beberapa ukuran jendela.
+
+    python benchmarks/bench_inference.py --threads 16 --requests 50 --windows 0.5,2,5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+
+from inference import BatchingPredictor  # noqa: E402
+from resources import get_resources  # noqa: E402
+
+
+def _run_load(call, threads, per_thread, rows):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(seed):
+        local = []
+        for i in range(per_thread):
+            row = rows[(seed * per_thread + i) % len(rows)]
+            t0 = time.perf_counter()
+            call(row)
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    ts = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    t0 = time.perf_counter()
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    wall = time.perf_counter() - t0
+    lat = np.array(latencies) * 1e3
+    return len(lat) / wall, *np.percentile(lat, [50, 99])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--threads', type=int, default=16)
+    ap.add_argument('--requests', type=int, default=50, help='request per thread')
+    ap.add_argument('--windows', default='0.5,2,5', help='daftar jendela batching (ms)')
+    ap.add_argument('--max-batch', type=int, default=64)
+    args = ap.parse_args()
+
+    res = get_resources()
+    rng = np.random.default_rng(0)
+    n = 1000
+    rows = np.column_stack([
+        rng.integers(0, 2, n), rng.integers(15, 60, n),
+        rng.uniform(1.5, 2.0, n).round(3), rng.uniform(40, 130, n).round(1),
+    ])
+
+    def direct(row):
+        return res.model_for(1).predict(res.scaler.transform(row.reshape(1, -1)))[0]
+
+    rps, p50, p99 = _run_load(direct, args.threads, args.requests, rows)
+    print(f"{'langsung':>14} | {rps:8.1f} req/s | p50 {p50:8.2f} ms | p99 {p99:8.2f} ms")
+
+    for w in (float(x) for x in args.windows.split(',')):
+        pred = BatchingPredictor(res.scaler, res.model_for(args.max_batch), window_ms=w, max_batch=args.max_batch)
+        rps, p50, p99 = _run_load(pred.predict, args.threads, args.requests, rows)
+        st = pred.stats()
+        pred.close()
+        print(f"{f'batch {w:g} ms':>14} | {rps:8.1f} req/s | p50 {p50:8.2f} ms | p99 {p99:8.2f} ms "
+              f"| rata2 batch {st['batch_size_mean']:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_ingest.py
+"""
+Throughput (baris/s) dan peak RSS membangun NutrientCatalog dari CSV besar:
+load_nutri_df_csv (read_csv penuh + .apply) vs ingest.ingest_catalog (streaming per chunk).
+
+CSV sintetis = baris dataset_nutrients.csv yang diambil ulang dengan noise
+log-normal; nama file diberi awalan huruf unik (angka dibuang oleh
+extract_menu_name) sehingga hampir semua baris menjadi menu berbeda.
+Dengan --distinct N nama berulang (duplikat), sehingga katalog akhir kecil dan
+peak RSS streaming ≈ satu chunk, tidak ikut membesar bersama file.
+Tiap metode dijalankan di subprocess sendiri agar ru_maxrss tidak tercampur.
+
+    python benchmarks/bench_ingest.py --rows 1000000,3000000 --chunksize 200000
+    python benchmarks/bench_ingest.py --rows 1000000,3000000 --distinct 50000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from ingest import DEFAULT_CHUNKSIZE, ingest_catalog  # noqa: E402
+from recommender import NutrientCatalog  # noqa: E402
+from resources import NUTRI_CSV, load_nutri_df_csv  # noqa: E402
+
+
+def _letters(i):
+    out = ''
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        out = chr(97 + r) + out
+    return out
+
+
+def write_synthetic_csv(path, rows, distinct=0, seed=0, chunk=500_000):
+    """distinct > 0: awalan nama berulang setiap `distinct` baris (katalog sarat duplikat)."""
+    base = pd.read_csv(NUTRI_CSV)
+    numeric = [c for c in base.columns if c not in ('index', 'image')]
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        ids = np.arange(start, start + n) % distinct if distinct else np.arange(start, start + n)
+        pick = base.iloc[ids % len(base) if distinct else rng.integers(0, len(base), n)]
+        df = pd.DataFrame({'index': np.arange(start, start + n)})
+        df['image'] = [f"{_letters(int(k))}-{img}" for k, img in zip(ids, pick['image'].tolist())]
+        for c in numeric:
+            df[c] = np.round(pick[c].to_numpy() * rng.lognormal(0.0, 0.15, n), 2)
+        df.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+
+
+def run_one(method, path, chunksize):
+    t0 = time.perf_counter()
+    if method == 'streaming':
+        catalog, _ = ingest_catalog(path, chunksize)
+    else:
+        catalog = NutrientCatalog(load_nutri_df_csv(path))
+    seconds = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'catalog': len(catalog), 'seconds': seconds, 'peak_rss_mb': peak_mb}))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--rows', default='1000000,3000000')
+    ap.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE)
+    ap.add_argument('--distinct', type=int, default=0, help="jumlah awalan nama berbeda (0 = semua unik)")
+    ap.add_argument('--run', nargs=2, metavar=('METODE', 'CSV'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.run:
+        run_one(args.run[0], args.run[1], args.chunksize)
+        return
+
+    print(f"{'baris':>9} | {'metode':>9} | {'waktu':>8} | {'baris/s':>9} | {'peak RSS':>9} | katalog")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in (int(r) for r in args.rows.split(',')):
+            path = os.path.join(tmp, f"nutrients_{rows}.csv")
+            write_synthetic_csv(path, rows, args.distinct)
+            for method in ('penuh', 'streaming'):
+                out = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--chunksize', str(args.chunksize),
+                     '--run', method, path],
+                    capture_output=True, text=True, check=True,
+                )
+                r = json.loads(out.stdout.strip().splitlines()[-1])
+                print(f"{rows:9d} | {method:>9} | {r['seconds']:6.1f} s | {rows / r['seconds']:9,.0f} "
+                      f"| {r['peak_rss_mb']:6.0f} MB | {r['catalog']}")
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
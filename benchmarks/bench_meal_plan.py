@@ -0,0 +1,116 @@
+# benchmarks/bench_meal_plan.py
+"""
+Waktu jawab optimize_daily_plan() (meal_plan.py) di seluruh katalog untuk user
+acak dalam domain form. Rentang kebutuhan diambil dari
+nutrition_profile.get_profile — jalur yang sama dengan app.py dan api.py.
+
+Bagian mingguan: WeeklyPlanner.solve() (7 hari) lalu satu swap per hari;
+larangan pengulangan dan hari lain yang tidak berubah ikut dicek.
+
+    python benchmarks/bench_meal_plan.py --users 500 --weekly-users 50 --no-repeat 3
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+
+from energy import PAL_LEVELS  # noqa: E402
+from meal_plan import NO_REPEAT_DAYS, WeeklyPlanner, optimize_daily_plan, plan_targets  # noqa: E402
+from nutrition_profile import get_profile  # noqa: E402
+from resources import get_resources, klasifikasi_bmi  # noqa: E402
+
+
+def targets_for(gender, age, height, weight, activity, status):
+    """Rentang harian dari profil gizi yang sama dengan app.py (nutrition_profile.get_profile)."""
+    e = get_profile(gender, age, height, weight, activity, status).energi
+    return plan_targets(e.tee_min, e.tee_max, e.karbo_min, e.karbo_max, e.protein_min, e.protein_max,
+                        e.lemak_min, e.lemak_max, e.serat_min, e.serat_max)
+
+
+def random_user(rng):
+    gender = str(rng.choice(["Male", "Female"]))
+    age = int(rng.integers(15, 60))
+    height = int(rng.integers(150, 201)) / 100
+    weight = int(rng.integers(40, 131))
+    status = klasifikasi_bmi(weight / height ** 2)
+    return targets_for(gender, age, height, weight, str(rng.choice(list(PAL_LEVELS))), status)
+
+
+def _pct(values):
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return f"p50 {p50:6.1f} ms | p95 {p95:6.1f} ms | p99 {p99:6.1f} ms | max {max(values):6.1f} ms"
+
+
+def bench_daily(catalog, users, rng):
+    times, nodes, sizes, feasible = [], [], [], 0
+    for _ in range(users):
+        targets = random_user(rng)
+        plan = optimize_daily_plan(catalog, targets, rng=rng)
+        times.append(plan.seconds * 1e3)
+        nodes.append(plan.nodes)
+        sizes.append(len(plan.items))
+        if plan.feasible:
+            lo_ok = all(plan.totals[c] >= targets.lo[i] - 1e-6 for i, c in enumerate(plan.totals))
+            hi_ok = all(plan.totals[c] <= targets.hi[i] + 1e-6 for i, c in enumerate(plan.totals))
+            assert lo_ok and hi_ok, plan.totals
+            feasible += 1
+
+    print(f"[harian] katalog {len(catalog)} menu, {users} user")
+    print(f"waktu jawab   : {_pct(times)}")
+    print(f"node B&B      : p50 {np.median(nodes):6.0f} | max {max(nodes):6d}")
+    print(f"masuk rentang : {feasible}/{users}  (sisanya: kombinasi dengan pelanggaran rentang terkecil)")
+    print(f"jumlah menu   : " + ", ".join(f"{k} menu ×{sizes.count(k)}" for k in sorted(set(sizes))))
+
+
+def _check_no_repeat(planner):
+    menus = [set(p.items['Menu']) for p in planner.plans]
+    for d in range(planner.days):
+        for e in range(d + 1, min(planner.days, d + planner.no_repeat_days)):
+            assert not menus[d] & menus[e], (d, e, menus[d] & menus[e])
+
+
+def bench_weekly(catalog, users, no_repeat, rng):
+    solve, repair, feasible_days = [], [], 0
+    for _ in range(users):
+        planner = WeeklyPlanner(catalog, random_user(rng), no_repeat_days=no_repeat, rng=rng)
+        planner.solve()
+        solve.append(planner.solve_seconds * 1e3)
+        _check_no_repeat(planner)
+        for day in range(planner.days):
+            before = [list(p.items['Menu']) for p in planner.plans]
+            menu = before[day][0]
+            plan = planner.swap(day, menu)
+            repair.append(planner.repair_seconds * 1e3)
+            assert menu not in set(plan.items['Menu'])
+            assert all(list(planner.plans[d].items['Menu']) == before[d] for d in range(planner.days) if d != day)
+            _check_no_repeat(planner)
+        feasible_days += sum(p.feasible for p in planner.plans)
+
+    print(f"[mingguan] {users} user × 7 hari, tanpa pengulangan dalam {no_repeat} hari")
+    print(f"solve 7 hari  : {_pct(solve)}")
+    print(f"repair 1 swap : {_pct(repair)}")
+    print(f"hari masuk rentang (setelah swap): {feasible_days}/{users * 7}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--users', type=int, default=500)
+    ap.add_argument('--weekly-users', type=int, default=50)
+    ap.add_argument('--no-repeat', type=int, default=NO_REPEAT_DAYS)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    catalog = get_resources().catalog
+    rng = np.random.default_rng(args.seed)
+    bench_daily(catalog, args.users, rng)
+    print()
+    bench_weekly(catalog, args.weekly_users, args.no_repeat, rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_menu_index.py
+"""
+Latensi top-k (pool 100 kandidat) per target kalori: scan linear score_raw vs
+KD-tree (menu_index.py), pada katalog sintetis 1k → 1M baris, plus cek paritas
+terhadap scorer brute-force.
+
+Katalog sintetis = baris dataset_nutrients.csv yang diambil ulang dengan noise
+multiplikatif (log-normal), jadi sebaran nutrisinya mirip data asli.
+
+    python benchmarks/bench_menu_index.py --sizes 1000,10000,100000,1000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from recommender import (  # noqa: E402
+    MACRO_FACTORS, NUTRIENT_COLS, POOL_SIZE, SCORE_WEIGHTS, STATUS_GIZI, NutrientCatalog, akg_df,
+    kalori_target_for, rank_candidates, score_raw,
+)
+from menu_index import MenuIndex  # noqa: E402
+from resources import load_nutri_df  # noqa: E402
+
+
+def synthetic_catalog(base, n, rng, noise=0.15):
+    rows = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+    df = pd.DataFrame({c: rows[c].to_numpy() * rng.lognormal(0.0, noise, n) for c in NUTRIENT_COLS})
+    df['Menu'] = [f"menu {i}" for i in range(n)]
+    df['image'] = rows['image'].to_numpy()
+    return df
+
+
+def targets():
+    return sorted({kalori_target_for(akg, s) for akg in akg_df.to_dict('records') for s in STATUS_GIZI})
+
+
+def parity(catalog, kalori_target, pool_size=POOL_SIZE, rtol=1e-5):
+    """
+    Bandingkan jalur indeks vs brute-force. Urutan/himpunan hanya boleh beda pada
+    skor yang seri (|Δraw| dalam toleransi float32 vs float64).
+    Return selisih bobot maksimum.
+    """
+    a, wa = rank_candidates(catalog, kalori_target, pool_size, use_index=False)
+    b, wb = rank_candidates(catalog, kalori_target, pool_size, use_index=True)
+    assert len(a) == len(b), (len(a), len(b))
+    scale = max(float(np.abs(wa).max()), 1e-12)
+    assert np.allclose(wa, wb, rtol=rtol, atol=rtol * scale), np.abs(wa - wb).max()
+    diff = set(a.tolist()) ^ set(b.tolist())
+    if diff:
+        raw = score_raw(catalog, kalori_target)
+        boundary = raw[a[-1]]
+        assert all(abs(raw[i] - boundary) <= rtol * max(abs(boundary), 1e-12) for i in diff), diff
+    return float(np.abs(wa - wb).max())
+
+
+def _median_ms(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return statistics.median(out) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', default='1000,10000,100000,1000000')
+    ap.add_argument('--repeat', type=int, default=20)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args()
+
+    base = load_nutri_df()
+    rng = np.random.default_rng(args.seed)
+    ks = targets()
+    print(f"{'baris':>9} | {'build':>8} | {'linear':>9} | {'KD-tree':>9} | {'speedup':>7} | paritas (maks Δbobot)")
+    for n in (int(s) for s in args.sizes.split(',')):
+        catalog = NutrientCatalog(synthetic_catalog(base, n, rng))
+        t0 = time.perf_counter()
+        catalog.index = MenuIndex(catalog.matrix, SCORE_WEIGHTS, MACRO_FACTORS)
+        build_ms = (time.perf_counter() - t0) * 1e3
+
+        t_lin = statistics.median(
+            _median_ms(lambda: rank_candidates(catalog, k, use_index=False), args.repeat) for k in ks)
+        t_idx = statistics.median(
+            _median_ms(lambda: rank_candidates(catalog, k, use_index=True), args.repeat) for k in ks)
+        worst = max(parity(catalog, k) for k in ks)
+        print(f"{len(catalog):9d} | {build_ms:6.0f} ms | {t_lin:6.3f} ms | {t_idx:6.3f} ms | {t_lin / t_idx:6.1f}x "
+              f"| OK ({worst:.1e})")
+
+
+if __name__ == '__main__':
+    main()
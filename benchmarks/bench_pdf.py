@@ -0,0 +1,89 @@
+# benchmarks/bench_pdf.py
+"""
+Ukuran & waktu build pdf_laporan_lengkap:
+- lama : verify() + embed file gambar resolusi penuh (_legacy_image_cell, hanya di sini)
+- baru : JPEG 90 px dari cache LRU (cold = cache kosong, warm = cache terisi)
+
+    python benchmarks/bench_pdf.py --reports 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+from PIL import Image as PILImage  # noqa: E402
+
+import report_pdf  # noqa: E402
+from recommender import NutrientCatalog, recommend_menu_demographic  # noqa: E402
+from resources import load_nutri_df  # noqa: E402
+
+USER = {"usia": 25, "jk": "Male", "tb": 1.70, "bb": 65, "pal": "Moderately Active (3–5 times/week)"}
+METRICS = {
+    "bmi": 22.5, "kategori": "Normal", "bmr": 1650, "tee": 2550, "target_kalori": 2550,
+    "carb_min": 287, "carb_max": 414, "protein_min": 64, "protein_max": 191,
+    "fat_min": 57, "fat_max": 85, "fiber_min": 25, "fiber_max": 37,
+}
+
+
+def _legacy_image_cell(image, image_root, thumbs, manifest, styles):
+    """Jalur lama sebelum cache JPEG: verify() + embed file asli resolusi penuh."""
+    img_path = os.path.join(image_root, image)
+    if not os.path.exists(img_path):
+        return report_pdf.Paragraph("⚠ not found", styles["BodyText"])
+    try:
+        with PILImage.open(img_path) as im:
+            im.verify()
+        return report_pdf.RLImage(img_path, width=45, height=45)
+    except Exception:
+        return report_pdf.Paragraph("⚠ image error", styles["BodyText"])
+
+
+def _build(df):
+    t0 = time.perf_counter()
+    buf = report_pdf.pdf_laporan_lengkap(USER, METRICS, df)
+    return time.perf_counter() - t0, len(buf.getvalue())
+
+
+def _build_legacy(df):
+    cell, report_pdf._image_cell = report_pdf._image_cell, _legacy_image_cell
+    try:
+        return _build(df)
+    finally:
+        report_pdf._image_cell = cell
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--reports', type=int, default=20, help='jumlah laporan (rekomendasi acak) per mode')
+    args = ap.parse_args()
+    if not report_pdf.REPORTLAB_AVAILABLE:
+        sys.exit("reportlab belum terpasang")
+
+    catalog = NutrientCatalog(load_nutri_df())
+    rng = np.random.default_rng(0)
+    statuses = ['Underweight', 'Normal', 'Overweight', 'Obesity']
+    dfs = [recommend_menu_demographic(catalog, statuses[i % 4], 'Male', 25, None, rng=rng)
+           for i in range(args.reports)]
+
+    rows = {}
+    rows['lama (file asli)'] = [_build_legacy(df) for df in dfs]
+    report_pdf._downscaled_jpeg.cache_clear()
+    rows['baru (cold cache)'] = [_build(df) for df in dfs]
+    rows['baru (warm cache)'] = [_build(df) for df in dfs]
+
+    base_t = statistics.median(t for t, _ in rows['lama (file asli)'])
+    for name, res in rows.items():
+        t = statistics.median(x for x, _ in res)
+        size = statistics.median(s for _, s in res)
+        print(f"{name:18} | build {t * 1e3:8.1f} ms | ukuran {size / 1024:8.1f} KiB | {base_t / t:5.1f}x")
+    print(f"cache gambar: {report_pdf._downscaled_jpeg.cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
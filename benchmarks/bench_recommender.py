@@ -0,0 +1,94 @@
+# benchmarks/bench_recommender.py
+"""
+Latensi recommend_menu_demographic: implementasi lama (filter .copy() + kolom
+score_raw/score + sort_values/drop_duplicates per request) vs katalog float32
+terkompilasi + pool kandidat ter-cache. Sekaligus cek paritas pool 100 kandidat
+dan statistik hit/miss CandidatePoolCache.
+
+    python benchmarks/bench_recommender.py --repeat 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+
+from recommender import (  # noqa: E402
+    NutrientCatalog, get_user_akg, kalori_target_for, rank_candidates, recommend_menu_demographic,
+)
+from resources import load_nutri_df  # noqa: E402
+
+PROFILES = [('Male', 25, 'Normal'), ('Female', 40, 'Underweight'), ('Male', 55, 'Obesity'), ('Female', 17, 'Overweight')]
+
+
+def legacy_candidates(nutri_df, status_gizi, gender, age):
+    """Salinan jalur pandas lama sampai pembentukan top_candidates."""
+    akg = get_user_akg(gender, age)
+    kalori_target = kalori_target_for(akg, status_gizi)
+    karbo_target = (0.55 * kalori_target) / 4
+    protein_target = (0.20 * kalori_target) / 4
+    lemak_target = (0.25 * kalori_target) / 9
+    filt = nutri_df[
+        (nutri_df['kcal'] > 50) & (nutri_df['protein'] > 1) &
+        (nutri_df['fat'] > 1) & (nutri_df['carbs'] > 5)
+    ].copy()
+    w = np.array([1/0.10, 1/0.20, 1/0.25, 1/0.15])
+    w_cals, w_c, w_p, w_f = w / w.sum()
+    filt['score_raw'] = (
+        w_cals*abs(filt['kcal'] - kalori_target)/kalori_target +
+        w_p   *abs(filt['protein'] - protein_target)/protein_target +
+        w_f   *abs(filt['fat'] - lemak_target)/lemak_target +
+        w_c   *abs(filt['carbs'] - karbo_target)/karbo_target
+    )
+    filt['score'] = filt['score_raw'].max() - filt['score_raw']
+    return filt[filt['score'] > 0].sort_values(by='score', ascending=False).drop_duplicates('Menu').head(100)
+
+
+def legacy_recommend(nutri_df, status_gizi, gender, age, top_n=10):
+    top = legacy_candidates(nutri_df, status_gizi, gender, age)
+    rekom = top.sample(n=min(top_n, len(top)), weights='score', replace=False)
+    return rekom[['Menu', 'image', 'kcal', 'protein', 'fat', 'carbs', 'fibre']]
+
+
+def _median_ms(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return statistics.median(out) * 1e3
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--repeat', type=int, default=200)
+    args = ap.parse_args()
+
+    nutri_df = load_nutri_df()
+    catalog = NutrientCatalog(nutri_df)
+    catalog.pools.warm()
+    print(f"katalog: {len(nutri_df)} menu, {len(catalog)} lolos filter kelayakan")
+
+    for gender, age, status in PROFILES:
+        # Paritas pool kandidat (himpunan menu; urutan bisa beda hanya pada skor yang seri)
+        old = set(legacy_candidates(nutri_df, status, gender, age)['Menu'])
+        idx, _ = rank_candidates(catalog, kalori_target_for(get_user_akg(gender, age), status))
+        new = set(catalog.menu[idx])
+        overlap = len(old & new) / max(len(old), 1)
+
+        t_old = _median_ms(lambda: legacy_recommend(nutri_df, status, gender, age), args.repeat)
+        t_new = _median_ms(lambda: recommend_menu_demographic(catalog, status, gender, age, None), args.repeat)
+        print(f"{gender:6} {age:2} {status:11} | lama {t_old:7.3f} ms | baru {t_new:7.3f} ms "
+              f"| {t_old / t_new:5.1f}x | paritas pool {overlap:.0%}")
+
+    print(f"cache pool kandidat: {catalog.pools.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_resources.py
+"""
+Perbandingan cold start vs warm rerun untuk lapisan resource.
+
+- cold : load_resources() penuh (read_csv ×2, extract_menu_name, klasifikasi_bmi,
+         joblib.load ×2) — sama dengan biaya SETIAP rerun sebelum ada cache.
+- warm : get_resources() setelah cache terisi (hanya os.stat file sumber).
+- nutri: parsing dataset_nutrients.csv vs artefak nutrients/catalog.npz
+         (hanya bila artefak sudah dibangun: python catalog_artifact.py build).
+
+Jalankan dari root repo:
+    python benchmarks/bench_resources.py --repeat 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import resources  # noqa: E402
+
+
+def _timeit(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--repeat', type=int, default=5, help='jumlah ulangan cold start')
+    ap.add_argument('--warm-repeat', type=int, default=1000, help='jumlah ulangan warm rerun')
+    args = ap.parse_args()
+
+    cold = _timeit(resources.load_resources, args.repeat)
+
+    resources.clear_resources()
+    first = _timeit(resources.get_resources, 1)[0]   # cold + hashing file sumber
+    warm = _timeit(resources.get_resources, args.warm_repeat)
+
+    cold_ms = statistics.median(cold) * 1e3
+    warm_ms = statistics.median(warm) * 1e3
+    print(f"cold load (per rerun, tanpa cache) : {cold_ms:9.3f} ms  (median dari {args.repeat})")
+    print(f"first get_resources (load + hash)  : {first * 1e3:9.3f} ms")
+    print(f"warm rerun (get_resources, cached) : {warm_ms:9.3f} ms  (median dari {args.warm_repeat})")
+    print(f"speedup per rerun                  : {cold_ms / warm_ms:9.0f}x")
+
+    if resources.load_catalog(resources.file_sha256(resources.NUTRI_CSV)) is not None:
+        csv_ms = statistics.median(_timeit(resources.load_nutri_df_csv, args.repeat)) * 1e3
+        npz_ms = statistics.median(_timeit(resources.load_nutri_df, args.repeat)) * 1e3
+        print(f"nutri_df dari CSV                  : {csv_ms:9.3f} ms")
+        print(f"nutri_df dari catalog.npz          : {npz_ms:9.3f} ms  ({csv_ms / npz_ms:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_results_grid.py
+"""
+Tabel hasil rekomendasi: grid lama (st.columns 7 kolom per baris + markdown/image
+per sel) vs satu st.dataframe dengan ImageColumn (URL thumbnail) per halaman.
+
+Script dijalankan lewat streamlit.testing (AppTest) dan ForwardMsg yang
+dihasilkan dihitung: jumlah delta dan total byte yang akan dikirim lewat
+websocket, plus waktu eksekusi script, untuk beberapa top_n.
+
+    python benchmarks/bench_results_grid.py --top-n 10,20,50 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+
+_SETUP = """
+import numpy as np
+import streamlit as st
+from recommender import recommend_menu_demographic
+from resources import get_resources
+from thumbnails import SIZE_UI, get_thumbnail_index, thumbnail_path, thumbnail_url
+menu_rec = recommend_menu_demographic(get_resources().catalog, "Normal", "Male", 25,
+                                      "Sedentary (little to no activity)", top_n={top_n},
+                                      rng=np.random.default_rng(0))
+"""
+
+# Salinan grid sebelum diganti (app.py)
+_LEGACY = """
+col_img_h, col_menu_h, col_kcal_h, col_prot_h, col_fat_h, col_fib_h, col_carbs_h = st.columns([2, 3, 1.5, 1, 1, 1, 1])
+col_kcal_h.markdown("**Calories**")
+col_prot_h.markdown("**Protein**")
+col_fat_h.markdown("**Fat**")
+col_fib_h.markdown("**Fibre**")
+col_carbs_h.markdown("**Carbs**")
+thumbs = get_thumbnail_index()
+for idx, row in menu_rec.iterrows():
+    col_img, col_menu, col_kcal, col_prot, col_fat, col_fib, col_carbs = st.columns([2, 3, 1.5, 1, 1, 1, 1])
+    col_img.image(thumbnail_path(row['image'], SIZE_UI, thumbs), use_container_width=True)
+    col_menu.markdown(f"**{row['Menu']}**")
+    col_kcal.markdown(f"{row['kcal']} kcal")
+    col_prot.markdown(f"{row['protein']} g")
+    col_fat.markdown(f"{row['fat']} g")
+    col_fib.markdown(f"{row['fibre']} g")
+    col_carbs.markdown(f"{row['carbs']} g")
+"""
+
+
+def _grid_script():
+    # Fragment tampilkan_hasil_menu dari app.py apa adanya
+    with open('app.py', encoding='utf-8') as f:
+        src = f.read()
+    start = src.index('# Tabel hasil rekomendasi')
+    end = src.index('# def encode_img_to_base64')
+    return ("import pandas as pd\nimport telemetry\n" + src[start:end]
+            + "st.session_state.menu_results = menu_rec\ntampilkan_hasil_menu()\n")
+
+
+def measure(body, top_n, repeat):
+    captured = []
+    original = local_script_runner.parse_tree_from_messages
+
+    def capture(msgs):
+        captured[:] = list(msgs)
+        return original(msgs)
+
+    local_script_runner.parse_tree_from_messages = capture
+    try:
+        at = AppTest.from_string(_SETUP.format(top_n=top_n) + body, default_timeout=120)
+        at.run()  # pemanasan: katalog, indeks thumbnail, cache data URI
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            at.run()
+            times.append(time.perf_counter() - t0)
+        assert not at.exception, at.exception
+    finally:
+        local_script_runner.parse_tree_from_messages = original
+    deltas = [m for m in captured if m.WhichOneof('type') == 'delta']
+    return {
+        'deltas': len(deltas),
+        'bytes': sum(m.ByteSize() for m in deltas),
+        'ms': float(np.median(times)) * 1e3,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--top-n', default='10,20,50')
+    ap.add_argument('--repeat', type=int, default=5)
+    args = ap.parse_args()
+    warnings.filterwarnings('ignore')
+
+    print(f"{'top_n':>5} | {'grid':>9} | {'delta':>5} | {'payload':>10} | {'run (median)':>12}")
+    for top_n in map(int, args.top_n.split(',')):
+        for name, body in (('columns', _LEGACY), ('dataframe', _grid_script())):
+            r = measure(body, top_n, args.repeat)
+            print(f"{top_n:5d} | {name:>9} | {r['deltas']:5d} | {r['bytes'] / 1024:7.1f} KB | {r['ms']:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
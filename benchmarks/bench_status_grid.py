@@ -0,0 +1,57 @@
+# benchmarks/bench_status_grid.py
+"""
+Latensi prediksi status gizi satu user: scaler.transform + best_rf.predict vs
+lookup grid (status_grid.py). Grid harus sudah dibangun: python status_grid.py build
+
+    python benchmarks/bench_status_grid.py --repeat 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+
+from resources import encode_gender, get_resources  # noqa: E402
+from status_grid import predict_status  # noqa: E402
+
+INPUTS = [('Male', 25, 1.70, 65), ('Female', 40, 1.60, 45), ('Male', 30, 1.75, 85), ('Female', 50, 1.55, 100)]
+
+
+def _median_us(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return statistics.median(out) * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--repeat', type=int, default=200)
+    args = ap.parse_args()
+
+    res = get_resources()
+    if res.status_grid is None:
+        sys.exit("grid belum dibangun / tidak cocok dengan model — jalankan: python status_grid.py build")
+
+    for gender, age, height, weight in INPUTS:
+        def rf():
+            x = np.array([[encode_gender(gender), age, height, weight]])
+            return res.best_rf.predict(res.scaler.transform(x))[0]
+
+        t_rf = _median_us(rf, args.repeat)
+        t_grid = _median_us(lambda: predict_status(res, gender, age, height, weight), args.repeat)
+        assert rf() == predict_status(res, gender, age, height, weight)
+        print(f"{gender:6} {age:2} {height:.2f} m {weight:3} kg | RF {t_rf:9.1f} µs | grid {t_grid:6.1f} µs "
+              f"| {t_rf / t_grid:6.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,327 @@
+# benchmarks/bench_suite.py
+"""
+Suite benchmark jalur serving, di luar Streamlit, dengan output JSON dan
+perbandingan ke baseline tersimpan (benchmarks/baseline.json).
+
+Kasus yang ikut skala katalog sintetis (--sizes, default 1k → 1M baris):
+- data_load              : load_nutri_df_csv dari CSV sintetis (read_csv + extract_menu_name + dedup)
+- extract_menu_name      : seluruh nama file CSV sintetis
+- recommend_cold         : recommend_menu_demographic, pool kandidat belum ter-cache (scoring penuh)
+- recommend_warm         : recommend_menu_demographic, pool sudah ter-cache (hanya sampling top 10)
+- energy_batch           : energy.hitung_energi_batch untuk `size` user acak (dashboard kohort)
+- cohort                 : cohort.analyze_cohort end-to-end (validasi + status + energi) untuk `size`
+                           baris bergaya bmi_dataset.csv (berat 1 desimal, sebagian di luar grid status);
+                           target halaman Kohort ≥ 100 ribu baris/detik
+Kasus per request (tidak bergantung ukuran katalog):
+- get_user_akg, predict (scaler.transform + res.model_for(1).predict), estimasi_waktu_perubahan_berat,
+  pdf_laporan_lengkap (10 menu, cache gambar hangat)
+
+Katalog/CSV sintetis dibuat seperti benchmarks/bench_menu_index.py dan
+benchmarks/bench_ingest.py (baris asli diambil ulang + noise log-normal).
+
+Angka baseline bergantung mesin: simpan ulang di mesin acuan dengan --save-baseline.
+Kasus ditandai REGRESI bila waktunya (--stat, default min), dinormalisasi dengan beban
+kalibrasi tetap, > baseline × (1 + --tolerance) dan selisihnya > --min-delta-ms;
+exit code 1 bila ada regresi.
+
+    python benchmarks/bench_suite.py                              # bandingkan dengan baseline
+    python benchmarks/bench_suite.py --json out.json              # + tulis hasil JSON
+    python benchmarks/bench_suite.py --save-baseline              # perbarui baseline
+    python benchmarks/bench_suite.py --sizes 1000,10000 --only recommend_cold,predict
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import sklearn  # noqa: E402
+
+import report_pdf  # noqa: E402
+from bench_ingest import write_synthetic_csv  # noqa: E402
+from bench_menu_index import synthetic_catalog  # noqa: E402
+from cohort import analyze_cohort  # noqa: E402
+from energy import estimasi_waktu_perubahan_berat, hitung_energi_batch, pal_dari_label, random_users  # noqa: E402
+from recommender import (  # noqa: E402
+    STATUS_GIZI, CandidatePoolCache, NutrientCatalog, get_user_akg, recommend_menu_demographic,
+)
+from resources import (  # noqa: E402
+    BMI_CSV, encode_gender, extract_menu_name, get_resources, load_nutri_df, load_nutri_df_csv,
+)
+
+BASELINE_PATH = os.path.join('benchmarks', 'baseline.json')
+SCHEMA_VERSION = 1
+
+# Array tanpa nama fitur, sama seperti batch.py / inference.py
+warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+USERS = [('Male', 25, 1.70, 65), ('Female', 40, 1.60, 45), ('Male', 30, 1.75, 85), ('Female', 50, 1.55, 100)]
+PDF_USER = {"usia": 25, "jk": "Male", "tb": 1.70, "bb": 65, "pal": "Moderately Active (3–5 times/week)"}
+PDF_METRICS = {
+    "bmi": 22.5, "kategori": "Normal", "bmr": 1650, "tee": 2550, "target_kalori": 2550,
+    "carb_min": 287, "carb_max": 414, "protein_min": 64, "protein_max": 191,
+    "fat_min": 57, "fat_max": 85, "fiber_min": 25, "fiber_max": 37,
+}
+
+
+def measure(fn, repeat, budget, setup=None):
+    """Jalankan fn hingga `repeat` kali atau `budget` detik (minimal sekali). setup() tidak ikut diukur."""
+    times = []
+    deadline = time.perf_counter() + budget
+    while len(times) < repeat and (not times or time.perf_counter() < deadline):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    ms = [t * 1e3 for t in times]
+    return {
+        'median_ms': statistics.median(ms),
+        'min_ms': min(ms),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'runs': len(ms),
+    }
+
+
+# ---------------------------------------------
+# Kasus yang ikut skala katalog
+# ---------------------------------------------
+def bmi_style_cohort(n, seed=0):
+    """Upload bergaya bmi_dataset.csv: baris dataset diambil ulang, berat digeser ±5 kg (1 desimal)."""
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(BMI_CSV).sample(n, replace=True, random_state=seed).reset_index(drop=True)
+    df['Weight (kg)'] = (df['Weight (kg)'] + rng.integers(-50, 51, n) / 10).round(1)
+    return df
+
+
+def bench_sized(size, args, base, tmp, res):
+    out = {}
+    path = os.path.join(tmp, f"nutrients_{size}.csv")
+    if _wanted(args, 'data_load', 'extract_menu_name'):
+        write_synthetic_csv(path, size)
+    if _wanted(args, 'data_load'):
+        out['data_load'] = measure(lambda: load_nutri_df_csv(path), args.repeat, args.budget)
+    if _wanted(args, 'extract_menu_name'):
+        images = pd.read_csv(path, usecols=['image'])['image'].tolist()
+        out['extract_menu_name'] = measure(lambda: [extract_menu_name(x) for x in images],
+                                           args.repeat, args.budget)
+    if os.path.exists(path):
+        os.remove(path)
+
+    if _wanted(args, 'recommend_cold', 'recommend_warm'):
+        rng = np.random.default_rng(args.seed)
+        catalog = NutrientCatalog(synthetic_catalog(base, size, rng))
+        profiles = [(s, g, a) for g, a, _, _ in USERS for s in STATUS_GIZI]
+
+        def all_profiles():
+            for status, gender, age in profiles:
+                recommend_menu_demographic(catalog, status, gender, age, None, rng=rng)
+
+        def reset_pools():
+            catalog.pools = CandidatePoolCache(catalog)
+
+        # Per request: total waktu semua profil dibagi jumlah profil
+        if _wanted(args, 'recommend_cold'):
+            r = measure(all_profiles, args.repeat, args.budget, setup=reset_pools)
+            out['recommend_cold'] = _per_call(r, len(profiles))
+        if _wanted(args, 'recommend_warm'):
+            all_profiles()
+            r = measure(all_profiles, args.repeat, args.budget)
+            out['recommend_warm'] = _per_call(r, len(profiles))
+
+    if _wanted(args, 'energy_batch'):
+        u = random_users(size, seed=args.seed)
+        pal = pal_dari_label(u['activity'])
+        out['energy_batch'] = measure(
+            lambda: hitung_energi_batch(u['gender'], u['age'], u['height'], u['weight'], pal, u['status']),
+            args.repeat, args.budget)
+
+    if _wanted(args, 'cohort'):
+        cohort = bmi_style_cohort(size, seed=args.seed)
+        out['cohort'] = measure(lambda: analyze_cohort(cohort, res=res), args.repeat, args.budget)
+    return out
+
+
+# ---------------------------------------------
+# Kasus per request
+# ---------------------------------------------
+def bench_request(args, res):
+    out = {}
+    loops = 1000
+
+    if _wanted(args, 'get_user_akg'):
+        def akg():
+            for _ in range(loops // len(USERS)):
+                for gender, age, _, _ in USERS:
+                    get_user_akg(gender, age)
+        out['get_user_akg'] = _per_call(measure(akg, args.repeat, args.budget), loops)
+
+    if _wanted(args, 'predict'):
+        def predict():
+            for gender, age, height, weight in USERS:
+                x = np.array([[encode_gender(gender), age, height, weight]])
+                res.model_for(1).predict(res.scaler.transform(x))
+        out['predict'] = _per_call(measure(predict, args.repeat, args.budget), len(USERS))
+
+    if _wanted(args, 'estimasi_waktu_perubahan_berat'):
+        cases = [("Underweight", 45, 53.5, 72.0, 2000, 2500, 3000),
+                 ("Overweight", 80, 53.5, 72.0, 2600, 1600, 2100),
+                 ("Obesity", 100, 53.5, 72.0, 2800, 1800, 2300),
+                 ("Normal", 65, 53.5, 72.0, 2400, 2400, 2400)]
+
+        def estimasi():
+            for _ in range(loops // len(cases)):
+                for c in cases:
+                    estimasi_waktu_perubahan_berat(*c)
+        out['estimasi_waktu_perubahan_berat'] = _per_call(measure(estimasi, args.repeat, args.budget), loops)
+
+    if _wanted(args, 'pdf_laporan_lengkap') and report_pdf.REPORTLAB_AVAILABLE:
+        df = recommend_menu_demographic(res.catalog, 'Normal', 'Male', 25, None,
+                                        rng=np.random.default_rng(args.seed))
+        report_pdf.pdf_laporan_lengkap(PDF_USER, PDF_METRICS, df)  # isi cache gambar
+        out['pdf_laporan_lengkap'] = measure(
+            lambda: report_pdf.pdf_laporan_lengkap(PDF_USER, PDF_METRICS, df), args.repeat, args.budget)
+    return out
+
+
+def _per_call(r, n):
+    return {**{k: v / n for k, v in r.items() if k.endswith('_ms')}, 'runs': r['runs'], 'calls_per_run': n}
+
+
+def _wanted(args, *cases):
+    return args.only is None or any(c in args.only for c in cases)
+
+
+# ---------------------------------------------
+# Baseline
+# ---------------------------------------------
+def calibrate(repeat=15):
+    """
+    Waktu beban tetap (Python murni + numpy) sebagai ukuran kecepatan mesin saat ini.
+    Rasio ke baseline dibagi rasio kalibrasi, agar VM yang sedang lambat tidak
+    langsung terbaca sebagai regresi.
+    """
+    data = np.random.default_rng(0).random(200_000)
+
+    def work():
+        np.sort(data)
+        sum(i * i for i in range(100_000))
+    return measure(work, repeat, budget=2.0)['min_ms']
+
+
+def compare(results, baseline, stat, tolerance, min_delta_ms, speed=1.0):
+    """
+    Baris tabel (key, baseline, sekarang, rasio, status) + daftar key yang regresi.
+    speed = kalibrasi sekarang / kalibrasi baseline (>1: mesin sedang lebih lambat).
+    """
+    rows, regressions = [], []
+    for key, cur in results.items():
+        ref = baseline.get(key)
+        if ref is None:
+            rows.append((key, None, cur[stat], None, 'baru'))
+            continue
+        ratio = cur[stat] / ref[stat] / speed if ref[stat] > 0 else float('inf')
+        slower = ratio > 1 + tolerance and cur[stat] / speed - ref[stat] > min_delta_ms
+        faster = ratio < 1 / (1 + tolerance)
+        status = 'REGRESI' if slower else ('lebih cepat' if faster else 'ok')
+        if slower:
+            regressions.append(key)
+        rows.append((key, ref[stat], cur[stat], ratio, status))
+    return rows, regressions
+
+
+def _meta(sizes, calibration_ms):
+    return {
+        'schema': SCHEMA_VERSION,
+        'calibration_ms': calibration_ms,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'sizes': sizes,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--sizes', default='1000,10000,100000,1000000')
+    ap.add_argument('--only', type=lambda s: set(s.split(',')), default=None, help='subset kasus, pisah koma')
+    ap.add_argument('--repeat', type=int, default=20, help='maksimum pengulangan per kasus')
+    ap.add_argument('--budget', type=float, default=3.0, help='batas detik per kasus (minimal 1 run)')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--json', help="tulis hasil JSON ke file ('-' = stdout)")
+    ap.add_argument('--baseline', default=BASELINE_PATH)
+    ap.add_argument('--save-baseline', action='store_true')
+    ap.add_argument('--stat', choices=['min_ms', 'median_ms'], default='min_ms',
+                    help='statistik yang dibandingkan (min paling tahan noise mesin bersama)')
+    ap.add_argument('--no-calibrate', action='store_true', help='bandingkan waktu mentah tanpa normalisasi mesin')
+    ap.add_argument('--tolerance', type=float, default=0.30, help='toleransi perlambatan relatif')
+    ap.add_argument('--min-delta-ms', type=float, default=0.05, help='abaikan selisih absolut di bawah ini')
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    calibration_ms = calibrate()
+    res = get_resources()
+    base = load_nutri_df()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for case, r in bench_sized(size, args, base, tmp, res).items():
+                results[f"{case}[n={size}]"] = r
+            print(f"selesai: n={size}", file=sys.stderr)
+    results.update(bench_request(args, res))
+    calibration_ms = min(calibration_ms, calibrate())
+    report = {'meta': _meta(sizes, calibration_ms), 'results': results}
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+        print(f"baseline disimpan: {args.baseline} ({len(results)} kasus)", file=sys.stderr)
+        return 0
+
+    baseline, speed = {}, 1.0
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            ref = json.load(f)
+        baseline = ref['results']
+        if not args.no_calibrate and ref['meta'].get('calibration_ms'):
+            speed = calibration_ms / ref['meta']['calibration_ms']
+    rows, regressions = compare(results, baseline, args.stat, args.tolerance, args.min_delta_ms, speed)
+    out = sys.stderr if args.json == '-' else sys.stdout
+    print(f"kalibrasi mesin: {calibration_ms:.2f} ms ({speed:.2f}x baseline; rasio di bawah sudah dinormalisasi)",
+          file=out)
+    print(f"{'kasus':42} | {'baseline':>11} | {'sekarang':>11} | {'rasio':>6} | status  ({args.stat})", file=out)
+    for key, ref, cur, ratio, status in rows:
+        ref_s = f"{ref:8.3f} ms" if ref is not None else f"{'-':>11}"
+        ratio_s = f"{ratio:5.2f}x" if ratio is not None else f"{'-':>6}"
+        print(f"{key:42} | {ref_s} | {cur:8.3f} ms | {ratio_s} | {status}", file=out)
+    if regressions:
+        print(f"{len(regressions)} regresi (> {args.tolerance:.0%} lebih lambat): {', '.join(regressions)}", file=out)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
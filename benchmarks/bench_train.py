@@ -0,0 +1,111 @@
+# benchmarks/bench_train.py
+"""
+Waktu training: pendekatan project_pi.ipynb vs train.py, pada data & split yang sama.
+
+- pembersihan outlier: stats.zscore + filter DataFrame per kolom (IQR dalam loop,
+  satu salinan per kolom) vs train.outlier_mask (satu mask NumPy)
+- tuning: RandomizedSearchCV(n_iter, cv, n_estimators 100–500) vs
+  train.halving_search (successive halving, n_estimators sebagai resource, fold
+  dihitung sekali), keduanya n_jobs=-1
+
+Artefak di Models/ tidak disentuh.
+
+    python benchmarks/bench_train.py [--candidates 30] [--cv 10] [--jobs -1] [--skip-notebook]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import numpy as np  # noqa: E402
+from scipy import stats  # noqa: E402
+from scipy.stats import randint  # noqa: E402
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+from sklearn.model_selection import RandomizedSearchCV, train_test_split  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+
+from resources import FEATURES  # noqa: E402
+from train import (  # noqa: E402
+    DEFAULT_SEED, OUTLIER_COLS, RF_PARAM_DIST, TEST_SIZE, halving_search, load_training_frame, make_folds,
+    outlier_mask,
+)
+
+
+def notebook_clean(df):
+    """Salinan sel pembersihan notebook (log1p BMI → z-score → IQR per kolom)."""
+    df_log = df.copy()
+    df_log['BMI'] = np.log1p(df_log['BMI'])
+    z = np.abs(stats.zscore(df_log[OUTLIER_COLS]))
+    df_log = df_log[(z < 3).all(axis=1)]
+    for col in OUTLIER_COLS:
+        q1 = df_log[col].quantile(0.25)
+        q3 = df_log[col].quantile(0.75)
+        iqr = q3 - q1
+        df_log = df_log[(df_log[col] >= (q1 - 1.5 * iqr)) & (df_log[col] <= (q3 + 1.5 * iqr))]
+    return df_log
+
+
+def notebook_search(X, y, n_iter, cv, seed, n_jobs):
+    params = {'n_estimators': randint(100, 500), **RF_PARAM_DIST}
+    search = RandomizedSearchCV(RandomForestClassifier(random_state=seed), param_distributions=params,
+                                n_iter=n_iter, cv=cv, random_state=seed, n_jobs=n_jobs)
+    search.fit(X, y)
+    return search
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--candidates', type=int, default=30, help='n_iter notebook = n_candidates halving')
+    ap.add_argument('--cv', type=int, default=10)
+    ap.add_argument('--jobs', type=int, default=-1)
+    ap.add_argument('--repeat', type=int, default=20, help='ulangan untuk timing pembersihan')
+    ap.add_argument('--skip-notebook', action='store_true', help='lewati RandomizedSearchCV (lambat)')
+    args = ap.parse_args()
+    warnings.filterwarnings('ignore')
+    seed = DEFAULT_SEED
+
+    df, _ = load_training_frame()
+    print(f"{len(df)} baris, cpu {os.cpu_count()}, n_jobs {args.jobs}\n")
+
+    # 1. Pembersihan outlier
+    t_nb = min(_timed(notebook_clean, df)[1] for _ in range(args.repeat))
+    t_new = min(_timed(outlier_mask, df)[1] for _ in range(args.repeat))
+    rows_nb, rows_new = len(notebook_clean(df)), int(outlier_mask(df).sum())
+    print(f"{'pembersihan':<22} | {'waktu':>9} | baris tersisa")
+    print(f"{'notebook (per kolom)':<22} | {t_nb * 1e3:6.2f} ms | {rows_nb}")
+    print(f"{'outlier_mask':<22} | {t_new * 1e3:6.2f} ms | {rows_new}  ({t_nb / t_new:.1f}x)\n")
+
+    # 2. Tuning — data bersih yang sama, split sama dengan train.build
+    df = df[outlier_mask(df)].reset_index(drop=True)
+    X = StandardScaler().fit_transform(df[FEATURES])
+    X_train, X_test, y_train, y_test = train_test_split(X, df['WeightStatus'].to_numpy(), test_size=TEST_SIZE,
+                                                        random_state=seed)
+    rows = []
+    if not args.skip_notebook:
+        s, t = _timed(notebook_search, X_train, y_train, args.candidates, args.cv, seed, args.jobs)
+        rows.append(('RandomizedSearchCV', t, args.candidates * args.cv, s))
+    folds, t_folds = _timed(make_folds, y_train, args.cv, seed)
+    s, t = _timed(halving_search, X_train, y_train, folds, args.candidates, seed, args.jobs)
+    rows.append(('HalvingRandomSearchCV', t + t_folds, int(sum(s.n_candidates_)) * args.cv, s))
+
+    print(f"{'tuning':<22} | {'wall-clock':>10} | {'fit':>4} | {'CV acc':>6} | {'uji acc':>7} | pohon terbaik")
+    for name, t, fits, s in rows:
+        print(f"{name:<22} | {t:8.1f} s | {fits:4d} | {s.best_score_:.4f} | "
+              f"{s.best_estimator_.score(X_test, y_test):7.4f} | {s.best_params_['n_estimators']}")
+    if len(rows) == 2:
+        print(f"\npercepatan tuning: {rows[0][1] / rows[1][1]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
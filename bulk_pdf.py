@@ -0,0 +1,228 @@
+# bulk_pdf.py
+"""
+Laporan PDF massal untuk satu roster (mis. satu kelas / sekolah) → satu file ZIP.
+
+Alur:
+1. Roster dibaca, status gizi + menu semua user dihitung sekaligus
+   (batch.recommend_batch), lalu profil gizi per user (nutrition_profile.get_profile,
+   report_pdf.pdf_inputs — sama dengan tombol unduh PDF di app.py).
+2. Thumbnail PDF untuk semua gambar yang muncul di rekomendasi di-decode +
+   di-encode SEKALI di proses induk (report_pdf.pdf_image_bytes) lalu dipasang
+   sebagai cache preload. Dengan start method 'fork' worker mewarisi dict ini
+   (copy-on-write, tanpa pickling); pada platform tanpa fork dict dikirim lewat
+   initializer.
+3. Rendering PDF (reportlab, CPU-bound) berjalan di process pool. Jumlah batch
+   yang sedang dikerjakan dibatasi (2 × worker) dan tiap PDF langsung ditulis ke
+   ZIP begitu selesai, sehingga memori tidak tumbuh dengan ukuran roster.
+
+Kolom roster sama dengan batch.py: age, gender (Male/Female), height (m),
+weight (kg); user_id opsional tapi harus unik (nama file PDF); activity
+opsional (label PAL form, default --default-activity). User yang dilewati (input
+tidak valid / di luar tabel AKG) tetap tercatat di index.csv beserta alasannya.
+
+    python bulk_pdf.py siswa.csv -o laporan.zip --workers 4 --seed 42
+
+Skala worker vs laporan/detik & memori puncak: benchmarks/bench_bulk_pdf.py.
+"""
+import argparse
+import csv
+import io
+import multiprocessing as mp
+import os
+import resource
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from batch import recommend_batch, skip_reasons
+from energy import DEFAULT_ACTIVITY, PAL_LEVELS
+from nutrition_profile import get_profile
+from report_pdf import (REPORTLAB_AVAILABLE, pdf_image_bytes, pdf_image_key, pdf_inputs, pdf_laporan_lengkap,
+                        preload_pdf_images)
+from resources import get_resources
+
+PDF_COLS = ['image', 'Menu', 'kcal', 'protein', 'fat', 'carbs', 'fibre']
+# Jumlah user per task pool: cukup besar agar overhead IPC kecil, cukup kecil agar beban merata
+DEFAULT_BATCH = 8
+
+
+# ---------------------------------------------
+# Persiapan di proses induk
+# ---------------------------------------------
+def read_roster(path, default_activity=DEFAULT_ACTIVITY):
+    roster = pd.read_csv(path)
+    if 'user_id' not in roster.columns:
+        roster['user_id'] = np.arange(1, len(roster) + 1)
+    duplicate = roster['user_id'][roster['user_id'].duplicated()].unique()
+    if len(duplicate):
+        raise ValueError(f"user_id duplikat ({len(duplicate)}): {duplicate[:10].tolist()} — laporan akan saling timpa")
+    if 'activity' not in roster.columns:
+        roster['activity'] = default_activity
+    roster['activity'] = roster['activity'].fillna(default_activity)  # label tak dikenal: lihat skip_reasons
+    return roster
+
+
+def build_jobs(roster, top_n=10, rng=None, res=None):
+    """
+    Return (jobs, skipped): jobs = [(user_id, user_inputs, metrics, df menu)] untuk
+    user yang punya rekomendasi, skipped = [(user_id, alasan)] untuk sisanya.
+    """
+    reco = recommend_batch(roster, top_n=top_n, rng=rng, res=res)
+    menus = {uid: g[PDF_COLS].reset_index(drop=True) for uid, g in reco.groupby('user_id', sort=False)}
+    status = dict(zip(reco['user_id'], reco['status']))
+    roster, reasons = skip_reasons(roster)  # kolom numerik sama dengan yang dipakai recommend_batch
+    jobs, skipped = [], []
+    for u, reason in zip(roster.itertuples(index=False), reasons):
+        if reason or u.user_id not in menus:
+            skipped.append((u.user_id, reason or "tidak ada menu yang cocok"))
+            continue
+        user_inputs, metrics = pdf_inputs(get_profile(u.gender, u.age, u.height, u.weight, u.activity,
+                                                      status[u.user_id]))
+        jobs.append((u.user_id, user_inputs, metrics, menus[u.user_id]))
+    return jobs, skipped
+
+
+def preload_images(images):
+    """Encode thumbnail PDF untuk tiap gambar unik → {(path, versi): byte JPEG | None}."""
+    jpegs = {}
+    for image in set(images):
+        key = pdf_image_key(image)
+        if key is not None and key not in jpegs:
+            jpegs[key] = pdf_image_bytes(*key)
+    return jpegs
+
+
+# ---------------------------------------------
+# Worker
+# ---------------------------------------------
+def _init_worker(jpegs):
+    if jpegs is not None:
+        preload_pdf_images(jpegs)
+
+
+def _peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss: KiB di Linux, byte di macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def render_batch(jobs):
+    """Render satu batch → ([(user_id, byte PDF)], pid, RSS puncak worker MB)."""
+    out = [(uid, pdf_laporan_lengkap(user_inputs, metrics, df).getvalue())
+           for uid, user_inputs, metrics, df in jobs]
+    return out, os.getpid(), _peak_rss_mb()
+
+
+# ---------------------------------------------
+# Render + tulis ZIP
+# ---------------------------------------------
+def write_zip(jobs, output, workers=os.cpu_count(), batch_size=DEFAULT_BATCH, jpegs=None, skipped=()):
+    """
+    Render semua `jobs` ke ZIP `output`. workers=0 → serial di proses ini.
+    `skipped` ([(user_id, alasan)] dari build_jobs) ikut ditulis ke index.csv tanpa file.
+    Return dict statistik: reports, skipped, seconds, reports_per_s, zip_mb, peak_rss_parent_mb,
+    peak_rss_worker_mb.
+    """
+    batches = [jobs[i:i + batch_size] for i in range(0, len(jobs), batch_size)]
+    worker_rss = {}
+    index_rows = []
+
+    def store(zf, result):
+        pdfs, pid, rss = result
+        worker_rss[pid] = max(rss, worker_rss.get(pid, 0.0))
+        for uid, data in pdfs:
+            name = f"laporan_{uid}.pdf"
+            zf.writestr(name, data)
+            index_rows.append((uid, name, len(data), ''))
+
+    t0 = time.perf_counter()
+    # PDF sudah terkompresi (stream Flate + JPEG) → ZIP_STORED, tanpa biaya deflate kedua kalinya
+    with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as zf:
+        if workers <= 0:
+            if jpegs:
+                preload_pdf_images(jpegs)
+            for b in batches:
+                store(zf, render_batch(b))
+        else:
+            fork = 'fork' in mp.get_all_start_methods()
+            if fork and jpegs:
+                preload_pdf_images(jpegs)  # diwarisi worker saat fork
+            ctx = mp.get_context('fork' if fork else None)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                                     initargs=(None if fork else jpegs,)) as pool:
+                pending = set()
+                todo = iter(batches)
+                for b in todo:
+                    pending.add(pool.submit(render_batch, b))
+                    if len(pending) >= 2 * workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            store(zf, fut.result())
+                for fut in pending:
+                    store(zf, fut.result())
+
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(['user_id', 'file', 'bytes', 'dilewati'])
+        writer.writerows(index_rows)
+        writer.writerows((uid, '', 0, reason) for uid, reason in skipped)
+        zf.writestr('index.csv', buf.getvalue())
+    elapsed = time.perf_counter() - t0
+
+    return {
+        'reports': len(index_rows),
+        'skipped': len(skipped),
+        'seconds': elapsed,
+        'reports_per_s': len(index_rows) / elapsed if elapsed else float('nan'),
+        'zip_mb': os.path.getsize(output) / 1e6,
+        'peak_rss_parent_mb': _peak_rss_mb(),
+        'peak_rss_worker_mb': max(worker_rss.values()) if workers > 0 and worker_rss else None,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('roster_csv', help='CSV roster: age, gender, height, weight[, activity, user_id]')
+    ap.add_argument('-o', '--output', default='laporan_pdf.zip')
+    ap.add_argument('--workers', type=int, default=os.cpu_count(), help='proses render (0 = serial)')
+    ap.add_argument('--batch-size', type=int, default=DEFAULT_BATCH, help='user per task pool')
+    ap.add_argument('--top-n', type=int, default=10)
+    ap.add_argument('--seed', type=int, default=None, help='seed RNG agar hasil bisa direproduksi')
+    ap.add_argument('--default-activity', default=DEFAULT_ACTIVITY, choices=list(PAL_LEVELS),
+                    help='aktivitas bila kolom activity kosong/tidak ada')
+    ap.add_argument('--no-preload', action='store_true',
+                    help='jangan siapkan thumbnail di induk (tiap worker encode sendiri; pembanding)')
+    args = ap.parse_args(argv)
+
+    if not REPORTLAB_AVAILABLE:
+        print("reportlab belum terpasang", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    roster = read_roster(args.roster_csv, args.default_activity)
+    jobs, skipped = build_jobs(roster, top_n=args.top_n, rng=np.random.default_rng(args.seed), res=get_resources())
+    jpegs = None
+    if not args.no_preload:
+        jpegs = preload_images(img for *_, df in jobs for img in df['image'])
+    prep = time.perf_counter() - t0
+
+    stats = write_zip(jobs, args.output, workers=args.workers, batch_size=args.batch_size, jpegs=jpegs,
+                      skipped=skipped)
+    worker_rss = stats['peak_rss_worker_mb']
+    for reason, n in pd.Series([r for _, r in skipped], dtype=object).value_counts().items():
+        print(f"dilewati: {n} user — {reason} (lihat index.csv)", file=sys.stderr)
+    print(f"{len(roster)} user → {stats['reports']} PDF ({stats['zip_mb']:.1f} MB) → {args.output}\n"
+          f"persiapan {prep:.2f} s ({len(jpegs or ())} thumbnail preload), render {stats['seconds']:.2f} s "
+          f"dengan {args.workers} worker = {stats['reports_per_s']:.1f} laporan/detik\n"
+          f"RSS puncak: induk {stats['peak_rss_parent_mb']:.0f} MB"
+          + (f", worker {worker_rss:.0f} MB" if worker_rss is not None else ""),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+# catalog_artifact.py
+"""
+Artefak katalog menu terkompilasi (NPZ, tanpa pickle).
+
+Setiap proses sebelumnya membaca ulang dataset_nutrients.csv lalu menjalankan
+regex extract_menu_name per baris, dropna dan drop_duplicates. Perintah `build`
+melakukan semua itu SEKALI secara offline dan menyimpan hasilnya ke
+nutrients/catalog.npz (+ catalog.json):
+- nama menu bersih, referensi gambar, posisi baris sumber
+- kolom numerik dalam dtype ringkas (float32 bila nilainya kembali persis ke
+  nilai CSV setelah dibulatkan ke jumlah desimal di metadata, selain itu float64)
+- hash per baris sumber, sehingga build berikutnya hanya menjalankan ulang
+  extract_menu_name untuk baris yang berubah
+
+resources.load_nutri_df() memakai artefak ini bila hash CSV sumber cocok; jika
+tidak ada/usang, jatuh ke parsing CSV seperti biasa. Kolom dimuat TETAP dalam
+dtype ringkas (memori resident ikut turun); jumlah desimal per kolom float32
+ada di df.attrs['decimals'] dan dipakai NutrientCatalog.rows() untuk
+mengembalikan nilai CSV persis pada baris output.
+
+    python catalog_artifact.py build     # build-catalog (inkremental)
+    python catalog_artifact.py verify    # paritas artefak vs parsing CSV
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+CATALOG_NPZ = os.path.join('nutrients', 'catalog.npz')
+CATALOG_META = os.path.join('nutrients', 'catalog.json')
+CATALOG_VERSION = 2
+
+# Desimal maksimum yang dicoba saat memilih float32 untuk sebuah kolom
+_MAX_DECIMALS = 6
+
+
+def _compact(values):
+    """(array, desimal) — float32 jika round(float32→float64, d) == nilai asli untuk suatu d."""
+    f32 = values.astype(np.float32)
+    back = f32.astype(np.float64)
+    for dec in range(_MAX_DECIMALS + 1):
+        if np.array_equal(np.round(back, dec), values, equal_nan=True):
+            return f32, dec
+    return values, None
+
+
+def expand_compact(df):
+    """Salinan df dengan kolom float32 ringkas dikembalikan ke nilai float64 CSV (df.attrs['decimals'])."""
+    decimals = df.attrs.get('decimals', {})
+    return df.assign(**{c: np.round(df[c].to_numpy(dtype=np.float64), d) for c, d in decimals.items()
+                        if c in df.columns})
+
+
+def _row_hashes(raw):
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy(dtype=np.uint64)
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def build_catalog(source=None, path=CATALOG_NPZ, meta_path=CATALOG_META):
+    """
+    Build inkremental. Return ringkasan: rows, changed (baris yang diproses
+    ulang), menus (setelah dropna/dedup), skipped (True bila sumber tidak berubah).
+    """
+    from resources import NUTRI_CSV, extract_menu_name, file_sha256
+
+    source = source or NUTRI_CSV
+    source_sha = file_sha256(source)
+    meta = _read_meta(meta_path)
+    if (meta and meta.get('version') == CATALOG_VERSION and meta.get('source_sha256') == source_sha
+            and os.path.exists(path)):
+        return {'rows': meta['source_rows'], 'changed': 0, 'menus': meta['menus'], 'skipped': True}
+
+    raw = pd.read_csv(source)
+    hashes = _row_hashes(raw)
+
+    # Nama menu baris yang hash-nya sama dengan build sebelumnya dipakai ulang
+    previous = {}
+    if meta and meta.get('version') == CATALOG_VERSION and os.path.exists(path):
+        with np.load(path, allow_pickle=False) as old:
+            previous = {h: (None if none else menu) for h, menu, none in
+                        zip(old['src_hash'].tolist(), old['src_menu'].tolist(), old['src_none'].tolist())}
+    src_menu = np.empty(len(raw), dtype=object)
+    changed = 0
+    for i, (h, image) in enumerate(zip(hashes.tolist(), raw['image'].tolist())):
+        if h in previous:
+            menu = previous[h]
+        else:
+            menu = extract_menu_name(image)   # None = file generik; '' tetap nama (valid) seperti di CSV
+            changed += 1
+        src_menu[i] = menu
+
+    # Sama dengan loader CSV: dropna(Menu) lalu drop_duplicates(Menu), keep='first'
+    src_none = np.array([m is None for m in src_menu], dtype=bool)
+    valid = np.flatnonzero(~src_none)
+    rows = valid[~pd.Series(src_menu[valid]).duplicated().to_numpy()]
+    src_menu[src_none] = ''
+
+    arrays = {
+        'src_hash': hashes,
+        'src_menu': src_menu.astype(str),
+        'src_none': src_none,
+        'row': rows.astype(np.int32),
+        'Menu': src_menu[rows].astype(str),
+    }
+    columns, decimals = [], {}
+    for col in raw.columns:
+        values = raw[col].to_numpy()[rows]
+        if col == 'image':
+            values = values.astype(str)
+        elif np.issubdtype(values.dtype, np.integer):
+            values = values.astype(np.min_scalar_type(values.max()) if len(values) and values.min() >= 0
+                                   else np.int64)
+        elif np.issubdtype(values.dtype, np.floating):
+            values, decimals[col] = _compact(values)
+        arrays[f"col:{col}"] = values
+        columns.append(col)
+
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path)
+    meta = {
+        'version': CATALOG_VERSION,
+        'source': source,
+        'source_sha256': source_sha,
+        'source_rows': int(len(raw)),
+        'menus': int(len(rows)),
+        'columns': columns,
+        'decimals': decimals,
+        'dtypes': {c: str(arrays[f"col:{c}"].dtype) for c in columns},
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return {'rows': len(raw), 'changed': changed, 'menus': len(rows), 'skipped': False}
+
+
+def load_catalog(source_sha256=None, path=CATALOG_NPZ, meta_path=CATALOG_META):
+    """
+    DataFrame dengan baris, kolom dan index (posisi baris sumber) yang sama dengan
+    parsing CSV, kolom numerik dalam dtype ringkas (expand_compact → nilai CSV
+    persis), atau None jika artefak tidak ada/versi beda/hash sumber tidak cocok.
+    """
+    meta = _read_meta(meta_path)
+    if not meta or meta.get('version') != CATALOG_VERSION or not os.path.exists(path):
+        return None
+    if source_sha256 is not None and meta.get('source_sha256') != source_sha256:
+        return None
+    with np.load(path, allow_pickle=False) as npz:
+        data = {c: npz[f"col:{c}"] for c in meta['columns']}
+        data['Menu'] = npz['Menu']
+        index = pd.Index(npz['row'].astype(np.int64))
+    df = pd.DataFrame(data, index=index)
+    df.attrs['decimals'] = {c: d for c, d in meta['decimals'].items() if d is not None}
+    return df
+
+
+def verify_catalog():
+    """
+    Bandingkan load_catalog() dengan jalur CSV: baris/index/Menu identik dan nilai
+    numerik persis sama setelah expand_compact (dtype boleh lebih ringkas).
+    Return pesan error atau None.
+    """
+    from resources import NUTRI_CSV, file_sha256, load_nutri_df_csv
+
+    got = load_catalog(file_sha256(NUTRI_CSV))
+    if got is None:
+        return "artefak tidak ada atau usang"
+    try:
+        pd.testing.assert_frame_equal(expand_compact(got), load_nutri_df_csv(), check_dtype=False, check_exact=True)
+    except AssertionError as exc:
+        return str(exc)
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('command', choices=['build', 'verify'])
+    args = ap.parse_args(argv)
+
+    if args.command == 'build':
+        t0 = time.perf_counter()
+        summary = build_catalog()
+        state = 'tidak berubah' if summary['skipped'] else f"{summary['changed']} baris diproses ulang"
+        print(f"katalog {CATALOG_NPZ}: {summary['menus']} menu dari {summary['rows']} baris ({state}), "
+              f"{os.path.getsize(CATALOG_NPZ) / 1024:.0f} KiB, {time.perf_counter() - t0:.2f} s")
+        return 0
+
+    error = verify_catalog()
+    if error:
+        print(f"paritas artefak vs CSV GAGAL: {error}", file=sys.stderr)
+        return 1
+    print("paritas artefak vs CSV: identik")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# cohort.py
+"""
+Analitik kohort: status gizi + kebutuhan energi/makro untuk seluruh baris CSV
+(mis. upload bergaya bmi_dataset.csv) dalam beberapa operasi array.
+
+- Kolom diterima dalam dua gaya: form/batch.py (age, gender, height, weight[, activity])
+  atau bmi_dataset.csv (Age, Gender, Height (m), Weight (kg)[, PAL]).
+- Faktor PAL: kolom numerik PAL bila ada, selain itu label activity, selain itu
+  default_activity.
+- Status: batch.predict_status_batch (grid status + satu panggilan model).
+- Energi: energy.hitung_energi_batch (identik dengan hitung_energi per user).
+- Baris yang tidak lolos batch.validate_users (kosong, bukan angka, gender lain,
+  di luar batch.INPUT_LIMITS, activity tak dikenal, PAL di luar batch.PAL_LIMITS) tetap ada di output dengan status/energi NaN dan
+  alasan di kolom `dilewati`.
+
+Dipakai halaman "Cohort" di app.py.
+
+    python cohort.py bmi_dataset.csv -o kohort.csv
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch import predict_status_batch, validate_users
+from energy import DEFAULT_ACTIVITY, PAL_LEVELS, hitung_energi_batch, pal_dari_frame
+from recommender import STATUS_GIZI
+from resources import get_resources
+
+# Nama kolom bmi_dataset.csv → nama kolom form/batch.py
+COLUMN_ALIASES = {'Age': 'age', 'Gender': 'gender', 'Height (m)': 'height', 'Weight (kg)': 'weight'}
+REQUIRED_COLS = ['age', 'gender', 'height', 'weight']
+
+
+def normalize_cohort(df):
+    """
+    Rename kolom gaya bmi_dataset.csv, cek kolom wajib, konversi kolom numerik.
+    Return (DataFrame, array alasan dilewati per baris; '' = valid).
+    """
+    df = df.rename(columns={k: v for k, v in COLUMN_ALIASES.items() if v not in df.columns})
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {missing} (atau gaya bmi_dataset.csv: {list(COLUMN_ALIASES)})")
+    return validate_users(df.reset_index(drop=True))
+
+
+def analyze_cohort(df, default_activity=DEFAULT_ACTIVITY, res=None):
+    """
+    DataFrame kohort → salinan dengan kolom tambahan: bmi, status, dan seluruh
+    kolom energy.ENERGY_COLS, plus `dilewati` (alasan baris tidak dihitung, '' = valid).
+    Return (DataFrame, waktu per tahap dalam detik).
+    """
+    df, reason = normalize_cohort(df)
+    valid = reason == ''
+    timings = {}
+    t0 = time.perf_counter()
+    status = predict_status_batch(df, res)
+    timings['status'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    v = df[valid]
+    energi = hitung_energi_batch(v['gender'].to_numpy(), v['age'].to_numpy(), v['height'].to_numpy(),
+                                 v['weight'].to_numpy(), pal_dari_frame(v, default_activity), status[valid])
+    timings['energy'] = time.perf_counter() - t0
+
+    out = df.copy()
+    out['bmi'] = np.where(valid, df['weight'] / df['height'] ** 2, np.nan)
+    out['status'] = pd.Categorical(status, categories=STATUS_GIZI)
+    for col, values in energi.items():
+        out[col] = np.nan
+        out.loc[valid, col] = values
+    out['dilewati'] = reason
+    return out, timings
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('cohort_csv')
+    ap.add_argument('-o', '--output', default='kohort.csv')
+    ap.add_argument('--default-activity', default=DEFAULT_ACTIVITY, choices=list(PAL_LEVELS))
+    args = ap.parse_args(argv)
+
+    df = pd.read_csv(args.cohort_csv)
+    res = get_resources()
+    out, timings = analyze_cohort(df, args.default_activity, res)
+    out.to_csv(args.output, index=False)
+    total = sum(timings.values())
+    skipped = out['dilewati'] != ''
+    if skipped.any():
+        print(f"{int(skipped.sum())} baris dilewati:\n{out.loc[skipped, 'dilewati'].value_counts().to_string()}",
+              file=sys.stderr)
+    print(f"{len(out)} baris dalam {total:.3f} s ({len(out) / total:,.0f} baris/detik; "
+          f"status {timings['status']:.3f} s, energi {timings['energy']:.3f} s) → {args.output}", file=sys.stderr)
+    print(out['status'].value_counts(sort=False).to_string(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
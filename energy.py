@@ -0,0 +1,291 @@
+# energy.py
+"""
+Perhitungan energi (kkal) yang tidak bergantung pada Streamlit, agar bisa
+dipakai ulang di luar app.py (benchmark, batch, api.py).
+
+hitung_energi() merangkum langkah 2–8 halaman rekomendasi: BMR (Harris-Benedict
+& Mifflin-St Jeor), TEE = BMR Mifflin × PAL, rentang kalori sesuai status gizi,
+kebutuhan makro (IOM 2005) dan rentang berat ideal (BMI 18.5–24.9).
+
+hitung_energi_batch() menghitung hal yang sama untuk array NumPy (satu user atau
+jutaan, mis. dashboard kohort), dengan urutan operasi yang sama sehingga hasilnya
+identik bit-per-bit dengan versi skalar:
+
+    python energy.py verify [--rows 1000000]    # paritas + throughput
+
+Paritas yang sama dijalankan pytest (tests/test_energy.py).
+"""
+import argparse
+import sys
+import time
+from dataclasses import asdict, dataclass, fields
+
+import numpy as np
+import pandas as pd
+
+# Physical Activity Level (label sama dengan pilihan form)
+PAL_LEVELS = {
+    "Sedentary (little to no activity)": 1.2,
+    "Lightly Active (1–2 times/week)": 1.375,
+    "Moderately Active (3–5 times/week)": 1.55,
+    "Very Active (6–7 times/week)": 1.725,
+    "Extremely Active (twice daily or intense)": 1.9
+}
+
+# Aktivitas bila input (roster/kohort/batch) tidak menyebutkan
+DEFAULT_ACTIVITY = "Lightly Active (1–2 times/week)"
+
+# Serat harian (gram), tetap
+SERAT_MIN, SERAT_MAX = 25, 37
+
+
+@dataclass(frozen=True)
+class EnergyProfile:
+    bmr_hb: float
+    bmr_msj: float
+    pal: float
+    tee: float
+    tee_min: float
+    tee_max: float
+    karbo_min: float
+    karbo_max: float
+    protein_min: float
+    protein_max: float
+    lemak_min: float
+    lemak_max: float
+    serat_min: float
+    serat_max: float
+    berat_min: float
+    berat_max: float
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def bmr_harris_benedict(gender, age, height, weight):
+    """height dalam meter, weight dalam kg."""
+    if gender == "Male":
+        return 88.362 + (13.397 * weight) + (4.799 * height * 100) - (5.677 * age)
+    return 447.593 + (9.247 * weight) + (3.098 * height * 100) - (4.330 * age)
+
+
+def bmr_mifflin_st_jeor(gender, age, height, weight):
+    if gender == "Male":
+        return (10 * weight) + (6.25 * height * 100) - (5 * age) + 5
+    return (10 * weight) + (6.25 * height * 100) - (5 * age) - 161
+
+
+def rentang_kalori(status, tee, bmr):
+    """Surplus (Underweight) / defisit (Overweight, Obesity) kalori; Normal = TEE."""
+    if status == "Underweight":
+        return tee + 500, tee + 1000
+    if status in ["Overweight", "Obesity"]:
+        defisit1 = tee - 1000
+        defisit2 = tee - 500
+        # Jika defisit terlalu dalam (melewati BMR), gunakan defisit ringan
+        if defisit1 < bmr or defisit2 < bmr:
+            return tee - 300, tee - 200
+        return defisit1, defisit2
+    return tee, tee
+
+
+def kalori_target(tee_min, tee_max):
+    """Satu target kalori harian dari rentang status gizi: titik tengah (Normal = TEE).
+    Dipakai UI, scoring menu, dan PDF (lihat nutrition_profile.py). Skalar atau array."""
+    return (tee_min + tee_max) / 2
+
+
+def hitung_energi(gender, age, height, weight, activity, status):
+    """EnergyProfile untuk satu user; activity = label PAL_LEVELS."""
+    bmr_hb = bmr_harris_benedict(gender, age, height, weight)
+    bmr_msj = bmr_mifflin_st_jeor(gender, age, height, weight)
+    pal = PAL_LEVELS[activity]
+    tee = bmr_msj * pal
+    tee_min, tee_max = rentang_kalori(status, tee, bmr_msj)
+    return EnergyProfile(
+        bmr_hb=bmr_hb, bmr_msj=bmr_msj, pal=pal, tee=tee, tee_min=tee_min, tee_max=tee_max,
+        # Kebutuhan zat gizi makro (IOM 2005)
+        karbo_min=(0.45 * tee_min) / 4, karbo_max=(0.65 * tee_max) / 4,
+        protein_min=(0.10 * tee_min) / 4, protein_max=(0.30 * tee_max) / 4,
+        lemak_min=(0.20 * tee_min) / 9, lemak_max=(0.30 * tee_max) / 9,
+        serat_min=SERAT_MIN, serat_max=SERAT_MAX,
+        berat_min=18.5 * (height ** 2), berat_max=24.9 * (height ** 2),
+    )
+
+
+# ---------------------------------------------
+# Versi vektor (kohort): rumus sama, input array
+# ---------------------------------------------
+ENERGY_COLS = [f.name for f in fields(EnergyProfile)]
+
+
+_STATUS_CODES = {"Underweight": 0, "Normal": 1, "Overweight": 2, "Obesity": 3}
+
+
+def _lookup(values, table, missing):
+    """table[label] per elemen. pd.factorize sekali + tabel kecil per label unik — jauh lebih
+    cepat daripada perbandingan string berulang / Series.map pada array object besar."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'U':
+        # String fixed-width: perbandingan per label (tabel ≤ 5 entri) sudah cepat
+        out = np.full(values.shape, missing, dtype=np.asarray(list(table.values()) + [missing]).dtype)
+        for label, v in table.items():
+            out[values == label] = v
+        return out
+    codes, uniques = pd.factorize(values.astype(object, copy=False).ravel())
+    lut = np.array([table.get(u, missing) for u in uniques] + [missing])
+    return lut[codes].reshape(values.shape)
+
+
+def pal_dari_label(activity):
+    """Array faktor PAL dari label aktivitas form (ValueError untuk label tak dikenal)."""
+    pal = _lookup(activity, PAL_LEVELS, np.nan).astype(np.float64)
+    if np.isnan(pal).any():
+        unknown = sorted({str(a) for a in np.asarray(activity, dtype=object)[np.isnan(pal)]})
+        raise ValueError(f"activity tidak dikenal: {unknown}")
+    return pal
+
+
+def pal_dari_frame(df, default_activity=DEFAULT_ACTIVITY):
+    """Faktor PAL per baris: kolom numerik PAL bila ada, selain itu label activity, selain itu default."""
+    if 'PAL' in df.columns:
+        pal = pd.to_numeric(df['PAL'], errors='coerce').to_numpy(dtype=np.float64)
+        return np.where(np.isnan(pal), PAL_LEVELS[default_activity], pal)
+    if 'activity' in df.columns:
+        return pal_dari_label(df['activity'].fillna(default_activity))
+    return np.full(len(df), PAL_LEVELS[default_activity])
+
+
+def hitung_energi_batch(gender, age, height, weight, pal, status):
+    """
+    hitung_energi() untuk banyak user sekaligus. gender & status = array label,
+    pal = array faktor PAL (float; label form → pal_dari_label). Skalar ikut di-broadcast.
+    Return {kolom ENERGY_COLS: ndarray float64}.
+    """
+    male = _lookup(gender, {"Male": True}, False).astype(bool)
+    age = np.asarray(age, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    weight = np.asarray(weight, dtype=np.float64)
+    pal = np.asarray(pal, dtype=np.float64)
+    status = _lookup(status, _STATUS_CODES, -1).astype(np.int8)
+    male, age, height, weight, pal, status = np.broadcast_arrays(male, age, height, weight, pal, status)
+
+    # Ekspresi ditulis persis seperti versi skalar (urutan operasi float sama)
+    bmr_hb = np.where(male,
+                      88.362 + (13.397 * weight) + (4.799 * height * 100) - (5.677 * age),
+                      447.593 + (9.247 * weight) + (3.098 * height * 100) - (4.330 * age))
+    base = (10 * weight) + (6.25 * height * 100) - (5 * age)
+    bmr_msj = np.where(male, base + 5, base - 161)
+    tee = bmr_msj * pal
+
+    # rentang_kalori(): surplus / defisit / defisit ringan bila defisit melewati BMR
+    under = status == _STATUS_CODES["Underweight"]
+    over = status >= _STATUS_CODES["Overweight"]
+    defisit1, defisit2 = tee - 1000, tee - 500
+    ringan = over & ((defisit1 < bmr_msj) | (defisit2 < bmr_msj))
+    tee_min = np.select([under, ringan, over], [tee + 500, tee - 300, defisit1], tee)
+    tee_max = np.select([under, ringan, over], [tee + 1000, tee - 200, defisit2], tee)
+
+    n = tee.shape
+    return {
+        'bmr_hb': bmr_hb, 'bmr_msj': bmr_msj, 'pal': pal.astype(np.float64, copy=True), 'tee': tee,
+        'tee_min': tee_min, 'tee_max': tee_max,
+        'karbo_min': (0.45 * tee_min) / 4, 'karbo_max': (0.65 * tee_max) / 4,
+        'protein_min': (0.10 * tee_min) / 4, 'protein_max': (0.30 * tee_max) / 4,
+        'lemak_min': (0.20 * tee_min) / 9, 'lemak_max': (0.30 * tee_max) / 9,
+        'serat_min': np.full(n, float(SERAT_MIN)), 'serat_max': np.full(n, float(SERAT_MAX)),
+        'berat_min': 18.5 * (height ** 2), 'berat_max': 24.9 * (height ** 2),
+    }
+
+
+# Fungsi untuk estimasi waktu perubahan berat (evidence-based, 7700 kkal = 1 kg)
+def estimasi_waktu_perubahan_berat(status, berat, berat_min, berat_max, tee, tee_min, tee_max):
+    def hitung_estimasi(kg_target, kal_per_hari_min, kal_per_hari_max):
+        kalori_minggu_min = kal_per_hari_min * 7
+        kalori_minggu_max = kal_per_hari_max * 7
+        minggu_min = (kg_target * 7700) / kalori_minggu_max
+        minggu_max = (kg_target * 7700) / kalori_minggu_min
+        return minggu_min, minggu_max
+
+    if status == "Underweight":
+        target_kg = berat_min - berat
+        surplus_min = tee_min - tee
+        surplus_max = tee_max - tee
+        return hitung_estimasi(target_kg, surplus_min, surplus_max)
+
+    elif status == "Overweight":
+        target_kg = berat - berat_max
+        defisit_min = tee - tee_max
+        defisit_max = tee - tee_min
+        return hitung_estimasi(target_kg, defisit_min, defisit_max)
+
+    elif status == "Obesity":
+        target_kg_min = berat * 0.05
+        target_kg_max = berat * 0.10
+        defisit_min = tee - tee_max
+        defisit_max = tee - tee_min
+        minggu_5 = hitung_estimasi(target_kg_min, defisit_min, defisit_max)
+        minggu_10 = hitung_estimasi(target_kg_max, defisit_min, defisit_max)
+        return minggu_5 + minggu_10
+
+    else:
+        return (0, 0)
+
+
+# ---------------------------------------------
+# Paritas skalar vs vektor
+# ---------------------------------------------
+def random_users(n, seed=0):
+    """User acak dalam domain form + semua status gizi & level PAL."""
+    rng = np.random.default_rng(seed)
+    return {
+        'gender': rng.choice(["Male", "Female"], n),
+        'age': rng.integers(15, 60, n),
+        'height': rng.integers(150, 201, n) / 100,
+        'weight': rng.integers(40, 131, n).astype(float),
+        'activity': rng.choice(list(PAL_LEVELS), n),
+        'status': rng.choice(["Underweight", "Normal", "Overweight", "Obesity"], n),
+    }
+
+
+def check_parity(rows=20000, seed=0):
+    """hitung_energi_batch vs hitung_energi per baris (harus identik); RuntimeError di selisih pertama."""
+    u = random_users(rows, seed)
+    got = hitung_energi_batch(u['gender'], u['age'], u['height'], u['weight'], pal_dari_label(u['activity']),
+                              u['status'])
+    for i in range(rows):
+        expected = hitung_energi(u['gender'][i], int(u['age'][i]), float(u['height'][i]), float(u['weight'][i]),
+                                 u['activity'][i], u['status'][i])
+        for col in ENERGY_COLS:
+            if got[col][i] != getattr(expected, col):
+                raise RuntimeError(f"{col} berbeda di baris {i}: {got[col][i]!r} vs {getattr(expected, col)!r}")
+
+
+def verify(rows=20000, bench_rows=1_000_000):
+    """check_parity() lalu ukur throughput hitung_energi_batch; return baris/detik."""
+    check_parity(rows)
+
+    u = random_users(bench_rows, seed=1)
+    pal = pal_dari_label(u['activity'])
+    t0 = time.perf_counter()
+    hitung_energi_batch(u['gender'], u['age'], u['height'], u['weight'], pal, u['status'])
+    return bench_rows / (time.perf_counter() - t0)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('verify')
+    p.add_argument('--rows', type=int, default=20000, help='baris untuk cek paritas per baris')
+    p.add_argument('--bench-rows', type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+
+    if args.command == 'verify':
+        rps = verify(args.rows, args.bench_rows)
+        print(f"paritas hitung_energi_batch vs hitung_energi: identik ({args.rows} user, {len(ENERGY_COLS)} kolom)\n"
+              f"throughput: {rps:,.0f} baris/detik ({args.bench_rows:,} baris)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,347 @@
+# forest_artifact.py
+"""
+Artefak Random Forest datar (tanpa pickle) yang dimuat via mmap.
+
+joblib.load(random_forest_model.pkl) meng-unpickle ratusan objek Tree sklearn
+(~17 MB, semua node + impurity + jumlah sampel) di setiap proses/worker.
+Perintah `build` meratakan hutan ke beberapa array kontigu dalam satu file
+mentah Models/forest.bin (+ forest.json: versi, dtype/offset/shape tiap array,
+kelas, sha256 + stat pickle sumber). Node tiap pohon disusun ulang per level
+(BFS) sehingga anak kanan = anak kiri + 1:
+
+- feature   int32    fitur yang diuji di node (int32 = dtype buffer traversal)
+- threshold float32  ambang, dibulatkan ke bawah ke float32: sklearn membandingkan
+                     X float32 dengan ambang float64, dan untuk x float32
+                     x <= t64 ⇔ x <= floor32(t64) — jadi tetap eksak
+- left      int32    anak kiri (indeks global di semua pohon); anak kanan = left + 1.
+                     Daun: threshold = +inf dan left = node itu sendiri, jadi
+                     traversal diam di tempat setelah sampai di daun
+- leaf      int32    baris tabel proba untuk node daun (-1 untuk node internal)
+- proba     float64  proba kelas per daun, persis seperti
+                     DecisionTreeClassifier.predict_proba versi sklearn terpasang
+                     (dinormalisasi ulang atau tidak, lihat _proba_normalized)
+- roots     int32    node akar tiap pohon
+
+FlatForest.predict() menelusuri semua pohon sekaligus (max_depth langkah
+vektor: node = left[node] + (x > threshold[node])), menjumlah proba per pohon
+BERURUTAN (urutan akumulasi sama dengan RandomForestClassifier n_jobs=1), membagi
+dengan jumlah pohon, lalu argmax — hasilnya identik dengan best_rf.predict.
+Untuk satu baris / batch kecil (jalur online) jauh lebih cepat dari sklearn
+yang memanggil setiap pohon satu per satu; untuk ribuan baris sekaligus loop C
+sklearn lebih cepat (lihat benchmark). resources.load_resources() memuat
+artefak ini di samping pickle bila diekspor dari pickle saat ini — dicek lewat
+stat, hash hanya bila stat berubah — dan Resources.model_for() memilih hutan
+datar untuk panggilan <= FLAT_FOREST_MAX_ROWS baris, sklearn untuk batch yang
+lebih besar. Tanpa pickle, hutan datar dipakai untuk semuanya
+(EDUNUTRI_FLAT_FOREST=0 untuk memaksa pickle).
+
+    python forest_artifact.py build     # ekspor dari Models/random_forest_model.pkl
+    python forest_artifact.py verify    # paritas predict/predict_proba vs best_rf
+
+Waktu muat, RSS dan latensi vs pickle: benchmarks/bench_forest.py.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+FOREST_BIN = os.path.join('Models', 'forest.bin')
+FOREST_META = os.path.join('Models', 'forest.json')
+FOREST_VERSION = 3
+FLAT_FOREST_ENABLED = os.environ.get('EDUNUTRI_FLAT_FOREST', '1') != '0'
+# Batas baris per panggilan yang masih memakai hutan datar (Resources.model_for); di atas
+# ini sklearn lebih cepat (titik potong ~300–500 baris, lihat benchmarks/bench_forest.py)
+FLAT_FOREST_MAX_ROWS = int(os.environ.get('EDUNUTRI_FLAT_FOREST_MAX_ROWS', 256))
+
+# Offset tiap array di file dibulatkan ke kelipatan ini
+_ALIGN = 64
+# Baris per potongan saat prediksi (buffer traversal: baris × pohon)
+CHUNK_ROWS = 256
+
+_LEAF = -1  # sklearn.tree._tree.TREE_LEAF
+
+
+def _model_pkl():
+    from resources import MODEL_PKL  # import lokal: resources mengimpor modul ini
+    return MODEL_PKL
+
+
+def _pickle_signature(path):
+    """(ukuran, mtime_ns) pickle sumber, atau None bila file tidak ada."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _source_matches(meta, model_pkl):
+    """
+    Apakah artefak diekspor dari pickle saat ini. Stat sama dengan saat build →
+    dipercaya tanpa hashing; stat beda → sha256 pickle dibandingkan. Pickle tidak
+    ada → forest.bin berdiri sendiri (deploy tanpa pickle).
+    """
+    sig = _pickle_signature(model_pkl)
+    if sig is None or sig == meta.get('model_stat'):
+        return True
+    from resources import file_sha256
+    return file_sha256(model_pkl) == meta.get('model_sha256')
+
+
+def _floor_float32(values):
+    """Float32 terbesar yang <= nilai float64."""
+    f32 = values.astype(np.float32)
+    over = f32.astype(np.float64) > values
+    f32[over] = np.nextafter(f32[over], np.float32(-np.inf))
+    return f32
+
+
+def _proba_normalized():
+    """
+    True bila DecisionTreeClassifier.predict_proba di sklearn terpasang membagi
+    tree_.value dengan jumlahnya (versi lama); versi baru mengembalikan
+    tree_.value apa adanya. Dicek pada daun 1:4:1 yang jumlah pecahannya ≠ 1.
+    """
+    from sklearn.tree import DecisionTreeClassifier
+
+    tree = DecisionTreeClassifier().fit(np.zeros((6, 1)), [0, 1, 1, 1, 1, 2])
+    return not np.array_equal(tree.predict_proba(np.zeros((1, 1)))[0], tree.tree_.value[0, 0])
+
+
+def _bfs_order(tree):
+    """Urutan node per level dengan saudara bersebelahan: anak kanan = anak kiri + 1."""
+    order = [0]
+    for node in order:  # order bertambah selama iterasi
+        if tree.children_left[node] != _LEAF:
+            order += [tree.children_left[node], tree.children_right[node]]
+    return np.array(order, dtype=np.intp)
+
+
+def flatten_forest(best_rf):
+    """RandomForestClassifier → (dict array datar, kedalaman maksimum). Lihat docstring modul."""
+    n_classes = len(best_rf.classes_)
+    normalize = _proba_normalized()
+    parts = {k: [] for k in ('feature', 'threshold', 'left', 'leaf', 'proba', 'roots')}
+    offset = n_leaves = 0
+    for est in best_rf.estimators_:
+        tree = est.tree_
+        order = _bfs_order(tree)
+        new_id = np.empty(tree.node_count, dtype=np.intp)
+        new_id[order] = np.arange(tree.node_count) + offset
+        leaf = tree.children_left[order] == _LEAF
+
+        parts['roots'].append(offset)
+        parts['feature'].append(np.where(leaf, 0, tree.feature[order]))
+        parts['threshold'].append(np.where(leaf, np.float32(np.inf), _floor_float32(tree.threshold[order])))
+        parts['left'].append(np.where(leaf, new_id[order], new_id[np.maximum(tree.children_left[order], 0)]))
+        parts['leaf'].append(np.where(leaf, np.cumsum(leaf) - 1 + n_leaves, -1))
+
+        # Sama dengan DecisionTreeClassifier.predict_proba (output tunggal)
+        proba = tree.value[order[leaf]][:, 0, :n_classes]
+        if normalize:
+            normalizer = proba.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            proba /= normalizer
+        parts['proba'].append(proba)
+
+        offset += tree.node_count
+        n_leaves += int(leaf.sum())
+
+    dtypes = {'feature': np.int32, 'threshold': np.float32, 'left': np.int32, 'leaf': np.int32,
+              'proba': np.float64}
+    arrays = {k: np.ascontiguousarray(np.concatenate(parts[k]), dtype=dt) for k, dt in dtypes.items()}
+    arrays['roots'] = np.array(parts['roots'], dtype=np.int32)
+    return arrays, int(max(est.tree_.max_depth for est in best_rf.estimators_))
+
+
+class FlatForest:
+    """Pengganti best_rf untuk prediksi: classes_, n_features_in_, predict, predict_proba."""
+
+    def __init__(self, arrays, classes, n_features, max_depth):
+        self.feature = arrays['feature']
+        self.threshold = arrays['threshold']
+        self.left = arrays['left']
+        self.leaf = arrays['leaf']
+        self.proba = arrays['proba']
+        self.roots = arrays['roots']
+        self.classes_ = np.asarray(classes, dtype=object)
+        self.n_features_in_ = n_features
+        self.n_estimators = len(self.roots)
+        self.max_depth = max_depth
+
+    def _check(self, X):
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X harus berbentuk (n, {self.n_features_in_}), bukan {X.shape}")
+        # Sama dengan validasi sklearn: dibandingkan sebagai float32
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if not np.isfinite(X).all():
+            raise ValueError("X berisi NaN/inf")
+        return X
+
+    def _proba_chunk(self, X):
+        n, shape = len(X), (len(X), self.n_estimators)
+        # Indeks X.ravel() untuk (baris, fitur node) = baris * n_fitur + fitur
+        row_base = (np.arange(n, dtype=np.int32) * self.n_features_in_)[:, None]
+        nodes = np.empty(shape, dtype=np.int32)
+        nodes[:] = self.roots
+        x_idx = np.empty(shape, dtype=np.int32)
+        x_val = np.empty(shape, dtype=np.float32)
+        thr = np.empty(shape, dtype=np.float32)
+        go_right = np.empty(shape, dtype=bool)
+        x_flat = X.ravel()
+        for _ in range(self.max_depth):
+            np.take(self.feature, nodes, out=x_idx)
+            x_idx += row_base
+            np.take(x_flat, x_idx, out=x_val)
+            np.take(self.threshold, nodes, out=thr)
+            np.greater(x_val, thr, out=go_right)
+            np.take(self.left, nodes, out=nodes)
+            nodes += go_right
+        # Jumlah proba BERURUTAN per pohon (cumsum), lalu dibagi jumlah pohon —
+        # sama dengan RandomForestClassifier.predict_proba
+        acc = np.cumsum(self.proba[self.leaf[nodes]], axis=1)[:, -1]
+        acc /= self.n_estimators
+        return acc
+
+    def predict_proba(self, X):
+        X = self._check(X)
+        out = np.empty((len(X), len(self.classes_)))
+        for i in range(0, len(X), CHUNK_ROWS):
+            out[i:i + CHUNK_ROWS] = self._proba_chunk(X[i:i + CHUNK_ROWS])
+        return out
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.leaf, self.proba, self.roots))
+
+
+# ---------------------------------------------
+# Simpan / muat
+# ---------------------------------------------
+def build_forest(best_rf, path=FOREST_BIN, meta_path=FOREST_META, model_pkl=None):
+    """Ekspor best_rf (hasil unpickle `model_pkl`) ke file mentah + metadata. Return metadata."""
+    from resources import file_sha256
+    model_pkl = model_pkl or _model_pkl()
+    arrays, max_depth = flatten_forest(best_rf)
+    layout, offset = {}, 0
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        for name, arr in arrays.items():
+            pad = -offset % _ALIGN
+            f.write(b'\0' * pad)
+            offset += pad
+            layout[name] = {'dtype': arr.dtype.str, 'shape': list(arr.shape), 'offset': offset}
+            f.write(arr.tobytes())
+            offset += arr.nbytes
+    os.replace(tmp, path)
+
+    meta = {
+        'version': FOREST_VERSION,
+        'classes': [str(c) for c in best_rf.classes_],
+        'n_features': int(best_rf.n_features_in_),
+        'n_estimators': len(best_rf.estimators_),
+        'max_depth': max_depth,
+        'n_nodes': int(len(arrays['feature'])),
+        'n_leaves': int(len(arrays['proba'])),
+        'bytes': offset,
+        'arrays': layout,
+        # Pickle sumber: hash untuk validasi, stat agar load tidak perlu hashing ulang
+        'model_sha256': file_sha256(model_pkl),
+        'model_stat': _pickle_signature(model_pkl),
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_forest(path=FOREST_BIN, meta_path=FOREST_META, model_pkl=None):
+    """
+    FlatForest dengan array berupa view read-only atas satu mmap, atau None jika
+    artefak tidak ada, versinya beda, atau diekspor dari pickle lain (lihat
+    _source_matches; tanpa pickle, artefak dimuat apa adanya).
+    """
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('version') != FOREST_VERSION:
+        return None
+    if not _source_matches(meta, model_pkl or _model_pkl()):
+        return None
+    buf = np.memmap(path, dtype=np.uint8, mode='r')
+    if len(buf) != meta['bytes']:
+        return None
+    arrays = {
+        name: np.ndarray(tuple(spec['shape']), dtype=np.dtype(spec['dtype']), buffer=buf, offset=spec['offset'])
+        for name, spec in meta['arrays'].items()
+    }
+    return FlatForest(arrays, meta['classes'], meta['n_features'], meta['max_depth'])
+
+
+def verify_forest(forest, scaler, best_rf, extra_rows=200_000, seed=0):
+    """
+    Paritas predict + predict_proba di seluruh grid status (domain form) dan di
+    titik acak di luar domain. Return (jumlah baris, label beda, proba beda).
+    """
+    from status_grid import grid_points
+
+    rng = np.random.default_rng(seed)
+    X = np.vstack([
+        grid_points(weight_steps_per_kg=1),  # domain form (berat bulat)
+        np.column_stack([rng.integers(0, 2, extra_rows), rng.uniform(0, 110, extra_rows),
+                         rng.uniform(1.0, 2.3, extra_rows), rng.uniform(20, 200, extra_rows)]),
+    ])
+    Xs = scaler.transform(X)
+    # n_jobs=1: urutan akumulasi proba antar pohon deterministik
+    n_jobs = best_rf.n_jobs
+    best_rf.n_jobs = 1
+    try:
+        label_diff = proba_diff = 0
+        for i in range(0, len(Xs), 65536):
+            chunk = Xs[i:i + 65536]
+            label_diff += int((forest.predict(chunk) != best_rf.predict(chunk)).sum())
+            proba_diff += int((forest.predict_proba(chunk) != best_rf.predict_proba(chunk)).any(axis=1).sum())
+    finally:
+        best_rf.n_jobs = n_jobs
+    return len(Xs), label_diff, proba_diff
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('command', choices=['build', 'verify'])
+    args = ap.parse_args(argv)
+
+    import joblib
+    from resources import MODEL_PKL, SCALER_PKL
+    if not os.path.exists(MODEL_PKL):
+        print(f"{MODEL_PKL} tidak ada — jalankan: python train.py build --overwrite", file=sys.stderr)
+        return 2
+    best_rf = joblib.load(MODEL_PKL)
+
+    if args.command == 'build':
+        t0 = time.perf_counter()
+        meta = build_forest(best_rf)
+        print(f"hutan {FOREST_BIN}: {meta['n_estimators']} pohon, {meta['n_nodes']:,} node, "
+              f"{meta['n_leaves']:,} daun, kedalaman {meta['max_depth']}, {meta['bytes'] / 1024:.0f} KiB "
+              f"(pickle {os.path.getsize(MODEL_PKL) / 1024:.0f} KiB), {time.perf_counter() - t0:.2f} s")
+        return 0
+
+    forest = load_forest()
+    if forest is None:
+        print("artefak tidak ada atau tidak cocok dengan pickle saat ini — jalankan `build` dulu", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    total, label_diff, proba_diff = verify_forest(forest, joblib.load(SCALER_PKL), best_rf)
+    print(f"paritas FlatForest vs best_rf: {total - label_diff}/{total} label identik, "
+          f"{total - proba_diff}/{total} baris proba identik ({time.perf_counter() - t0:.1f} s)")
+    return 0 if label_diff == 0 and proba_diff == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
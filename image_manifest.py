@@ -0,0 +1,119 @@
+# image_manifest.py
+"""
+Manifest gambar untuk setiap `image` yang dirujuk dataset_nutrients.csv.
+
+Dibangun saat katalog dimuat dan disimpan ke nutrients/image_manifest.json:
+size, mtime, hash, apakah file ada & bisa didecode, serta dimensinya. Build
+bersifat inkremental — file yang size/mtime-nya sama dengan entri tersimpan tidak
+dibuka lagi. Baris dengan gambar hilang/rusak dikeluarkan dari katalog sebelum
+scoring, sehingga jalur request (grid hasil & PDF) tidak perlu os.path.exists
+atau PIL verify() lagi.
+
+    python image_manifest.py      # bangun/refresh manifest dan tampilkan ringkasan
+"""
+import json
+import os
+import sys
+import threading
+
+from thumbnails import IMAGE_ROOT, content_hash
+
+MANIFEST_PATH = os.path.join('nutrients', 'image_manifest.json')
+MANIFEST_VERSION = 1
+
+
+def _inspect(path, st):
+    from PIL import Image
+
+    entry = {'exists': True, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+             'sha1': content_hash(path), 'ok': False, 'width': None, 'height': None, 'error': None}
+    try:
+        with Image.open(path) as im:
+            entry['width'], entry['height'] = im.size
+            im.verify()
+        entry['ok'] = True
+    except Exception as exc:
+        entry['error'] = f"{type(exc).__name__}: {exc}"
+    return entry
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') == MANIFEST_VERSION:
+            return data['images']
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    return {}
+
+
+def build_image_manifest(images, image_root=IMAGE_ROOT, path=MANIFEST_PATH):
+    """
+    Refresh manifest untuk daftar nama file `images` lalu simpan ke `path`.
+    Return dict {image: entry}. Hanya file baru/berubah yang dibuka dengan PIL.
+    """
+    old = _read(path)
+    new = {}
+    for name in sorted(set(images)):
+        src = os.path.join(image_root, name)
+        try:
+            st = os.stat(src)
+        except FileNotFoundError:
+            new[name] = {'exists': False, 'ok': False, 'error': 'not found'}
+            continue
+        entry = old.get(name)
+        if entry and entry.get('exists') and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            new[name] = entry
+        else:
+            new[name] = _inspect(src, st)
+
+    if new != old:
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'version': MANIFEST_VERSION, 'images': new}, f)
+        os.replace(tmp, path)
+    _set_current(new)
+    return new
+
+
+# ---------------------------------------------
+# Manifest aktif di proses ini (diisi saat katalog dimuat)
+# ---------------------------------------------
+_lock = threading.Lock()
+_current = {'images': None}
+
+
+def _set_current(images):
+    with _lock:
+        _current['images'] = images
+
+
+def get_image_manifest(path=MANIFEST_PATH):
+    """Manifest aktif; jika katalog belum dimuat di proses ini, baca file tersimpan (tanpa validasi ulang)."""
+    images = _current['images']
+    if images is None:
+        images = _read(path)
+        _set_current(images)
+    return images
+
+
+def image_ok(manifest, image):
+    entry = manifest.get(image)
+    return bool(entry and entry.get('ok'))
+
+
+def main():
+    from resources import load_nutri_df
+
+    images = load_nutri_df()['image'].dropna()
+    manifest = build_image_manifest(images)
+    broken = {k: v['error'] for k, v in manifest.items() if not v['ok']}
+    print(f"{len(manifest)} gambar dirujuk, {len(manifest) - len(broken)} valid, {len(broken)} hilang/rusak")
+    for name, err in sorted(broken.items()):
+        print(f"  - {name}: {err}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+# inference.py
+"""
+Layanan prediksi status gizi bersama dengan micro-batching.
+
+Pada satu baris, overhead per panggilan sklearn (validasi input, dispatch
+ke setiap pohon) jauh lebih besar dari komputasinya, dan sesi-sesi Streamlit
+yang bersamaan saling berebut GIL. BatchingPredictor mengumpulkan request dari
+banyak thread dalam jendela waktu singkat (default 2 ms) atau sampai max_batch,
+menjalankan SATU scaler.transform + predict, lalu mengembalikan hasil ke tiap
+pemanggil lewat Future.
+
+Konfigurasi via environment:
+    EDUNUTRI_BATCH_WINDOW_MS   (default 2.0)
+    EDUNUTRI_BATCH_MAX         (default 64)
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+DEFAULT_WINDOW_MS = float(os.environ.get('EDUNUTRI_BATCH_WINDOW_MS', 2.0))
+DEFAULT_MAX_BATCH = int(os.environ.get('EDUNUTRI_BATCH_MAX', 64))
+
+# Jumlah sampel latensi terakhir yang disimpan untuk persentil
+_LATENCY_WINDOW = 10000
+
+_STOP = object()
+
+
+class BatchingPredictor:
+    """
+    Satu worker thread; submit() aman dipanggil dari thread mana pun.
+    Latensi dicatat per request (submit → hasil tersedia) dan per batch (durasi predict).
+    """
+
+    def __init__(self, scaler, model, window_ms=DEFAULT_WINDOW_MS, max_batch=DEFAULT_MAX_BATCH):
+        self.scaler = scaler
+        self.model = model
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.n_features = model.n_features_in_
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        # Dipegang saat put ke antrean: tidak ada request yang masuk SETELAH _STOP
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._latency = deque(maxlen=_LATENCY_WINDOW)
+        self._predict_time = deque(maxlen=_LATENCY_WINDOW)
+        self._batch_sizes = deque(maxlen=_LATENCY_WINDOW)
+        self.requests = 0
+        self.batches = 0
+
+        self._worker = threading.Thread(target=self._run, name='edunutri-predictor', daemon=True)
+        self._worker.start()
+
+    # ---------------------------------------------
+    # API pemanggil
+    # ---------------------------------------------
+    def submit(self, features):
+        """
+        features: 1 baris (Gender, Age, HeightM, WeightKg) → Future berisi label status.
+        Bentuk baris dicek di sini (ValueError) supaya satu request rusak tidak
+        menggagalkan batch; RuntimeError jika predictor sudah ditutup.
+        """
+        row = np.asarray(features, dtype=float).reshape(-1)
+        if row.shape != (self.n_features,):
+            raise ValueError(f"butuh {self.n_features} fitur per baris, bukan {row.shape[0]}")
+        fut = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("BatchingPredictor sudah ditutup")
+            self._queue.put((row, time.perf_counter(), fut))
+        return fut
+
+    def predict(self, features, timeout=None):
+        return self.submit(features).result(timeout)
+
+    def close(self, timeout=1.0):
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    # ---------------------------------------------
+    # Worker
+    # ---------------------------------------------
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)   # proses batch ini dulu, berhenti di iterasi berikutnya
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            t0 = time.perf_counter()
+            try:
+                X = np.vstack([b[0] for b in batch])
+                labels = self.model.predict(self.scaler.transform(X))
+            except Exception as exc:   # teruskan error ke semua pemanggil di batch ini; worker tetap jalan
+                for _, _, fut in batch:
+                    fut.set_exception(exc)
+                continue
+            t1 = time.perf_counter()
+            for (_, t_submit, fut), label in zip(batch, labels):
+                fut.set_result(label)
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self._batch_sizes.append(len(batch))
+                self._predict_time.append(t1 - t0)
+                self._latency.extend(t1 - t_submit for _, t_submit, _ in batch)
+
+    # ---------------------------------------------
+    # Metrik
+    # ---------------------------------------------
+    def stats(self):
+        with self._lock:
+            lat = np.array(self._latency) * 1e3
+            sizes = np.array(self._batch_sizes)
+            pred = np.array(self._predict_time) * 1e3
+            out = {
+                'window_ms': self.window * 1e3,
+                'max_batch': self.max_batch,
+                'requests': self.requests,
+                'batches': self.batches,
+            }
+        if len(lat):
+            p50, p95, p99 = np.percentile(lat, [50, 95, 99])
+            out.update(
+                latency_ms_p50=float(p50), latency_ms_p95=float(p95), latency_ms_p99=float(p99),
+                latency_ms_max=float(lat.max()),
+                batch_size_mean=float(sizes.mean()), batch_size_max=int(sizes.max()),
+                predict_ms_mean=float(pred.mean()),
+            )
+        return out
+
+
+# ---------------------------------------------
+# Instance bersama per proses (mengikuti resources yang aktif)
+# ---------------------------------------------
+_lock = threading.Lock()
+_shared = {'fingerprint': None, 'predictor': None}
+
+
+def get_predictor(res):
+    """BatchingPredictor bersama untuk Resources `res`; dibuat ulang jika model berganti."""
+    with _lock:
+        if _shared['predictor'] is None or _shared['fingerprint'] != res.fingerprint:
+            if _shared['predictor'] is not None:
+                _shared['predictor'].close()
+            _shared['predictor'] = BatchingPredictor(res.scaler, res.model_for(DEFAULT_MAX_BATCH))
+            _shared['fingerprint'] = res.fingerprint
+        return _shared['predictor']
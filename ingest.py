@@ -0,0 +1,155 @@
+# ingest.py
+"""
+Ingest dataset nutrisi secara streaming (per chunk) dengan memori terbatas.
+
+pd.read_csv penuh memuat SEMUA baris sebagai float64 + object sekaligus, lalu
+extract_menu_name berjalan per baris lewat .apply. Untuk katalog jutaan resep
+jalur ini:
+- membaca CSV per `chunksize` baris, hanya kolom yang dipakai, numerik langsung float32
+- ekstraksi nama menu tanpa regex (bytes.translate; hasil identik
+  dengan extract_menu_name, dicek oleh `verify`)
+- dedup lintas chunk (himpunan nama yang sudah terlihat; keep='first' seperti loader)
+- filter kelayakan per chunk, sehingga hanya baris lolos yang tersimpan
+- matriks scoring + indeks gambar dibangun dari potongan-potongan itu
+
+Memori kerja = satu chunk + hasil akhir (baris lolos), tidak bergantung pada
+ukuran file sumber.
+
+    python ingest.py verify        # paritas vs load_nutri_df_csv + NutrientCatalog (juga: tests/test_ingest.py)
+
+Throughput & peak RSS: benchmarks/bench_ingest.py.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from recommender import NUTRIENT_COLS, OUTPUT_COLS, NutrientCatalog
+from resources import NUTRI_CSV, extract_menu_name, load_nutri_df_csv
+
+DEFAULT_CHUNKSIZE = 200_000
+_LEGACY_PREFIX = "recipe-image-legacy-id"
+_EXTENSIONS = (b'.jpg', b'.jpeg', b'.png')
+# Langkah 3–4 extract_menu_name (hapus digit, '-'/'_' → spasi) dalam satu bytes.translate
+_SPACE_TABLE = bytes.maketrans(b'-_', b'  ')
+_DIGITS = b'0123456789'
+
+
+def _menu_name(filename):
+    """
+    extract_menu_name untuk nama file ASCII tercetak, tanpa regex. Selain itu
+    (\\d/\\s Unicode, karakter kontrol, '$' sebelum newline) lewat versi asli.
+    """
+    if not (filename.isascii() and filename.isprintable()):
+        return extract_menu_name(filename)
+    if filename.startswith(_LEGACY_PREFIX):
+        return None
+    name = filename.encode('ascii')
+    # 1) ekstensi
+    if name[-5:].lower().endswith(_EXTENSIONS):
+        name = name[:name.rfind(b'.')]
+    # 2) segmen setelah hyphen terakhir (regex '-[^-]+$' butuh ≥1 karakter sesudahnya)
+    cut = name.rfind(b'-')
+    if 0 <= cut < len(name) - 1:
+        name = name[:cut]
+    # 3–4) digit, '-'/'_', spasi ganda
+    return b' '.join(name.translate(_SPACE_TABLE, _DIGITS).split()).decode('ascii')
+
+
+def extract_menu_names(images):
+    """extract_menu_name untuk satu Series (NaN tetap NaN)."""
+    return pd.Series([_menu_name(x) if isinstance(x, str) else None for x in images.tolist()],
+                     index=images.index, dtype=object)
+
+
+def iter_nutrient_chunks(path, chunksize=DEFAULT_CHUNKSIZE, usecols=None):
+    """
+    Chunk DataFrame bersih (kolom sumber + Menu, float → float32), index = posisi baris sumber.
+    Dedup berlaku lintas chunk, sama dengan dropna + drop_duplicates pada loader CSV.
+    """
+    seen = set()
+    dtype = {c: np.float32 for c in NUTRIENT_COLS}
+    reader = pd.read_csv(path, chunksize=chunksize, usecols=usecols, dtype=dtype)
+    start = 0
+    for chunk in reader:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        wide = chunk.select_dtypes(np.float64).columns
+        if len(wide):
+            chunk[wide] = chunk[wide].astype(np.float32)
+
+        chunk['Menu'] = extract_menu_names(chunk['image'])
+        chunk = chunk[chunk['Menu'].notna()]
+        # isin(set) menyalin seluruh set tiap chunk (kuadratik); cek keanggotaan langsung
+        menus = chunk['Menu'].tolist()
+        first = ~chunk['Menu'].duplicated().to_numpy()
+        first &= np.fromiter((m not in seen for m in menus), dtype=bool, count=len(menus))
+        chunk = chunk[first]
+        seen.update(chunk['Menu'].tolist())
+        yield chunk
+
+
+def ingest_catalog(path, chunksize=DEFAULT_CHUNKSIZE, image_manifest=None):
+    """
+    NutrientCatalog langsung dari CSV secara streaming. Return (catalog, statistik).
+    Hanya kolom OUTPUT_COLS yang dibaca; baris yang tidak lolos filter kelayakan
+    dibuang per chunk.
+    """
+    t0 = time.perf_counter()
+    parts, rows = [], 0
+    usecols = ['image'] + NUTRIENT_COLS
+    for chunk in iter_nutrient_chunks(path, chunksize, usecols=usecols):
+        rows += len(chunk)
+        eligible = chunk[
+            (chunk['kcal'] > 50) &
+            (chunk['protein'] > 1) &
+            (chunk['fat'] > 1) &
+            (chunk['carbs'] > 5)
+        ]
+        parts.append(eligible[OUTPUT_COLS])
+    frame = pd.concat(parts) if parts else pd.DataFrame(columns=OUTPUT_COLS)
+    del parts
+    catalog = NutrientCatalog(frame, image_manifest)
+    seconds = time.perf_counter() - t0
+    return catalog, {'menus_unique': rows, 'catalog': len(catalog), 'seconds': seconds}
+
+
+# ---------------------------------------------
+# Paritas
+# ---------------------------------------------
+def verify(path=NUTRI_CSV, chunksize=97):
+    """Bandingkan dengan jalur CSV penuh (chunksize kecil agar dedup lintas chunk teruji)."""
+    raw = pd.read_csv(path)
+    names = extract_menu_names(raw['image'])
+    expected_names = raw['image'].map(extract_menu_name)
+    same = (names.isna() & expected_names.isna()) | (names == expected_names)
+    if not same.all():
+        raise RuntimeError(f"extract_menu_names berbeda pada {int((~same).sum())} baris")
+
+    expected = NutrientCatalog(load_nutri_df_csv(path))
+    got, _ = ingest_catalog(path, chunksize)
+    if got.menu.tolist() != expected.menu.tolist():
+        raise RuntimeError("urutan/himpunan menu berbeda")
+    if got.image.tolist() != expected.image.tolist():
+        raise RuntimeError("indeks gambar berbeda")
+    if not np.array_equal(got.matrix, expected.matrix):
+        raise RuntimeError("matriks scoring berbeda")
+    return len(got)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest='command', required=True)
+    sub.add_parser('verify')
+    args = ap.parse_args(argv)
+
+    if args.command == 'verify':
+        n = verify()
+        print(f"paritas ingest streaming vs CSV penuh: identik ({n} menu di katalog)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
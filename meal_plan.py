@@ -0,0 +1,370 @@
+# meal_plan.py
+"""
+Mode rencana harian: pilih 3–5 menu yang JUMLAH nutrisinya masuk rentang
+kebutuhan harian (kcal dari tee_min–tee_max, karbohidrat/protein/lemak IOM 2005,
+serat 25–37 g) — berbeda dengan recommend_menu_demographic yang menilai setiap
+menu sendiri-sendiri terhadap target satu hari.
+
+Solver: branch-and-bound depth-first atas kombinasi menu (indeks naik, tanpa
+pengulangan). Di setiap node SEMUA kandidat menu berikutnya diuji sekaligus
+(vektor numpy) terhadap batas:
+    S + x_j + (jumlah m nilai terkecil sesudah j) <= hi
+    S + x_j + (jumlah m nilai terbesar sesudah j) >= lo
+untuk setiap nutrisi, dengan m = sisa menu yang belum dipilih. Kandidat yang
+lolos dicoba berurutan dari yang paling mendekati titik tengah rentang.
+Jika dalam anggaran node tidak ada kombinasi yang masuk rentang, dipakai
+kombinasi dengan pelanggaran rentang terkecil (greedy + perbaikan tukar-satu,
+masing-masing satu operasi vektor atas seluruh katalog) dan hasilnya ditandai
+feasible=False.
+
+WeeklyPlanner menyusun 7 hari dengan larangan pengulangan menu dalam N hari dan
+memperbaiki satu hari saja saat user menukar satu menu (lihat swap()).
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from recommender import NUTRIENT_COLS, OUTPUT_COLS
+
+PLAN_SIZES = (3, 4, 5)
+
+# Rentang kalori minimal ±5% dari titik tengah (status Normal: tee_min == tee_max)
+KCAL_TOLERANCE = 0.05
+
+# Anggaran node branch-and-bound per solve (dibagi antar ukuran) agar waktu jawab
+# tetap terjaga; setelah habis dipakai kombinasi dengan pelanggaran terkecil
+MAX_NODES = 1000
+
+# Putaran maksimum perbaikan tukar-satu pada pencarian pelanggaran terkecil
+_MAX_IMPROVE_PASSES = 10
+
+# Rencana mingguan: menu tidak boleh muncul lagi dalam N hari
+NO_REPEAT_DAYS = 3
+
+
+@dataclass
+class PlanTargets:
+    """Rentang harian per nutrisi, urutan NUTRIENT_COLS."""
+    lo: np.ndarray
+    hi: np.ndarray
+
+    @property
+    def mid(self):
+        return (self.lo + self.hi) / 2
+
+
+@dataclass
+class MealPlan:
+    items: pd.DataFrame     # kolom OUTPUT_COLS
+    totals: dict            # {nutrisi: jumlah}
+    feasible: bool          # True = semua nutrisi masuk rentang
+    violation: float        # jumlah pelanggaran rentang relatif thd titik tengah (0.0 = masuk rentang)
+    nodes: int              # node branch-and-bound yang dikunjungi
+    seconds: float
+
+
+def plan_targets(tee_min, tee_max, karbo_min, karbo_max, protein_min, protein_max,
+                 lemak_min, lemak_max, serat_min, serat_max):
+    """Rentang dari variabel yang sudah dihitung app.py (langkah 4 & 8)."""
+    kcal_lo, kcal_hi = tee_min, tee_max
+    kcal_mid = (tee_min + tee_max) / 2
+    if kcal_hi - kcal_lo < 2 * KCAL_TOLERANCE * kcal_mid:
+        kcal_lo, kcal_hi = kcal_mid * (1 - KCAL_TOLERANCE), kcal_mid * (1 + KCAL_TOLERANCE)
+    ranges = {
+        'kcal': (kcal_lo, kcal_hi),
+        'protein': (protein_min, protein_max),
+        'fat': (lemak_min, lemak_max),
+        'carbs': (karbo_min, karbo_max),
+        'fibre': (serat_min, serat_max),
+    }
+    return PlanTargets(
+        lo=np.array([ranges[c][0] for c in NUTRIENT_COLS], dtype=float),
+        hi=np.array([ranges[c][1] for c in NUTRIENT_COLS], dtype=float),
+    )
+
+
+def _suffix_extremes(X, k):
+    """
+    smin[m][j] / smax[m][j] = jumlah m nilai terkecil / terbesar di X[j:] per nutrisi
+    (m = 0..k-1). Bila X[j:] berisi < m baris → +inf / -inf (tidak bisa dipenuhi).
+    """
+    n, d = X.shape
+    smin = np.full((k, n + 1, d), np.inf)
+    smax = np.full((k, n + 1, d), -np.inf)
+    smin[0] = 0.0
+    smax[0] = 0.0
+    if k == 1:
+        return smin, smax
+    # Sort per kolom dari belakang: pertahankan m terkecil/terbesar dengan kumpulan berjalan
+    lows = np.full((k - 1, d), np.inf)
+    highs = np.full((k - 1, d), -np.inf)
+    for j in range(n - 1, -1, -1):
+        lows = np.sort(np.vstack([lows, X[j]]), axis=0)[:k - 1]
+        highs = np.sort(np.vstack([highs, X[j]]), axis=0)[::-1][:k - 1]
+        smin[1:, j] = np.cumsum(lows, axis=0)
+        smax[1:, j] = np.cumsum(highs, axis=0)
+    return smin, smax
+
+
+class _ComboSearch:
+    """
+    DFS branch-and-bound untuk tepat k menu. Stack disimpan, sehingga next()
+    berikutnya melanjutkan pencarian dari solusi terakhir (dipakai untuk repair
+    satu hari pada rencana mingguan) alih-alih mengulang dari awal.
+    """
+
+    def __init__(self, space, k, lo, hi):
+        self.space = space
+        self.k = k
+        self.lo = lo
+        self.hi = hi
+        self.stack = None
+        self.nodes = 0
+
+    def _expand(self, start, S, depth, banned):
+        sp, k = self.space, self.k
+        r = k - depth                       # menu yang masih harus dipilih, termasuk yang ini
+        end = len(sp.X) - r + 1
+        if end <= start:
+            return np.empty(0, dtype=np.intp)
+        part = S + sp.X[start:end]          # slice (view) — tanpa fancy indexing
+        ok = (((part + sp.smin[r - 1, start + 1:end + 1]) <= self.hi).all(axis=1) &
+              ((part + sp.smax[r - 1, start + 1:end + 1]) >= self.lo).all(axis=1))
+        if banned is not None:
+            ok &= ~banned[start:end]
+        j = np.flatnonzero(ok) + start
+        # Urutan coba: proyeksi total harian paling dekat titik tengah
+        proj = part[ok] * (k / (depth + 1))
+        return j[np.argsort(np.abs(proj - sp.mid) @ sp.scale, kind='stable')]
+
+    def next(self, banned=None, max_nodes=MAX_NODES):
+        """Kombinasi berikutnya (list indeks baris space.X) yang tidak memuat menu `banned`, atau None."""
+        if self.stack is None:
+            zero = np.zeros(self.space.X.shape[1])
+            self.stack = [(zero, [], self._expand(0, zero, 0, banned), 0)]
+        budget = self.nodes + max_nodes
+        while self.stack:
+            S, picked, cand, pos = self.stack.pop()
+            if pos >= len(cand):
+                continue
+            if self.nodes >= budget:
+                self.stack.append((S, picked, cand, pos))   # bisa dilanjutkan pada panggilan berikutnya
+                return None
+            j = int(cand[pos])
+            self.stack.append((S, picked, cand, pos + 1))
+            if banned is not None and (banned[j] or (picked and banned[picked].any())):
+                continue                    # kandidat/prefix lama yang kini dilarang (stack panggilan sebelumnya)
+            self.nodes += 1
+            S2 = S + self.space.X[j]
+            picked2 = picked + [j]
+            if len(picked2) == self.k:
+                return picked2              # lolos batas di level terakhir = masuk rentang
+            self.stack.append((S2, picked2, self._expand(j + 1, S2, len(picked2), banned), 0))
+        return None
+
+
+class _PlanSpace:
+    """Katalog dalam urutan dasar (opsional diacak) + batas suffix, dipakai bersama semua pencarian."""
+
+    def __init__(self, catalog, targets, sizes=PLAN_SIZES, rng=None):
+        self.catalog = catalog
+        self.targets = targets
+        self.order = np.arange(len(catalog))
+        if rng is not None:
+            self.order = rng.permutation(self.order)
+        self.X = catalog.matrix.T[self.order].astype(np.float64)
+        self.lo, self.hi, self.mid = targets.lo, targets.hi, targets.mid
+        self.scale = 1.0 / np.maximum(targets.mid, 1e-9)
+        self.smin, self.smax = _suffix_extremes(self.X, max(sizes))   # m = 0..max-1 berlaku untuk semua k
+
+        # Ukuran yang rata-rata kalori per menunya paling dekat median katalog dicoba lebih dulu
+        kcal = NUTRIENT_COLS.index('kcal')
+        typical = np.median(self.X[:, kcal])
+        self.sizes = sorted(sizes, key=lambda k: abs(targets.mid[kcal] / k - typical))
+
+    def violation(self, totals):
+        """Pelanggaran rentang relatif (vektor baris bila `totals` 2-D)."""
+        out = np.maximum(self.lo - totals, 0) + np.maximum(totals - self.hi, 0)
+        return out @ self.scale
+
+    def improve(self, picked, banned=None):
+        """
+        Perbaikan tukar-satu: untuk tiap posisi, ganti dengan menu yang paling
+        menurunkan pelanggaran (satu uji vektor atas seluruh katalog per posisi).
+        """
+        picked = list(picked)
+        S = self.X[picked].sum(axis=0)
+        current = self.violation(S)
+        for _ in range(_MAX_IMPROVE_PASSES):
+            improved = False
+            for pos in range(len(picked)):
+                if current == 0:
+                    return picked, current
+                rest = S - self.X[picked[pos]]
+                viol = self.violation(rest + self.X)
+                viol[picked] = np.inf
+                if banned is not None:
+                    viol[banned] = np.inf
+                j = int(np.argmin(viol))
+                if viol[j] < current - 1e-12:
+                    picked[pos] = j
+                    S = rest + self.X[j]
+                    current = viol[j]
+                    improved = True
+            if not improved:
+                break
+        return picked, current
+
+    def closest(self, k, banned=None):
+        """Greedy (proyeksi total harian terdekat rentang) lalu improve(). Return (picked, pelanggaran)."""
+        picked = []
+        S = np.zeros(self.X.shape[1])
+        for depth in range(k):
+            viol = self.violation((S + self.X) * (k / (depth + 1)))
+            viol[picked] = np.inf
+            if banned is not None:
+                viol[banned] = np.inf
+            j = int(np.argmin(viol))
+            if not np.isfinite(viol[j]):
+                return None, np.inf
+            picked.append(j)
+            S = S + self.X[j]
+        return self.improve(picked, banned)
+
+    def solve(self, banned=None, searches=None, max_nodes=MAX_NODES):
+        """
+        Branch-and-bound per ukuran dalam anggaran `max_nodes` (total); `searches`
+        (dict) menyimpan _ComboSearch per k agar bisa dilanjutkan. Bila tidak
+        ketemu, kombinasi dengan pelanggaran terkecil. Return (picked, pelanggaran, node).
+        """
+        searches = {} if searches is None else searches
+        nodes = 0
+        for k in self.sizes:
+            if nodes >= max_nodes:
+                break
+            search = searches.get(k)
+            if search is None:
+                search = searches[k] = _ComboSearch(self, k, self.lo, self.hi)
+            before = search.nodes
+            picked = search.next(banned, max_nodes - nodes)
+            nodes += search.nodes - before
+            if picked is not None:
+                return picked, 0.0, nodes
+
+        best, best_viol = None, np.inf
+        for k in self.sizes:
+            picked, viol = self.closest(k, banned)
+            if viol < best_viol:
+                best, best_viol = picked, viol
+        return best, float(best_viol), nodes
+
+    def to_plan(self, picked, violation, nodes, seconds):
+        if not picked:
+            return MealPlan(items=pd.DataFrame(columns=OUTPUT_COLS), totals={c: 0.0 for c in NUTRIENT_COLS},
+                            feasible=False, violation=float('inf'), nodes=nodes, seconds=seconds)
+        totals = {c: float(v) for c, v in zip(NUTRIENT_COLS, self.X[picked].sum(axis=0))}
+        return MealPlan(items=self.catalog.rows(self.order[picked]), totals=totals,
+                        feasible=violation == 0.0, violation=float(violation), nodes=nodes, seconds=seconds)
+
+
+def optimize_daily_plan(catalog, targets, sizes=PLAN_SIZES, rng=None, max_nodes=MAX_NODES):
+    """
+    Cari 3–5 menu dari `catalog` (NutrientCatalog) yang total nutrisinya masuk
+    rentang `targets`. rng mengacak urutan dasar katalog sehingga submit berulang
+    memberi rencana berbeda; tanpa rng hasilnya deterministik.
+    """
+    t0 = time.perf_counter()
+    space = _PlanSpace(catalog, targets, sizes, rng)
+    picked, violation, nodes = space.solve(max_nodes=max_nodes)
+    return space.to_plan(picked, violation, nodes, time.perf_counter() - t0)
+
+
+# ---------------------------------------------
+# Rencana mingguan
+# ---------------------------------------------
+class WeeklyPlanner:
+    """
+    Rencana `days` hari; menu yang sama tidak muncul lagi dalam `no_repeat_days`
+    hari (jendela geser, termasuk hari itu sendiri). Setiap hari memakai rentang
+    harian yang sama.
+
+    swap(day, menu) hanya memperbaiki hari itu: pertama coba ganti menu itu saja
+    (satu uji vektor atas seluruh katalog, menu lain tetap); bila tidak ada
+    pengganti tunggal yang sama baiknya, lanjutkan branch-and-bound hari itu dari
+    stack yang disimpan saat solve().
+    """
+
+    def __init__(self, catalog, targets, days=7, no_repeat_days=NO_REPEAT_DAYS, sizes=PLAN_SIZES, rng=None,
+                 max_nodes=MAX_NODES):
+        self.space = _PlanSpace(catalog, targets, sizes, rng)
+        self.days = days
+        self.no_repeat_days = no_repeat_days
+        self.max_nodes = max_nodes
+        self.plans = [None] * days
+        self._picked = [[] for _ in range(days)]
+        self._violation = [0.0] * days
+        self._rejected = [set() for _ in range(days)]
+        self._searches = [{} for _ in range(days)]
+        self.solve_seconds = None
+        self.repair_seconds = None
+
+    def _banned(self, day):
+        banned = np.zeros(len(self.space.X), dtype=bool)
+        window = self.no_repeat_days - 1
+        for d in range(max(0, day - window), min(self.days, day + window + 1)):
+            if d != day:
+                banned[self._picked[d]] = True
+        banned[list(self._rejected[day])] = True
+        return banned
+
+    def _set_day(self, day, picked, violation, nodes, seconds):
+        self._picked[day] = list(picked or [])
+        self._violation[day] = violation
+        self.plans[day] = self.space.to_plan(self._picked[day], violation, nodes, seconds)
+
+    def _solve_day(self, day, t0):
+        picked, violation, nodes = self.space.solve(self._banned(day), self._searches[day], self.max_nodes)
+        self._set_day(day, picked, violation, nodes, time.perf_counter() - t0)
+
+    def solve(self):
+        """Susun semua hari berurutan (hari berikutnya menghindari menu hari-hari sebelumnya)."""
+        t_week = time.perf_counter()
+        for day in range(self.days):
+            self._solve_day(day, time.perf_counter())
+        self.solve_seconds = time.perf_counter() - t_week
+        return self.plans
+
+    def swap(self, day, menu):
+        """Ganti `menu` (nama) di hari `day`; hari lain tidak disentuh. Return MealPlan hari itu."""
+        t0 = time.perf_counter()
+        sp = self.space
+        picked = self._picked[day]
+        hits = np.flatnonzero(sp.catalog.menu[sp.order[picked]] == menu)
+        if len(hits) == 0:
+            raise ValueError(f"Menu {menu!r} tidak ada di rencana hari ke-{day + 1}")
+        pos = int(hits[0])
+        self._rejected[day].add(picked[pos])
+
+        # 1) Pengganti tunggal: satu uji vektor atas seluruh katalog
+        banned = self._banned(day)
+        banned[picked] = True
+        rest = sp.X[picked].sum(axis=0) - sp.X[picked[pos]]
+        viol = sp.violation(rest + sp.X)
+        viol[banned] = np.inf
+        best = int(np.argmin(viol))
+        new = list(picked)
+        new[pos] = best
+        if viol[best] <= self._violation[day]:
+            self._set_day(day, new, float(viol[best]), 0, time.perf_counter() - t0)
+        elif self._violation[day] > 0:
+            # Hari ini memang tidak punya kombinasi persis (anggaran B&B sudah habis saat
+            # solve) → cukup perbaikan tukar-satu dari pengganti tunggal terbaik
+            new, violation = sp.improve(new, banned)
+            self._set_day(day, new, violation, 0, time.perf_counter() - t0)
+        else:
+            # 2) Lanjutkan branch-and-bound hari ini dari stack yang disimpan
+            self._solve_day(day, t0)
+        self.repair_seconds = time.perf_counter() - t0
+        return self.plans[day]
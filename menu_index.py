@@ -0,0 +1,49 @@
+# menu_index.py
+"""
+Indeks spasial (KD-tree, scipy cKDTree) untuk pencarian menu terdekat ke target.
+
+Skor di recommender.score_raw untuk target kalori K adalah
+    raw_j = Σ_i (w_i / (f_i·K)) · |x_ij − f_i·K|          i ∈ (kcal, protein, fat, carbs)
+          = (1/K) · Σ_i |y_ij − w_i·K|,   dengan y_ij = w_i · x_ij / f_i
+(w = SCORE_WEIGHTS, f = MACRO_FACTORS). Jadi urutan skor = urutan jarak L1 di
+ruang y ke titik q = w·K, dan ruang y tidak bergantung pada K: satu pohon
+dipakai untuk semua target, top-k menjadi query k-tetangga (p=1).
+
+Bobot sampling juga butuh max(raw) atas SELURUH katalog. Jarak L1 maksimum ke q
+dihitung persis dari 16 kombinasi tanda: max_j Σ|y_j − q| = max_s (max_j s·y_j − s·q),
+dengan max_j s·y_j dihitung sekali saat build.
+"""
+import itertools
+
+import numpy as np
+
+
+class MenuIndex:
+    """KD-tree di atas matriks (4+, n) kolom kcal/protein/fat/carbs (urutan NUTRIENT_COLS)."""
+
+    def __init__(self, matrix, weights, factors, leafsize=32):
+        from scipy.spatial import cKDTree
+
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.axis_scale = self.weights / np.asarray(factors, dtype=np.float64)
+        Y = matrix[:len(self.weights)].T.astype(np.float64) * self.axis_scale
+        self.tree = cKDTree(Y, leafsize=leafsize)
+        self._signs = np.array(list(itertools.product((-1.0, 1.0), repeat=Y.shape[1])))
+        self._sign_max = (Y @ self._signs.T).max(axis=0) if len(Y) else np.full(len(self._signs), -np.inf)
+
+    def __len__(self):
+        return self.tree.n
+
+    def query(self, kalori_target, k):
+        """
+        (indeks terurut, raw terurut, raw maksimum katalog) untuk k menu terdekat.
+        raw identik (hingga pembulatan float) dengan recommender.score_raw.
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0), -np.inf
+        q = self.weights * kalori_target
+        dist, idx = self.tree.query(q, k=k, p=1)
+        dist, idx = np.atleast_1d(dist), np.atleast_1d(idx)
+        raw_max = (self._sign_max - self._signs @ q).max() / kalori_target
+        return idx.astype(np.intp), dist / kalori_target, raw_max
@@ -0,0 +1,137 @@
+# nutrition_profile.py
+"""
+Satu profil gizi per input user, dipakai bersama oleh UI (app.py), scoring menu
+(recommender.recommend_menu_demographic), PDF (report_pdf.pdf_inputs), api.py dan
+bulk_pdf.py.
+
+Sebelumnya AKG ada dua salinan (akg_df + dict akg_data di app.py yang dibangun
+ulang tiap rerun) dan target kalori berbeda: scoring memakai AKG ± 500, UI/PDF
+memakai rentang TEE. Sekarang:
+
+- akg              : baris AKG Permenkes 2019 (lookup O(1) lewat recommender.AKG_ROW), None di luar tabel
+- energi           : energy.EnergyProfile (BMR, TEE, rentang kalori & makro)
+- kalori_target    : energy.kalori_target(tee_min, tee_max) — SATU target untuk scoring, UI, dan PDF
+
+get_profile() di-memoize per tuple input (profil immutable, aman dibagi antar sesi/thread).
+
+    python nutrition_profile.py verify     # paritas AKG padat vs mask + target batch vs skalar
+                                           # (versi kecil: tests/test_nutrition_profile.py)
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+from energy import (PAL_LEVELS, EnergyProfile, hitung_energi, hitung_energi_batch, kalori_target, pal_dari_label,
+                    random_users)
+from recommender import AKG_COLS, akg_df, get_user_akg, lookup_akg_rows
+
+# Label kolom tabel perbandingan AKG di UI
+AKG_LABELS = {'Energy': "Energy (kcal)", 'Protein': "Protein (g)", 'Fat': "Fat (g)", 'Carbs': "Carbs (g)",
+              'Fibre': "Fibre (g)"}
+
+PROFILE_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class NutritionProfile:
+    gender: str
+    age: int
+    height: float
+    weight: float
+    activity: str
+    status: str
+    bmi: float
+    energi: EnergyProfile
+    akg: MappingProxyType  # baris akg_df (read-only) atau None
+    kalori_target: float
+
+    def akg_table(self):
+        """{label UI: nilai AKG} untuk tabel perbandingan (None di luar tabel AKG)."""
+        return {label: (self.akg[col] if self.akg is not None else None) for col, label in AKG_LABELS.items()}
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def get_profile(gender, age, height, weight, activity, status):
+    """NutritionProfile untuk satu user (status = hasil predict_status); di-memoize per tuple input."""
+    energi = hitung_energi(gender, age, height, weight, activity, status)
+    akg = get_user_akg(gender, age)
+    return NutritionProfile(
+        gender=gender, age=age, height=height, weight=weight, activity=activity, status=status,
+        bmi=weight / height ** 2, energi=energi,
+        akg=MappingProxyType(akg) if akg is not None else None,
+        kalori_target=kalori_target(energi.tee_min, energi.tee_max),
+    )
+
+
+# ---------------------------------------------
+# Paritas
+# ---------------------------------------------
+def _akg_mask(gender, age):
+    # Implementasi lama get_user_akg (mask tiga kondisi per panggilan)
+    row = akg_df[(akg_df['Gender'] == gender) & (akg_df['AgeMin'] <= age) & (akg_df['AgeMax'] >= age)]
+    return row.iloc[0].to_dict() if not row.empty else None
+
+
+def _mismatch(what, key, got, expected):
+    raise RuntimeError(f"{what} berbeda untuk {key}: {got!r} vs {expected!r}")
+
+
+def check_akg(ages=range(0, 101)):
+    """AKG padat (skalar + vektor) vs mask lama untuk semua gender × umur; return jumlah pasangan."""
+    genders, all_ages = [], []
+    for gender in ("Male", "Female", "Other"):
+        for age in ages:
+            got, expected = get_user_akg(gender, age), _akg_mask(gender, age)
+            if got != expected:
+                _mismatch("get_user_akg", (gender, age), got, expected)
+            genders.append(gender)
+            all_ages.append(age)
+    for g, a, r in zip(genders, all_ages, lookup_akg_rows(genders, all_ages)):
+        expected = _akg_mask(g, a)
+        got = akg_df.iloc[r][AKG_COLS].to_dict() if r >= 0 else None
+        if got != (None if expected is None else {c: expected[c] for c in AKG_COLS}):
+            _mismatch("lookup_akg_rows", (g, a), got, expected)
+    return len(genders)
+
+
+def check_targets(rows=20000, seed=0):
+    """kalori_target batch (batch.py / kohort) vs get_profile skalar untuk user acak."""
+    u = random_users(rows, seed)
+    energi = hitung_energi_batch(u['gender'], u['age'], u['height'], u['weight'], pal_dari_label(u['activity']),
+                                 u['status'])
+    targets = kalori_target(energi['tee_min'], energi['tee_max'])
+    for i in range(rows):
+        p = get_profile(str(u['gender'][i]), int(u['age'][i]), float(u['height'][i]), float(u['weight'][i]),
+                        str(u['activity'][i]), str(u['status'][i]))
+        if targets[i] != p.kalori_target:
+            _mismatch("kalori_target", i, targets[i], p.kalori_target)
+        if p.energi.tee_min == p.energi.tee_max and p.kalori_target != p.energi.tee:
+            _mismatch("kalori_target (rentang nol)", i, p.kalori_target, p.energi.tee)
+
+
+def verify(rows=20000):
+    n_akg = check_akg()
+    check_targets(rows)
+    return n_akg, rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('verify')
+    p.add_argument('--rows', type=int, default=20000, help='user acak untuk cek target batch vs skalar')
+    args = ap.parse_args(argv)
+
+    if args.command == 'verify':
+        n_akg, n_rows = verify(args.rows)
+        info = get_profile.cache_info()
+        print(f"AKG padat vs mask: identik ({n_akg} pasangan gender × umur)\n"
+              f"kalori_target batch vs profil: identik ({n_rows} user, {len(PAL_LEVELS)} level PAL)\n"
+              f"cache profil: {info.currsize} entri, {info.hits} hit, {info.misses} miss")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,360 @@
+# recommender.py
+"""
+Rekomendasi menu berbasis demografi (AKG Permenkes 2019 + status gizi).
+
+Katalog nutrisi dikompilasi sekali saat load menjadi matriks float32 kolumnar
+yang immutable (NutrientCatalog); filter kelayakan menu juga diterapkan di situ.
+Per request, scoring hanya satu pass NumPy + argpartition top-k, tanpa membuat
+DataFrame seukuran katalog. Pool kandidat di-cache per target kalori yang
+dibulatkan ke KCAL_BIN (CandidatePoolCache; ±80 bin di domain form) sehingga
+request biasanya hanya melakukan sampling top_n.
+
+Toleransi yang disengaja: ranking memakai bin_kalori(profile.kalori_target), jadi
+bisa berbeda maksimal KCAL_BIN/2 = 25 kcal dari target yang tampil di UI/PDF
+(≤ ~2% untuk target ≥ 1200 kcal, jauh di dalam toleransi kalori scoring 10%).
+Target yang DITAMPILKAN tetap satu: NutritionProfile.kalori_target.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from image_manifest import image_ok
+from menu_index import MenuIndex
+
+
+# ===============================
+# Tabel AKG berdasar Permenkes 2019
+# ===============================
+akg_df = pd.DataFrame([
+    # Baris untuk laki-laki (Male)
+    {"Gender": "Male", "AgeMin": 13, "AgeMax": 15, "Energy": 2400, "Protein": 70, "Fat": 80, "Carbs": 350, "Fibre": 34},
+    {"Gender": "Male", "AgeMin": 16, "AgeMax": 18, "Energy": 2650, "Protein": 75, "Fat": 85, "Carbs": 400, "Fibre": 37},
+    {"Gender": "Male", "AgeMin": 19, "AgeMax": 29, "Energy": 2650, "Protein": 65, "Fat": 75, "Carbs": 430, "Fibre": 37},
+    {"Gender": "Male", "AgeMin": 30, "AgeMax": 49, "Energy": 2550, "Protein": 65, "Fat": 70, "Carbs": 415, "Fibre": 36},
+    {"Gender": "Male", "AgeMin": 50, "AgeMax": 64, "Energy": 2150, "Protein": 65, "Fat": 60, "Carbs": 340, "Fibre": 30},
+
+    # Baris untuk perempuan (Female)
+    {"Gender": "Female", "AgeMin": 13, "AgeMax": 15, "Energy": 2050, "Protein": 65, "Fat": 70, "Carbs": 300, "Fibre": 29},
+    {"Gender": "Female", "AgeMin": 16, "AgeMax": 18, "Energy": 2100, "Protein": 65, "Fat": 70, "Carbs": 300, "Fibre": 29},
+    {"Gender": "Female", "AgeMin": 19, "AgeMax": 29, "Energy": 2250, "Protein": 60, "Fat": 65, "Carbs": 360, "Fibre": 32},
+    {"Gender": "Female", "AgeMin": 30, "AgeMax": 49, "Energy": 2150, "Protein": 60, "Fat": 60, "Carbs": 340, "Fibre": 30},
+    {"Gender": "Female", "AgeMin": 50, "AgeMax": 64, "Energy": 1800, "Protein": 60, "Fat": 50, "Carbs": 280, "Fibre": 25},
+])
+
+AKG_COLS = ['Energy', 'Protein', 'Fat', 'Carbs', 'Fibre']
+_AKG_GENDERS = {'Female': 0, 'Male': 1}
+_AKG_RECORDS = akg_df.to_dict('records')
+
+# Array padat [kode gender, umur] → posisi baris akg_df (-1 = di luar tabel),
+# sehingga lookup AKG cukup satu indexing, tanpa mask per panggilan
+AKG_ROW = np.full((len(_AKG_GENDERS), int(akg_df['AgeMax'].max()) + 1), -1, dtype=np.int16)
+for _i, _r in enumerate(_AKG_RECORDS):
+    AKG_ROW[_AKG_GENDERS[_r['Gender']], _r['AgeMin']:_r['AgeMax'] + 1] = _i
+AKG_ROW.setflags(write=False)
+
+
+# ============================================
+# Fungsi untuk mengambil AKG user dari tabel di atas
+# ============================================
+def akg_row(gender: str, age) -> int:
+    """Posisi baris akg_df untuk (gender, umur) atau -1. O(1)."""
+    g = _AKG_GENDERS.get(gender)
+    if g is None or not 0 <= age < AKG_ROW.shape[1]:
+        return -1
+    return int(AKG_ROW[g, int(age)])
+
+
+def get_user_akg(gender: str, age: int) -> dict:
+    # Baris akg_df yang sesuai gender dan rentang umur, sebagai dict (None jika tidak ada)
+    row = akg_row(gender, age)
+    return dict(_AKG_RECORDS[row]) if row >= 0 else None
+
+
+def lookup_akg_rows(genders, ages):
+    """
+    Versi vektor dari get_user_akg: posisi baris akg_df untuk tiap (gender, umur),
+    atau -1 jika tidak ada kelompok umur yang cocok.
+    """
+    g = pd.Series(np.asarray(genders, dtype=object)).map(_AKG_GENDERS).to_numpy(dtype=np.float64)
+    ages = np.asarray(ages, dtype=np.float64)
+    ok = ~np.isnan(g) & (ages >= 0) & (ages < AKG_ROW.shape[1])
+    rows = np.full(len(ages), -1, dtype=np.int64)
+    rows[ok] = AKG_ROW[g[ok].astype(np.intp), ages[ok].astype(np.intp)]
+    return rows
+
+
+# Urutan baris matriks nutrisi
+NUTRIENT_COLS = ['kcal', 'protein', 'fat', 'carbs', 'fibre']
+OUTPUT_COLS = ['Menu', 'image'] + NUTRIENT_COLS
+
+# Jumlah kandidat terbaik yang menjadi pool sampling
+POOL_SIZE = 100
+
+# Nilai status gizi yang mungkin keluar dari model
+STATUS_GIZI = ['Underweight', 'Normal', 'Overweight', 'Obesity']
+
+# Target kalori scoring dibulatkan ke kelipatan ini sebelum jadi key pool kandidat
+# (toleransi kalori scoring 10%, jadi ±25 kcal tidak mengubah pool secara berarti;
+# lihat docstring modul). Target AKG ± 500 sudah kelipatan 50, jadi tidak berubah.
+KCAL_BIN = 50
+# Rentang target (TEE-based, lihat nutrition_profile.py) pada domain form → di-warm saat load
+WARM_KCAL_RANGE = (1000, 4800)
+
+# Bobot scoring (kcal, protein, fat, carbs)
+# contoh kasar: tol_karbo = 0.65-0.45 = 0.20, tol_protein = 0.35-0.10 = 0.25, tol_lemak = 0.35-0.20 = 0.15
+_w = np.array([
+    1/0.10,   # misal toleransi kalori 10% dari target
+    1/0.25,   # protein
+    1/0.15,   # lemak
+    1/0.20,   # karbo
+])
+# normalisasi agar jumlah=1
+SCORE_WEIGHTS = _w / _w.sum()
+
+# Fraksi energi IOM 2005 (tengah) → gram: (kcal, protein, fat, carbs)
+MACRO_FACTORS = np.array([1.0, 0.20 / 4, 0.25 / 9, 0.55 / 4])
+
+# Mulai ukuran katalog ini rank_candidates memakai KD-tree (menu_index.py);
+# di bawahnya satu pass vektor masih lebih cepat (lihat benchmarks/bench_menu_index.py)
+INDEX_MIN_ROWS = 10_000
+
+
+class NutrientCatalog:
+    """
+    Katalog menu yang sudah dikompilasi:
+    - matrix : float32 (5, n) read-only, baris = NUTRIENT_COLS (kolumnar, tiap nutrisi contiguous)
+    - menu, image : array nama menu & file gambar (urutan sama dengan kolom matrix)
+    - frame : DataFrame baris terpilih untuk membentuk output top_n; bisa berisi kolom
+              float32 ringkas (catalog_artifact) — ambil baris output lewat rows()
+    Hanya menu yang lolos filter kelayakan yang masuk katalog. Bila `image_manifest`
+    diberikan (lihat image_manifest.py), menu yang gambarnya hilang/rusak ikut dibuang.
+    """
+
+    def __init__(self, nutri_df, image_manifest=None):
+        # FILTERING awal — buang menu terlalu rendah nutrisinya (sekali saat load)
+        eligible = nutri_df[
+            (nutri_df['kcal'] > 50) &
+            (nutri_df['protein'] > 1) &
+            (nutri_df['fat'] > 1) &
+            (nutri_df['carbs'] > 5)
+        ]
+        # Menu sudah unik dari loader; dijaga di sini agar scoring tidak perlu drop_duplicates
+        eligible = eligible.drop_duplicates(subset=['Menu'])
+        if image_manifest is not None:
+            eligible = eligible[eligible['image'].map(lambda im: image_ok(image_manifest, im)).astype(bool)]
+
+        self.frame = eligible[OUTPUT_COLS]
+        # Desimal kolom float32 ringkas dari catalog_artifact.load_catalog (kosong untuk jalur CSV)
+        self.decimals = {c: d for c, d in nutri_df.attrs.get('decimals', {}).items() if c in OUTPUT_COLS}
+        self.matrix = np.ascontiguousarray(eligible[NUTRIENT_COLS].to_numpy(dtype=np.float32).T)
+        self.menu = eligible['Menu'].to_numpy(dtype=object)
+        self.image = eligible['image'].to_numpy(dtype=object)
+        for arr in (self.matrix, self.menu, self.image):
+            arr.setflags(write=False)
+
+        # KD-tree hanya untuk katalog besar
+        self.index = MenuIndex(self.matrix, SCORE_WEIGHTS, MACRO_FACTORS) if len(self) >= INDEX_MIN_ROWS else None
+
+        # Pool kandidat per target kalori (dibulatkan ke KCAL_BIN)
+        self.pools = CandidatePoolCache(self)
+
+    def __len__(self):
+        return self.matrix.shape[1]
+
+    def rows(self, idx):
+        """Baris output frame untuk posisi `idx`, nilai nutrisi sama persis dengan CSV sumber."""
+        out = self.frame.iloc[idx]
+        if self.decimals:
+            out = out.assign(**{c: np.round(out[c].to_numpy(dtype=np.float64), d) for c, d in self.decimals.items()})
+        return out
+
+
+def bin_kalori(kalori_target):
+    """Target kalori dibulatkan ke KCAL_BIN (skalar atau array)."""
+    return np.round(np.asarray(kalori_target, dtype=np.float64) / KCAL_BIN) * KCAL_BIN
+
+
+def kalori_target_for(akg, status_gizi):
+    # Penyesuaian kalori berdasarkan status gizi
+    kalori_target = akg['Energy']
+    if status_gizi == 'Underweight':
+        kalori_target += 500
+    elif status_gizi in ['Overweight', 'Obesity']:
+        kalori_target -= 500
+    # Untuk status Normal → tidak diubah
+    return kalori_target
+
+
+def score_raw(catalog, kalori_target):
+    """
+    Deviasi relatif berbobot terhadap target (kcal, protein, lemak, karbo).
+    Makin kecil makin cocok. Satu pass vektor atas seluruh katalog.
+    """
+    targets = (MACRO_FACTORS * kalori_target).astype(np.float32)
+    coef = (SCORE_WEIGHTS / targets).astype(np.float32)
+    return coef @ np.abs(catalog.matrix[:4] - targets[:, None])
+
+
+def rank_candidates(catalog, kalori_target, pool_size=POOL_SIZE, use_index=None):
+    """
+    Ambil pool kandidat terbaik → (indeks katalog terurut, bobot sampling).
+    Bobot = max(score_raw) - score_raw; kandidat dengan bobot 0 (paling jauh) dibuang.
+    use_index=None → KD-tree bila katalog punya indeks; True/False memaksa salah satu jalur.
+    """
+    if use_index is None:
+        use_index = catalog.index is not None
+    if use_index:
+        index = catalog.index if catalog.index is not None else MenuIndex(catalog.matrix, SCORE_WEIGHTS,
+                                                                             MACRO_FACTORS)
+        idx, raw, raw_max = index.query(kalori_target, pool_size)
+        score = raw_max - raw
+        keep = score > 0
+        return idx[keep], score[keep]
+
+    raw = score_raw(catalog, kalori_target)
+    if raw.size == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+    score = raw.max() - raw
+    valid = np.flatnonzero(score > 0)
+    k = min(pool_size, valid.size)
+    if k == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+    if k < valid.size:
+        valid = valid[np.argpartition(raw[valid], k - 1)[:k]]
+    order = np.argsort(raw[valid], kind='stable')
+    idx = valid[order]
+    return idx, score[idx].astype(np.float64)
+
+
+def rank_candidates_many(catalog, kalori_targets, pool_size=POOL_SIZE):
+    """
+    Versi broadcast dari rank_candidates untuk banyak target sekaligus.
+    Scoring (t target × n menu) dilakukan dalam satu operasi matriks.
+    Return (idx, weights) berbentuk (t, k); slot kosong diisi idx=-1, weight=0.
+    """
+    kalori_targets = np.asarray(kalori_targets, dtype=np.float64)
+    targets = (kalori_targets[:, None] * MACRO_FACTORS).astype(np.float32)        # (t, 4)
+    coef = (SCORE_WEIGHTS / targets).astype(np.float32)                           # (t, 4)
+    dev = np.abs(catalog.matrix[None, :4, :] - targets[:, :, None])               # (t, 4, n)
+    raw = np.einsum('tf,tfn->tn', coef, dev)                                      # (t, n)
+
+    score = raw.max(axis=1, keepdims=True) - raw
+    k = min(pool_size, raw.shape[1])
+    if k == 0:
+        shape = (len(kalori_targets), 0)
+        return np.empty(shape, dtype=np.intp), np.empty(shape, dtype=np.float64)
+    # Kandidat dengan skor 0 (paling jauh) tidak boleh masuk pool → beri raw = inf
+    ranked = np.where(score > 0, raw, np.inf)
+    if k < raw.shape[1]:
+        idx = np.argpartition(ranked, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(k), ranked.shape).copy()
+    order = np.argsort(np.take_along_axis(ranked, idx, axis=1), axis=1, kind='stable')
+    idx = np.take_along_axis(idx, order, axis=1)
+    weights = np.take_along_axis(score, idx, axis=1).astype(np.float64)
+    empty = ~np.isfinite(np.take_along_axis(ranked, idx, axis=1))
+    idx[empty] = -1
+    weights[empty] = 0.0
+    return idx, weights
+
+
+class CandidatePoolCache:
+    """
+    LRU berbatas untuk pool kandidat per target kalori (dibulatkan ke KCAL_BIN).
+    Ruang target kecil (±80 bin di domain form), jadi setelah warm() hampir semua
+    request hanya melakukan sampling top_n.
+    Nilai yang disimpan (idx, weights) read-only dan aman dibagi antar thread.
+    """
+
+    def __init__(self, catalog, maxsize=128):
+        self.catalog = catalog
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, kalori_target):
+        key = float(bin_kalori(kalori_target))
+        with self._lock:
+            pool = self._data.get(key)
+            if pool is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return pool
+            self.misses += 1
+
+        # Scoring di luar lock; kalau dua thread miss bersamaan hasilnya identik
+        idx, weights = rank_candidates(self.catalog, key)
+        idx.setflags(write=False)
+        weights.setflags(write=False)
+        with self._lock:
+            self._data[key] = (idx, weights)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return idx, weights
+
+    def warm(self):
+        """Hitung pool untuk semua bin di WARM_KCAL_RANGE + target AKG ± status (dipanggil saat load)."""
+        lo, hi = WARM_KCAL_RANGE
+        targets = set(range(lo, hi + 1, KCAL_BIN))
+        targets.update(kalori_target_for(akg, s) for akg in _AKG_RECORDS for s in STATUS_GIZI)
+        for kalori_target in sorted(targets):
+            self.get(kalori_target)
+        # Warm-up bukan traffic sungguhan — jangan ikut dihitung
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+def draw_candidates(catalog, idx, weights, top_n, rng=None):
+    """Sampling berbobot tanpa pengembalian dari pool kandidat → DataFrame output."""
+    rng = np.random.default_rng() if rng is None else rng
+    n = min(top_n, idx.size)
+    if n == 0:
+        return catalog.rows(idx[:0])
+    picked = rng.choice(idx, size=n, replace=False, p=weights / weights.sum())
+    return catalog.rows(picked)
+
+
+# ==============================================================
+# Fungsi utama untuk memberikan rekomendasi makanan berbasis demografi
+# ==============================================================
+
+def recommend_menu_demographic(catalog, status_gizi, gender, age, activity, top_n=10, rng=None, profile=None):
+    """
+    catalog boleh berupa NutrientCatalog (jalur cepat, dari resources) atau
+    nutri_df biasa (akan dikompilasi dulu — lambat, untuk pemakaian ad-hoc).
+    profile (nutrition_profile.NutritionProfile): target kalori = profile.kalori_target,
+    sama dengan yang tampil di UI/PDF (ranking memakai bin-nya, ±KCAL_BIN/2). Tanpa
+    profile (tinggi/berat tidak diketahui) target = AKG ± penyesuaian status gizi.
+    Mengembalikan kolom: Menu, image, kcal, protein, fat, carbs, fibre.
+    """
+    if not isinstance(catalog, NutrientCatalog):
+        catalog = NutrientCatalog(catalog)
+
+    # 1. Ambil nilai AKG user dari tabel berdasarkan gender dan umur
+    akg = get_user_akg(gender, age) if profile is None else profile.akg
+    if akg is None:
+        return pd.DataFrame(columns=OUTPUT_COLS)
+    kalori_target = kalori_target_for(akg, status_gizi) if profile is None else profile.kalori_target
+
+    # 2–5. Target makro (IOM 2005, tengah) + scoring + pool 100 kandidat terbaik
+    #      → sudah di-cache per bin target; hanya dihitung ulang saat miss
+    idx, weights = catalog.pools.get(kalori_target)
+
+    # 6. Ambil top_n menu secara acak dari kandidat terbaik, berbasis skor sebagai bobot
+    return draw_candidates(catalog, idx, weights, top_n, rng=rng)
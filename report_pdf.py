@@ -0,0 +1,361 @@
+# report_pdf.py
+"""
+Laporan PDF EduNutri (ReportLab, opsional).
+
+Gambar menu di tabel rekomendasi tampil 45 pt, jadi yang di-embed adalah JPEG
+90×90 px hasil downscale. Byte JPEG tersebut — termasuk hasil verifikasi gambar
+rusak — di-cache in-memory (LRU) per (path, mtime), sehingga laporan berikutnya
+tidak membuka/memverifikasi ulang file yang sama.
+
+PDF tidak lagi dibangun di setiap submit: get_pdf_bytes() membangun saat user
+menekan tombol unduh (atau memakai hasil prefetch_pdf() dari worker background),
+dan hasilnya di-cache per (input, metrik, daftar gambar) dengan batas total byte.
+"""
+import datetime
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from PIL import Image as PILImage, ImageOps
+
+import telemetry
+from image_manifest import get_image_manifest
+from thumbnails import SIZE_PDF, get_thumbnail_index, thumbnail_path
+
+# ==== Optional PDF engine (ReportLab) ====
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle, Spacer, Image as RLImage
+    from reportlab.lib.styles import getSampleStyleSheet
+    REPORTLAB_AVAILABLE = True
+except Exception:
+    REPORTLAB_AVAILABLE = False
+
+
+# Ukuran piksel gambar yang di-embed (2× dari 45 pt agar tetap tajam saat dicetak)
+PDF_IMAGE_PX = 90
+PDF_IMAGE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=PDF_IMAGE_CACHE_SIZE)
+def _downscaled_jpeg(path: str, version):
+    """JPEG kecil untuk (path, versi isi); None jika gambar tidak bisa didecode (hasil verifikasi ikut di-cache)."""
+    try:
+        with PILImage.open(path) as im:
+            im = ImageOps.exif_transpose(im)
+            if im.mode == 'P':
+                im = im.convert('RGBA')
+            im = ImageOps.fit(im.convert('RGB'), (PDF_IMAGE_PX, PDF_IMAGE_PX), PILImage.LANCZOS)
+            buf = io.BytesIO()
+            im.save(buf, format='JPEG', quality=80, optimize=True)
+            return buf.getvalue()
+    except Exception:
+        return None
+
+
+# JPEG yang sudah disiapkan proses lain (bulk_pdf.py: proses induk → worker);
+# dicek sebelum cache LRU sehingga worker tidak men-decode gambar yang sama lagi
+_preloaded_jpeg = {}
+
+
+def preload_pdf_images(jpegs):
+    """Pasang {(path, versi): byte JPEG | None} hasil pdf_image_bytes di proses lain."""
+    _preloaded_jpeg.update(jpegs)
+
+
+def pdf_image_bytes(path: str, version=None):
+    """
+    Byte JPEG siap-embed untuk `path` (None jika rusak). `version` = hash isi dari
+    image_manifest; tanpa itu mtime file dipakai sebagai key (satu os.stat).
+    """
+    if version is None:
+        version = os.stat(path).st_mtime_ns
+    key = (path, version)
+    if key in _preloaded_jpeg:
+        return _preloaded_jpeg[key]
+    return _downscaled_jpeg(path, version)
+
+
+def pdf_image_key(image: str, image_root: str = "nutrients/images"):
+    """(path, versi) yang dipakai pdf_laporan_lengkap untuk satu file gambar katalog; None jika tidak di-embed."""
+    entry = get_image_manifest().get(image)
+    if entry is None or not entry['ok']:
+        return None
+    return thumbnail_path(image, SIZE_PDF, get_thumbnail_index(), image_root), entry['sha1']
+
+
+def pdf_inputs(profile):
+    """
+    (user_inputs, metrics) untuk pdf_laporan_lengkap dari nutrition_profile.NutritionProfile.
+    target_kalori = profile.kalori_target (sama dengan target scoring menu dan UI);
+    makro = titik tengah + rentang.
+    """
+    energi = profile.energi
+    user_inputs = {"usia": profile.age, "jk": profile.gender, "tb": profile.height, "bb": profile.weight,
+                   "pal": profile.activity}
+    metrics = {
+        "bmi": profile.bmi, "kategori": profile.status, "bmr": energi.bmr_msj, "tee": energi.tee,
+        "target_kalori": profile.kalori_target,
+        # single (fallback)
+        "carb_g": (energi.karbo_min + energi.karbo_max) / 2,
+        "protein_g": (energi.protein_min + energi.protein_max) / 2,
+        "fat_g": (energi.lemak_min + energi.lemak_max) / 2,
+        "fiber_g": (energi.serat_min + energi.serat_max) / 2,
+        # range (agar match dengan UI)
+        "carb_min": energi.karbo_min, "carb_max": energi.karbo_max,
+        "protein_min": energi.protein_min, "protein_max": energi.protein_max,
+        "fat_min": energi.lemak_min, "fat_max": energi.lemak_max,
+        "fiber_min": energi.serat_min, "fiber_max": energi.serat_max,
+    }
+    return user_inputs, metrics
+
+
+# ---------------------------------------------
+# PDF Helper: Laporan Lengkap (rata kiri + range-aware + error handling gambar)
+# ---------------------------------------------
+def _image_cell(image, image_root, thumbs, manifest, styles):
+    """Sel gambar tabel rekomendasi: JPEG kecil dari cache, atau teks peringatan."""
+    # Thumbnail 90 px cukup untuk sel 45 pt; fallback ke file asli
+    img_path = thumbnail_path(image, SIZE_PDF, thumbs, image_root)
+    entry = manifest.get(image)
+    if entry is not None:
+        # Status & hash sudah ada di manifest → tanpa akses file untuk gambar yang sudah di-cache
+        jpeg = pdf_image_bytes(img_path, entry['sha1']) if entry['ok'] else None
+        if jpeg is not None:
+            return RLImage(io.BytesIO(jpeg), width=45, height=45)
+        if entry['exists']:
+            return Paragraph("⚠ image error", styles["BodyText"])
+    elif os.path.exists(img_path):
+        # Gambar di luar manifest (mis. DataFrame dari luar katalog)
+        jpeg = pdf_image_bytes(img_path)
+        if jpeg is not None:
+            return RLImage(io.BytesIO(jpeg), width=45, height=45)
+        return Paragraph("⚠ image error", styles["BodyText"])
+    return Paragraph("⚠ not found", styles["BodyText"])
+
+
+def pdf_laporan_lengkap(user_inputs: dict, metrics: dict, df, image_root: str = "nutrients/images"):
+    """
+    - Input & Hasil → tabel 2 kolom, rata kiri, tanpa border
+    - Makro (target) → rata kiri, tanpa border; tampil "min–max" jika tersedia, else single value
+    - Tabel rekomendasi → dengan thumbnail, aman untuk gambar hilang/korup
+    metrics boleh berisi:
+    - single: carb_g, protein_g, fat_g, fiber_g
+    - range : carb_min, carb_max, protein_min, protein_max, fat_min, fat_max, fiber_min, fiber_max
+    Gambar di-embed sebagai JPEG kecil dari cache (pdf_image_bytes), lihat _image_cell.
+    """
+    if not REPORTLAB_AVAILABLE:
+        return None
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=A4,
+        leftMargin=36, rightMargin=36, topMargin=36, bottomMargin=36
+    )
+    styles = getSampleStyleSheet()
+    story = []
+
+    # ===== Header
+    story.append(Paragraph("Rekomendasi Menu – EduNutri", styles["Heading1"]))
+    story.append(Paragraph(datetime.datetime.now().strftime("%Y-%m-%d %H:%M"), styles["Normal"]))
+    story.append(Spacer(1, 12))
+
+    # Util: K/V table rata kiri, tanpa border
+    def kv_table(rows, col0_width=130):
+        t = Table(rows, colWidths=[col0_width, None], hAlign='LEFT')  # <- left align flowable
+        t.setStyle(TableStyle([
+            ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+            ('FONTSIZE', (0,0), (-1,-1), 10),
+            ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
+            ('ALIGN', (0,0), (-1,-1), 'LEFT'),  # cell content left
+            ('LEFTPADDING', (0,0), (-1,-1), 0),
+            ('RIGHTPADDING', (0,0), (-1,-1), 0),
+            ('TOPPADDING', (0,0), (-1,-1), 2),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 2),
+        ]))
+        return t
+
+    # Util: format rentang jika ada; jika tidak, fallback ke single value
+    def fmt_range(minv, maxv, single=None):
+        def is_num(x): return isinstance(x, (int, float)) and not (x is None)
+        if is_num(minv) and is_num(maxv) and (minv > 0 or maxv > 0):
+            return f"{float(minv):.0f} – {float(maxv):.0f}"
+        if is_num(single):
+            return f"{float(single):.0f}"
+        return "-"
+
+    # ===== Input Pengguna
+    story.append(Paragraph("Input Pengguna", styles["Heading2"]))
+    story.append(kv_table([
+        ["Usia",          f"{user_inputs.get('usia','-')} th"],
+        ["Jenis Kelamin", f"{user_inputs.get('jk','-')}"],
+        ["Tinggi",        f"{user_inputs.get('tb','-')} m"],
+        ["Berat",         f"{user_inputs.get('bb','-')} kg"],
+        ["Aktivitas",     f"{user_inputs.get('pal','-')}"],
+    ]))
+    story.append(Spacer(1, 10))
+
+    # ===== Hasil Perhitungan
+    m = metrics
+    story.append(Paragraph("Hasil Perhitungan", styles["Heading2"]))
+    story.append(kv_table([
+        ["BMI",           f"{m.get('bmi',0):.1f} ({m.get('kategori','-')})"],
+        ["BMR (MSJ)",     f"{m.get('bmr',0):.0f} kcal"],
+        ["TEE",           f"{m.get('tee',0):.0f} kcal"],
+        ["Target Kalori", f"{m.get('target_kalori',0):.0f} kcal/hari"],
+    ]))
+
+    # ===== Makro (target) – rata kiri, tanpa border; range-aware
+    story.append(Spacer(1, 4))
+    story.append(Paragraph("Makro (target)", styles["Heading2"]))
+    story.append(kv_table([
+        ["Karbo (g)",   fmt_range(m.get('carb_min'),   m.get('carb_max'),   m.get('carb_g'))],
+        ["Protein (g)", fmt_range(m.get('protein_min'),m.get('protein_max'),m.get('protein_g'))],
+        ["Lemak (g)",   fmt_range(m.get('fat_min'),    m.get('fat_max'),    m.get('fat_g'))],
+        ["Serat (g)",   fmt_range(m.get('fiber_min'),  m.get('fiber_max'),  m.get('fiber_g'))],
+    ]))
+    story.append(Spacer(1, 12))
+
+    # ===== Tabel Rekomendasi (gambar aman)
+    story.append(Paragraph("Tabel Rekomendasi Menu", styles["Heading2"]))
+    story.append(Spacer(1, 6))
+
+    headers = ["Gambar", "Menu", "kcal", "Protein", "Fat", "Carbs", "Fibre"]
+    data = [headers]
+
+    thumbs = get_thumbnail_index()
+    manifest = get_image_manifest()
+    for _, row in df.iterrows():
+        img_cell = _image_cell(str(row.get("image","")), image_root, thumbs, manifest, styles)
+
+        data.append([
+            img_cell,
+            str(row.get("Menu","-")),
+            f"{float(row.get('kcal',0)):.0f}",
+            f"{float(row.get('protein',0)):.1f}",
+            f"{float(row.get('fat',0)):.1f}",
+            f"{float(row.get('carbs',0)):.1f}",
+            f"{float(row.get('fibre',0)):.1f}",
+        ])
+
+    tbl = Table(data, repeatRows=1, colWidths=[55, None, 45, 50, 45, 50, 50], hAlign='LEFT')
+    tbl.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('ALIGN', (2,1), (-1,-1), 'CENTER'),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.whitesmoke, colors.white]),
+        ('TOPPADDING', (0,0), (-1,-1), 4),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+    ]))
+    story.append(tbl)
+
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+
+# ---------------------------------------------
+# Cache PDF (lazy / background) dengan batas total byte
+# ---------------------------------------------
+PDF_CACHE_MAX_BYTES = int(float(os.environ.get('EDUNUTRI_PDF_CACHE_MB', 64)) * 1024 * 1024)
+PDF_PREFETCH = os.environ.get('EDUNUTRI_PDF_PREFETCH', '1') != '0'
+
+
+class PdfCache:
+    """LRU thread-safe untuk byte PDF; entri terlama dibuang saat total byte > max_bytes."""
+
+    def __init__(self, max_bytes=PDF_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            self._data[key] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._data), 'bytes': self.total_bytes, 'max_bytes': self.max_bytes}
+
+
+_pdf_cache = PdfCache()
+_pdf_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='edunutri-pdf')
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def pdf_cache_key(user_inputs: dict, metrics: dict, df) -> str:
+    """Key dari input user, metrik (dibulatkan) dan daftar gambar rekomendasi."""
+    payload = {
+        'user': user_inputs,
+        'metrics': {k: round(float(v), 3) if isinstance(v, (int, float)) else v for k, v in metrics.items()},
+        'images': [str(x) for x in df['image']],
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()
+
+
+def _build_and_store(key, user_inputs, metrics, df):
+    try:
+        with telemetry.stage('pdf_build'):
+            buf = pdf_laporan_lengkap(user_inputs, metrics, df)
+        data = buf.getvalue() if buf is not None else None
+        if data is not None:
+            _pdf_cache.put(key, data)
+        return data
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _submit(key, user_inputs, metrics, df):
+    with _inflight_lock:
+        fut = _inflight.get(key)
+        if fut is None:
+            fut = _pdf_executor.submit(_build_and_store, key, user_inputs, metrics, df.copy())
+            _inflight[key] = fut
+        return fut
+
+
+def prefetch_pdf(user_inputs: dict, metrics: dict, df):
+    """Jadwalkan build PDF di background (tanpa menunggu). Return key cache."""
+    key = pdf_cache_key(user_inputs, metrics, df)
+    if REPORTLAB_AVAILABLE and PDF_PREFETCH and _pdf_cache.get(key) is None:
+        _submit(key, user_inputs, metrics, df)
+    return key
+
+
+def get_pdf_bytes(user_inputs: dict, metrics: dict, df):
+    """Byte PDF dari cache; jika sedang/ belum dibangun, tunggu hasil build. None jika ReportLab tidak ada."""
+    if not REPORTLAB_AVAILABLE:
+        return None
+    key = pdf_cache_key(user_inputs, metrics, df)
+    data = _pdf_cache.get(key)
+    if data is not None:
+        return data
+    return _submit(key, user_inputs, metrics, df).result()
@@ -0,0 +1,298 @@
+# resources.py
+"""
+Lapisan resource EduNutri.
+
+Dataset (bmi_dataset.csv, dataset_nutrients.csv), scaler dan model Random Forest
+dimuat SEKALI per proses server lalu dibagi ke semua sesi Streamlit (dan ke
+CLI/skrip lain yang mengimpor modul ini). Cache otomatis dibuang bila hash isi
+file CSV atau Models/*.pkl berubah.
+"""
+import glob
+import hashlib
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from catalog_artifact import load_catalog
+from forest_artifact import FLAT_FOREST_ENABLED, FLAT_FOREST_MAX_ROWS, FOREST_META, load_forest
+from image_manifest import build_image_manifest
+from recommender import NutrientCatalog
+
+
+# ---------------------------------------------
+# Lokasi file sumber
+# ---------------------------------------------
+BMI_CSV = 'bmi_dataset.csv'
+NUTRI_CSV = 'dataset_nutrients.csv'
+MODEL_DIR = 'Models'
+SCALER_PKL = os.path.join(MODEL_DIR, 'scaler.pkl')
+MODEL_PKL = os.path.join(MODEL_DIR, 'random_forest_model.pkl')
+LABEL_ENCODER_PKL = os.path.join(MODEL_DIR, 'label_encoder.pkl')
+
+# Fitur input model (urutan harus sama dengan saat training)
+FEATURES = ['Gender', 'Age', 'HeightM', 'WeightKg']
+
+
+# Kelas LabelEncoder gender saat training (urutan alfabet): Female → 0, Male → 1.
+# train.py menolak data yang encoder-nya berbeda dan mencatat kelas ini di manifest.
+GENDER_CLASSES = ('Female', 'Male')
+
+
+def encode_gender(gender):
+    """
+    Encoding gender untuk fitur model — sama dengan LabelEncoder di train.py /
+    notebook ("Male" → 1, "Female" → 0), dipakai form, API, batch dan CLI.
+    Menerima skalar maupun array; label lain → ValueError.
+    """
+    gender = np.asarray(gender, dtype=object)
+    known = np.isin(gender, GENDER_CLASSES)
+    if not known.all():
+        raise ValueError(f"gender harus salah satu dari {list(GENDER_CLASSES)}: {sorted(set(gender[~known].ravel()))}")
+    return np.where(gender == GENDER_CLASSES[1], 1, 0)
+
+
+# Klasifikasi BMI → status gizi
+def klasifikasi_bmi(bmi):
+    if bmi < 18.5:   return 'Underweight'
+    if bmi < 25.0:   return 'Normal'
+    if bmi < 30.0:   return 'Overweight'
+    return 'Obesity'
+
+
+def extract_menu_name(filename):
+    """
+    Ekstrak nama menu bersih dari filename:
+    1) Buang ekstensi (.jpg/.jpeg/.png)
+    2) Hapus segmen terakhir (setelah hyphen terakhir) — biasanya hash atau angka acak
+    3) Hapus semua angka yang tersisa
+    4) Ganti '-' dan '_' menjadi spasi; rapikan spasi ganda
+    """
+    # Abaikan file generik
+    if filename.startswith("recipe-image-legacy-id"):
+        return None
+
+    # 1) Hapus ekstensi gambar
+    name = re.sub(r'\.(jpe?g|png)$', '', filename, flags=re.IGNORECASE)
+
+    # 2) Hapus segmen terakhir (setelah hyphen terakhir)
+    #    Contoh: "cod-cucumber-avocado-mango-salsa-salad-517846e" -> "cod-cucumber-avocado-mango-salsa-salad"
+    name = re.sub(r'-[^-]+$', '', name)
+
+    # 3) Hapus semua digit yang tersisa di seluruh string
+    name = re.sub(r'\d+', '', name)
+
+    # 4) Ganti '-' dan '_' menjadi spasi
+    name = name.replace('-', ' ').replace('_', ' ')
+
+    # Rapikan spasi ganda dan trim
+    name = re.sub(r'\s+', ' ', name).strip()
+
+    return name
+
+
+@dataclass(frozen=True)
+class Resources:
+    """Bundle read-only yang dibagi lintas sesi. Jangan dimodifikasi in-place."""
+    bmi_df: pd.DataFrame
+    nutri_df: pd.DataFrame
+    catalog: NutrientCatalog
+    scaler: object
+    best_rf: object       # RandomForestClassifier (FlatForest hanya bila pickle tidak ada)
+    flat_forest: object   # FlatForest atau None (lihat forest_artifact.py)
+    status_grid: object   # StatusGrid atau None (lihat status_grid.py)
+    image_manifest: dict  # {image: entri} (lihat image_manifest.py)
+    fingerprint: str
+    load_seconds: float
+
+    def model_for(self, n_rows):
+        """
+        Model untuk memprediksi `n_rows` baris sekaligus: hutan datar untuk request
+        online kecil (overhead per panggilan sklearn mendominasi), best_rf sklearn
+        untuk batch besar (loop C per pohon lebih cepat). Label keduanya identik.
+        """
+        if self.flat_forest is not None and n_rows <= FLAT_FOREST_MAX_ROWS:
+            return self.flat_forest
+        return self.best_rf
+
+
+# ---------------------------------------------
+# Fingerprint file (stat murah → hash hanya bila stat berubah)
+# ---------------------------------------------
+def watched_files():
+    """File yang isinya menentukan validitas cache: kedua CSV + semua Models/*.pkl + metadata hutan datar."""
+    return [BMI_CSV, NUTRI_CSV] + sorted(glob.glob(os.path.join(MODEL_DIR, '*.pkl'))) + [FOREST_META]
+
+
+def _stat_signature(paths):
+    sig = []
+    for p in paths:
+        try:
+            st_ = os.stat(p)
+            sig.append((p, st_.st_size, st_.st_mtime_ns))
+        except FileNotFoundError:
+            sig.append((p, None, None))
+    return tuple(sig)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint_files(paths):
+    """Hash gabungan isi semua file; file yang hilang ikut tercatat sebagai 'missing'."""
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(p.encode())
+        h.update(file_sha256(p).encode() if os.path.exists(p) else b'missing')
+    return h.hexdigest()
+
+
+# ---------------------------------------------
+# Loader (tanpa cache) — dipakai oleh get_resources() dan benchmark cold start
+# ---------------------------------------------
+def load_bmi_df(path=BMI_CSV):
+    bmi_df = pd.read_csv(path)
+
+    # Rename kolom bmi dataset agar seragam
+    bmi_df.rename(columns={
+        'Weight (kg)': 'WeightKg',
+        'Height (m)': 'HeightM'
+    }, inplace=True)
+
+    # Hitung BMI jika belum ada
+    if 'BMI' not in bmi_df.columns:
+        bmi_df['BMI'] = bmi_df['WeightKg'] / (bmi_df['HeightM'] ** 2)
+
+    bmi_df['WeightStatus'] = bmi_df['BMI'].apply(klasifikasi_bmi)
+    return bmi_df
+
+
+def load_nutri_df(path=NUTRI_CSV):
+    """
+    Pakai artefak terkompilasi (catalog_artifact.py build) bila dibangun dari isi
+    CSV yang sama; selain itu parsing CSV langsung.
+    """
+    nutri_df = load_catalog(file_sha256(path)) if os.path.exists(path) else None
+    if nutri_df is not None:
+        return nutri_df
+    return load_nutri_df_csv(path)
+
+
+def load_nutri_df_csv(path=NUTRI_CSV):
+    nutri_df = pd.read_csv(path)
+
+    # Siapkan kolom Menu di nutri_df
+    nutri_df['Menu'] = nutri_df['image'].apply(extract_menu_name)
+    nutri_df.dropna(subset=['Menu'], inplace=True)
+    nutri_df.drop_duplicates(subset=['Menu'], inplace=True)
+    return nutri_df
+
+
+def load_resources(fingerprint=None):
+    t0 = time.perf_counter()
+    bmi_df = load_bmi_df()
+    nutri_df = load_nutri_df()
+
+    # Standardisasi
+    scaler = joblib.load(SCALER_PKL)
+
+    # Random Forest hasil tuning — dibangun dengan `python train.py build --overwrite` (menulis
+    # Models/train_manifest.json; pickle & manifest tidak ikut repo).
+    # Hutan datar via mmap (forest_artifact.py, bila diekspor dari pickle yang sama) untuk
+    # prediksi online; pickle sklearn tetap dimuat untuk batch besar (Resources.model_for)
+    flat_forest = load_forest() if FLAT_FOREST_ENABLED else None
+    if flat_forest is not None and not os.path.exists(MODEL_PKL):
+        best_rf = flat_forest
+    else:
+        best_rf = joblib.load(MODEL_PKL)
+
+    # Grid status gizi (opsional) — hanya dipakai jika dibangun dari scaler/model yang sama
+    from status_grid import load_status_grid  # import lokal: status_grid juga mengimpor modul ini
+    status_grid = load_status_grid()
+
+    # Manifest gambar (inkremental) — menu dengan gambar hilang/rusak tidak masuk katalog
+    image_manifest = build_image_manifest(nutri_df['image'].dropna())
+
+    # Katalog terkompilasi + pool kandidat semua profil dihitung di muka
+    catalog = NutrientCatalog(nutri_df, image_manifest)
+    catalog.pools.warm()
+
+    if fingerprint is None:
+        fingerprint = fingerprint_files(watched_files())
+    return Resources(
+        bmi_df=bmi_df,
+        nutri_df=nutri_df,
+        catalog=catalog,
+        scaler=scaler,
+        best_rf=best_rf,
+        flat_forest=flat_forest,
+        status_grid=status_grid,
+        image_manifest=image_manifest,
+        fingerprint=fingerprint,
+        load_seconds=time.perf_counter() - t0,
+    )
+
+
+# ---------------------------------------------
+# Cache level proses (dibagi semua sesi/thread)
+# ---------------------------------------------
+_lock = threading.Lock()
+_state = {'stat': None, 'fingerprint': None, 'resources': None}
+_warmup_thread = None
+
+
+def get_resources():
+    """
+    Kembalikan Resources yang sudah dimuat untuk proses ini.
+    Setiap panggilan hanya melakukan os.stat pada file sumber; hash isi file
+    dihitung ulang hanya jika ukuran/mtime berubah, dan data dimuat ulang hanya
+    jika hash benar-benar berbeda.
+    """
+    paths = watched_files()
+    stat = _stat_signature(paths)
+    res = _state['resources']
+    if res is not None and stat == _state['stat']:
+        return res
+
+    with _lock:
+        # Cek ulang: thread lain mungkin sudah memuat saat kita menunggu lock
+        if _state['resources'] is not None and stat == _state['stat']:
+            return _state['resources']
+
+        fingerprint = fingerprint_files(paths)
+        if _state['resources'] is None or fingerprint != _state['fingerprint']:
+            _state['resources'] = load_resources(fingerprint)
+            _state['fingerprint'] = fingerprint
+        _state['stat'] = stat
+        return _state['resources']
+
+
+def clear_resources():
+    """Paksa muat ulang pada panggilan get_resources() berikutnya."""
+    with _lock:
+        _state.update(stat=None, fingerprint=None, resources=None)
+
+
+def warmup():
+    """
+    Mulai memuat resource di background thread (idempoten).
+    Streamlit tidak punya hook "server start", jadi warm-up dipicu saat app.py
+    pertama kali dieksekusi di proses ini; halaman yang tidak butuh model
+    (Home, Information) tetap tampil tanpa menunggu.
+    """
+    global _warmup_thread
+    if _warmup_thread is None or not _warmup_thread.is_alive():
+        if _state['resources'] is None:
+            _warmup_thread = threading.Thread(target=get_resources, name='edunutri-warmup', daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
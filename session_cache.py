@@ -0,0 +1,197 @@
+# session_cache.py
+"""
+Cache hasil rekomendasi per sesi Streamlit.
+
+Setiap interaksi (tombol unduh, tombol sidebar, "Show more") me-rerun seluruh
+script. Tanpa cache, hasil hilang begitu `submitted` bernilai False, atau dihitung
+ulang (prediksi, scoring, sampling acak, PDF) dan menu yang tampil berubah.
+ResultCache menyimpan hasil per kombinasi input form di st.session_state:
+
+    {key form: {'status', 'profil', 'menus', 'pdf_key'}}
+
+- LRU dengan batas jumlah entri dan total byte (perkiraan dari DataFrame menu dan
+  array _PlanSpace milik WeeklyPlanner)
+- entri yang tidak disentuh > EDUNUTRI_SESSION_IDLE_S dibuang; sweep berjalan
+  untuk SEMUA sesi di proses setiap kali ada sesi yang mengakses cache, jadi tab
+  yang ditinggal terbuka ikut dibersihkan
+- drop(key, 'menus') = "reroll": status/profil gizi tetap, menu diundi ulang
+
+Halaman Kohort memakai cache terpisah (get_session_cache(..., name='cohort_cache'))
+dengan batas sendiri: satu hasil kohort (kolom energi per baris) jauh lebih besar
+dari hasil rekomendasi satu user.
+
+Konfigurasi via environment:
+    EDUNUTRI_SESSION_CACHE_ENTRIES  entri per sesi (default 4)
+    EDUNUTRI_SESSION_CACHE_MB       batas byte per sesi (default 8)
+    EDUNUTRI_COHORT_CACHE_ENTRIES   entri kohort per sesi (default 2)
+    EDUNUTRI_COHORT_CACHE_MB        batas byte kohort per sesi (default 256)
+    EDUNUTRI_SESSION_IDLE_S         umur idle maksimum entri (default 1800)
+"""
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+SESSION_CACHE_ENTRIES = int(os.environ.get('EDUNUTRI_SESSION_CACHE_ENTRIES', 4))
+SESSION_CACHE_MAX_BYTES = int(float(os.environ.get('EDUNUTRI_SESSION_CACHE_MB', 8)) * 1024 * 1024)
+SESSION_IDLE_S = float(os.environ.get('EDUNUTRI_SESSION_IDLE_S', 1800))
+COHORT_CACHE_ENTRIES = int(os.environ.get('EDUNUTRI_COHORT_CACHE_ENTRIES', 2))
+COHORT_CACHE_MAX_BYTES = int(float(os.environ.get('EDUNUTRI_COHORT_CACHE_MB', 256)) * 1024 * 1024)
+
+# Batas per nama cache di session_state; nama lain memakai batas hasil rekomendasi
+CACHE_LIMITS = {'cohort_cache': (COHORT_CACHE_ENTRIES, COHORT_CACHE_MAX_BYTES)}
+
+# Sweep idle lintas sesi paling sering sekali per interval ini
+_SWEEP_INTERVAL_S = 30
+
+
+def _frames(obj):
+    """DataFrame milik satu hasil: DataFrame langsung, MealPlan.items, WeeklyPlanner.plans[*].items."""
+    if isinstance(obj, pd.DataFrame):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _frames(v)
+    elif isinstance(getattr(obj, 'items', None), pd.DataFrame):
+        yield obj.items
+    elif isinstance(getattr(obj, 'plans', None), list):
+        for plan in obj.plans:
+            if plan is not None:
+                yield from _frames(plan)
+
+
+def _arrays(obj):
+    """Array milik WeeklyPlanner di hasil: matriks katalog terurut + batas suffix _PlanSpace."""
+    if isinstance(obj, dict):
+        for v in obj.values():
+            yield from _arrays(v)
+    elif hasattr(obj, 'space') and isinstance(getattr(obj, 'plans', None), list):
+        yield from (v for v in vars(obj.space).values() if isinstance(v, np.ndarray))
+
+
+def result_nbytes(result):
+    """
+    Perkiraan byte satu hasil: DataFrame menu + array planner (katalog bersama
+    tidak dihitung).
+    """
+    frames = sum(df.memory_usage(deep=True).sum() for df in _frames(result))
+    return int(frames + sum(a.nbytes for a in _arrays(result))) + 1024
+
+
+class ResultCache:
+    """LRU thread-safe {key form: dict hasil} dengan batas entri, byte, dan umur idle."""
+
+    def __init__(self, max_entries=SESSION_CACHE_ENTRIES, max_bytes=SESSION_CACHE_MAX_BYTES,
+                 idle_s=SESSION_IDLE_S):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.idle_s = idle_s
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> [hasil, byte, waktu akses terakhir]
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and time.monotonic() - item[2] <= self.idle_s
+
+    def get(self, key):
+        """Hasil untuk `key` (dict yang sama dengan yang di-put) atau None."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            item[2] = now
+            self._data.move_to_end(key)
+            return item[0]
+
+    def put(self, key, result):
+        nbytes = result_nbytes(result)
+        with self._lock:
+            self._pop(key)
+            if nbytes > self.max_bytes:
+                return
+            self._data[key] = [result, nbytes, time.monotonic()]
+            self.total_bytes += nbytes
+            while len(self._data) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._pop(next(iter(self._data)))
+
+    def drop(self, key, *fields):
+        """Buang entri `key`; dengan `fields` hanya bagian itu (mis. 'menus' untuk reroll)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return
+            if not fields:
+                self._pop(key)
+                return
+            for field in fields:
+                item[0].pop(field, None)
+            self.total_bytes -= item[1]
+            item[1] = result_nbytes(item[0])
+            self.total_bytes += item[1]
+
+    def evict_idle(self, now=None):
+        with self._lock:
+            self._evict_idle(time.monotonic() if now is None else now)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._data), 'bytes': self.total_bytes, 'max_entries': self.max_entries,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'misses': self.misses}
+
+    # -- dipanggil dengan _lock terkunci --
+    def _pop(self, key):
+        item = self._data.pop(key, None)
+        if item is not None:
+            self.total_bytes -= item[1]
+
+    def _evict_idle(self, now):
+        while self._data:
+            key, item = next(iter(self._data.items()))
+            if now - item[2] <= self.idle_s:
+                break
+            self._pop(key)
+
+
+# Semua cache sesi yang masih hidup di proses ini (sesi yang ditutup ikut hilang dari WeakSet)
+_registry = weakref.WeakSet()
+_registry_lock = threading.Lock()
+_last_sweep = [0.0]
+
+
+def sweep_idle(now=None):
+    """Buang entri idle di semua sesi. Return jumlah cache yang diperiksa."""
+    now = time.monotonic() if now is None else now
+    with _registry_lock:
+        caches = list(_registry)
+        _last_sweep[0] = now
+    for cache in caches:
+        cache.evict_idle(now)
+    return len(caches)
+
+
+def get_session_cache(session_state, name='result_cache'):
+    """
+    ResultCache milik sesi ini (dibuat saat pertama dipakai, batas dari CACHE_LIMITS)
+    + sweep idle berkala lintas sesi.
+    """
+    cache = session_state.get(name)
+    if cache is None:
+        max_entries, max_bytes = CACHE_LIMITS.get(name, (SESSION_CACHE_ENTRIES, SESSION_CACHE_MAX_BYTES))
+        cache = session_state[name] = ResultCache(max_entries, max_bytes)
+        with _registry_lock:
+            _registry.add(cache)
+    if time.monotonic() - _last_sweep[0] > _SWEEP_INTERVAL_S:
+        sweep_idle()
+    return cache
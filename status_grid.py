@@ -0,0 +1,216 @@
+# status_grid.py
+"""
+Grid status gizi yang dihitung di muka untuk domain input form.
+
+Form membatasi input: umur 15–59 th, tinggi 1.50–2.00 m (step 0.01), berat 40–130 kg,
+plus gender. Berat disimpan per 0.1 kg (form memakai bilangan bulat, tapi upload
+kohort/batch bergaya bmi_dataset.csv berisi berat satu desimal). Seluruh kombinasi
+(2 × 45 × 51 × 901 ≈ 4,1 juta titik) dievaluasi sekali dengan scaler + best_rf,
+lalu disimpan sebagai array uint8 (indeks ke best_rf.classes_, ~4 MB) yang dibaca
+via memory-map. Prediksi online/kohort menjadi lookup indeks; jalur Random Forest
+hanya dipakai untuk nilai di luar grid.
+
+    python status_grid.py build     # bangun Models/status_grid.npy + .json
+    python status_grid.py verify    # uji paritas grid vs best_rf di seluruh grid
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from inference import get_predictor
+from resources import MODEL_DIR, MODEL_PKL, SCALER_PKL, encode_gender, fingerprint_files
+
+GRID_NPY = os.path.join(MODEL_DIR, 'status_grid.npy')
+GRID_META = os.path.join(MODEL_DIR, 'status_grid.json')
+GRID_VERSION = 2
+
+# Sumbu grid — harus sama dengan batas number_input di app.py
+GENDER_CODES = (0, 1)
+AGE_RANGE = (15, 59)          # tahun, step 1
+HEIGHT_CM_RANGE = (150, 200)  # cm, step 1 (= 0.01 m)
+WEIGHT_RANGE = (40, 130)      # kg
+WEIGHT_STEPS_PER_KG = 10      # step 0.1 kg
+
+
+def _axis(lo_hi, per_unit=1):
+    lo, hi = lo_hi
+    return np.arange(lo * per_unit, hi * per_unit + 1)
+
+
+def _block(g, age, weight_steps_per_kg=WEIGHT_STEPS_PER_KG):
+    """Titik grid untuk satu (gender, umur): semua tinggi × berat, urutan C."""
+    h, w = np.meshgrid(_axis(HEIGHT_CM_RANGE), _axis(WEIGHT_RANGE, weight_steps_per_kg), indexing='ij')
+    return np.column_stack([np.full(h.size, g), np.full(h.size, age), h.ravel() / 100.0,
+                            w.ravel() / weight_steps_per_kg]).astype(float)
+
+
+def grid_points(weight_steps_per_kg=WEIGHT_STEPS_PER_KG):
+    """
+    Semua titik grid sebagai matriks fitur (Gender, Age, HeightM, WeightKg), urutan C.
+    weight_steps_per_kg=1 → hanya berat bulat (domain form).
+    """
+    return np.vstack([_block(g, a, weight_steps_per_kg) for g in GENDER_CODES for a in _axis(AGE_RANGE)])
+
+
+def _grid_blocks():
+    # Build/verify per blok (gender, umur) agar 4 juta titik tidak dimaterialisasi sekaligus
+    for g in GENDER_CODES:
+        for a in _axis(AGE_RANGE):
+            yield _block(g, a)
+
+
+def model_fingerprint():
+    return fingerprint_files([SCALER_PKL, MODEL_PKL])
+
+
+class StatusGrid:
+    """Lookup read-only di atas array uint8 (memory-mapped)."""
+
+    def __init__(self, codes, classes):
+        self.codes = codes
+        self.classes = np.asarray(classes, dtype=object)
+
+    def _indices(self, g, age, height, weight):
+        g = np.asarray(g)
+        age = np.asarray(age, dtype=float)
+        h_cm = np.asarray(height, dtype=float) * 100.0
+        weight = np.asarray(weight, dtype=float)
+
+        w_step = weight * WEIGHT_STEPS_PER_KG
+
+        ia = np.rint(age) - AGE_RANGE[0]
+        ih = np.rint(h_cm) - HEIGHT_CM_RANGE[0]
+        iw = np.rint(w_step) - WEIGHT_RANGE[0] * WEIGHT_STEPS_PER_KG
+        on_grid = (
+            np.isin(g, GENDER_CODES) &
+            (np.abs(age - np.rint(age)) < 1e-9) &
+            (np.abs(h_cm - np.rint(h_cm)) < 1e-6) &
+            (np.abs(w_step - np.rint(w_step)) < 1e-6) &
+            (ia >= 0) & (ia < self.codes.shape[1]) &
+            (ih >= 0) & (ih < self.codes.shape[2]) &
+            (iw >= 0) & (iw < self.codes.shape[3])
+        )
+        return on_grid, g.astype(np.intp), ia.astype(np.intp), ih.astype(np.intp), iw.astype(np.intp)
+
+    def lookup(self, g, age, height, weight):
+        """Status gizi untuk satu input, atau None jika di luar grid."""
+        on_grid, g, ia, ih, iw = self._indices(g, age, height, weight)
+        if not on_grid:
+            return None
+        return self.classes[self.codes[g, ia, ih, iw]]
+
+    def lookup_many(self, g, age, height, weight):
+        """Versi vektor → (status object array, mask on_grid). Status di luar grid = None."""
+        on_grid, g, ia, ih, iw = self._indices(g, age, height, weight)
+        status = np.full(on_grid.shape, None, dtype=object)
+        status[on_grid] = self.classes[self.codes[g[on_grid], ia[on_grid], ih[on_grid], iw[on_grid]]]
+        return status, on_grid
+
+
+def build_status_grid(scaler, best_rf, path=GRID_NPY, meta_path=GRID_META):
+    """Evaluasi model di seluruh grid lalu simpan array uint8 + metadata."""
+    classes = list(best_rf.classes_)
+    if len(classes) > 255:
+        raise ValueError("Terlalu banyak kelas untuk grid uint8")
+
+    labels = np.concatenate([best_rf.predict(scaler.transform(X)) for X in _grid_blocks()])
+    codes = np.searchsorted(np.asarray(classes, dtype=object), labels).astype(np.uint8)
+    shape = (len(GENDER_CODES), len(_axis(AGE_RANGE)), len(_axis(HEIGHT_CM_RANGE)),
+             len(_axis(WEIGHT_RANGE, WEIGHT_STEPS_PER_KG)))
+    np.save(path, codes.reshape(shape))
+
+    meta = {
+        'version': GRID_VERSION,
+        'classes': [str(c) for c in classes],
+        'axes': {
+            'gender': list(GENDER_CODES),
+            'age': list(AGE_RANGE),
+            'height_cm': list(HEIGHT_CM_RANGE),
+            'weight': list(WEIGHT_RANGE),
+            'weight_steps_per_kg': WEIGHT_STEPS_PER_KG,
+        },
+        'model_fingerprint': model_fingerprint(),
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def load_status_grid(path=GRID_NPY, meta_path=GRID_META, expected_fingerprint=None):
+    """
+    Muat grid via mmap. Return None jika file tidak ada, versinya beda, atau grid
+    dibangun dari scaler/model lain (fingerprint tidak cocok) — pemanggil lalu
+    jatuh ke jalur Random Forest.
+    """
+    if not (os.path.exists(path) and os.path.exists(meta_path)):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get('version') != GRID_VERSION:
+        return None
+    if expected_fingerprint is None:
+        expected_fingerprint = model_fingerprint()
+    if meta.get('model_fingerprint') != expected_fingerprint:
+        return None
+    codes = np.load(path, mmap_mode='r')
+    return StatusGrid(codes, meta['classes'])
+
+
+def predict_status(res, gender, age, height, weight):
+    """
+    Prediksi status gizi satu user: lookup grid bila input ada di grid,
+    selain itu lewat BatchingPredictor bersama (scaler + best_rf, di-batch
+    dengan request dari sesi lain).
+    """
+    g = encode_gender(gender)
+    if res.status_grid is not None:
+        status = res.status_grid.lookup(g, age, height, weight)
+        if status is not None:
+            return status
+    return get_predictor(res).predict([g, age, height, weight])
+
+
+def verify_status_grid(grid, scaler, best_rf):
+    """Paritas penuh: lookup_many() di setiap titik grid vs prediksi best_rf langsung."""
+    total = mismatch = 0
+    for X in _grid_blocks():
+        expected = best_rf.predict(scaler.transform(X))
+        got, on_grid = grid.lookup_many(X[:, 0], X[:, 1], X[:, 2], X[:, 3])
+        total += len(X)
+        mismatch += int((~on_grid).sum() + (got[on_grid] != expected[on_grid]).sum())
+    return total, mismatch
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('command', choices=['build', 'verify'])
+    args = ap.parse_args(argv)
+
+    import joblib
+    scaler = joblib.load(SCALER_PKL)
+    best_rf = joblib.load(MODEL_PKL)
+
+    if args.command == 'build':
+        t0 = time.perf_counter()
+        meta = build_status_grid(scaler, best_rf)
+        size = os.path.getsize(GRID_NPY)
+        print(f"grid {GRID_NPY}: {size / 1024:.0f} KiB, kelas {meta['classes']}, "
+              f"{time.perf_counter() - t0:.1f} s")
+        return 0
+
+    grid = load_status_grid()
+    if grid is None:
+        print("grid tidak ada atau tidak cocok dengan model saat ini — jalankan `build` dulu", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    total, mismatch = verify_status_grid(grid, scaler, best_rf)
+    print(f"paritas grid vs best_rf: {total - mismatch}/{total} cocok ({time.perf_counter() - t0:.1f} s)")
+    return 0 if mismatch == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
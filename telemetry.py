@@ -0,0 +1,160 @@
+# telemetry.py
+"""
+Timer per tahap untuk jalur submit halaman rekomendasi, diagregasi per proses.
+
+Tiap tahap punya histogram kumulatif (bucket tetap, gaya Prometheus) + jendela
+sampel terakhir untuk p50/p95/p99. Tahap yang dipakai app.py / report_pdf.py:
+
+    predict         encoding input + prediksi status gizi
+    energy          BMR/TEE, rentang kalori & makro, estimasi perubahan berat
+    recommend       scoring + sampling kandidat (top 10 / rencana harian / mingguan)
+    render_images   grid kartu menu + thumbnail
+    pdf_build       pdf_laporan_lengkap (worker background)
+    total           seluruh submit sampai "Waktu pemrosesan"
+    total_cached    idem, untuk rerun yang digambar dari cache hasil sesi (session_cache.py)
+
+Ekspor:
+- to_prometheus() / to_json() — teks untuk scrape atau panel admin
+- flush() — bila EDUNUTRI_METRICS_DIR di-set, tulis edunutri.prom (format
+  textfile collector node_exporter) + edunutri_metrics.json secara atomik,
+  paling sering sekali per EDUNUTRI_METRICS_FLUSH_S detik.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+# Batas atas bucket (detik)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Jumlah sampel terakhir per tahap untuk kuantil
+WINDOW = 2048
+
+METRICS_DIR = os.environ.get('EDUNUTRI_METRICS_DIR')
+FLUSH_INTERVAL_S = float(os.environ.get('EDUNUTRI_METRICS_FLUSH_S', 10))
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # slot terakhir = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=WINDOW)
+
+    def observe(self, seconds):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        recent = np.fromiter(self.recent, dtype=np.float64, count=len(self.recent))
+        out = {'count': self.count, 'sum_s': self.sum}
+        if len(recent):
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99])
+            out.update({'p50_ms': p50 * 1e3, 'p95_ms': p95 * 1e3, 'p99_ms': p99 * 1e3,
+                        'max_ms': recent.max() * 1e3, 'window': len(recent)})
+        return out
+
+
+class StageMetrics:
+    """Histogram per nama tahap; aman dipakai dari beberapa thread (sesi Streamlit, worker PDF)."""
+
+    def __init__(self):
+        self._hist = {}
+        self._lock = threading.Lock()
+        # Terpisah dari _lock: ekspor memanggil snapshot() yang mengambil _lock
+        self._flush_lock = threading.Lock()
+        self._last_flush = 0.0
+        self.flush_errors = 0
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            hist = self._hist.get(stage)
+            if hist is None:
+                hist = self._hist[stage] = Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0)
+
+    def snapshot(self):
+        """{tahap: {count, sum_s, p50_ms, p95_ms, p99_ms, max_ms, window, buckets}}."""
+        with self._lock:
+            out = {}
+            for name, hist in self._hist.items():
+                out[name] = hist.summary()
+                out[name]['buckets'] = dict(zip([*map(str, BUCKETS), '+Inf'], np.cumsum(hist.counts).tolist()))
+            return out
+
+    def to_json(self):
+        return json.dumps({'generated': time.time(), 'stages': self.snapshot()}, indent=2)
+
+    def to_prometheus(self):
+        name = 'edunutri_stage_seconds'
+        lines = [f'# HELP {name} Latensi per tahap submit halaman rekomendasi.', f'# TYPE {name} histogram']
+        for stage, s in sorted(self.snapshot().items()):
+            for le, n in s['buckets'].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {n}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {s["sum_s"]:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {s["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def flush(self, directory=None, force=False):
+        """
+        Tulis ekspor ke `directory` (default EDUNUTRI_METRICS_DIR). Return True bila menulis.
+        Dipanggil di jalur request: bila thread lain sedang flush, langsung return False;
+        error I/O hanya menambah flush_errors, tidak pernah sampai ke halaman.
+        """
+        directory = directory or METRICS_DIR
+        if not directory or not self._flush_lock.acquire(blocking=False):
+            return False
+        try:
+            now = time.monotonic()
+            if not force and now - self._last_flush < FLUSH_INTERVAL_S:
+                return False
+            self._last_flush = now
+            os.makedirs(directory, exist_ok=True)
+            for fname, text in (('edunutri.prom', self.to_prometheus()), ('edunutri_metrics.json', self.to_json())):
+                # Nama tmp unik per penulis: proses lain (worker uvicorn) bisa menulis ke direktori yang sama
+                with tempfile.NamedTemporaryFile('w', dir=directory, prefix=f'.{fname}.', suffix='.tmp',
+                                                 delete=False) as f:
+                    f.write(text)
+                try:
+                    os.replace(f.name, os.path.join(directory, fname))
+                except OSError:
+                    os.unlink(f.name)
+                    raise
+            return True
+        except OSError:
+            self.flush_errors += 1
+            return False
+        finally:
+            self._flush_lock.release()
+
+    def reset(self):
+        with self._lock:
+            self._hist.clear()
+
+
+# Satu registry per proses server
+_metrics = StageMetrics()
+observe = _metrics.observe
+stage = _metrics.stage
+snapshot = _metrics.snapshot
+to_json = _metrics.to_json
+to_prometheus = _metrics.to_prometheus
+flush = _metrics.flush
+reset = _metrics.reset
@@ -0,0 +1,33 @@
+# tests/conftest.py
+"""
+Uji paritas jalur cepat vs implementasi acuan (versi kecil dari perintah
+`verify` di tiap modul). Modul repo berada di root dan membaca file relatif
+terhadap root (bmi_dataset.csv, Models/, nutrients/), jadi root dipasang di
+sys.path dan dijadikan cwd — sama dengan benchmarks/.
+
+    python -m pytest -q
+"""
+import os
+import sys
+import warnings
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+# Model lokal (tidak ikut repo, lihat .gitignore) — uji yang membutuhkannya di-skip bila tidak ada
+MODEL_PKL = os.path.join(ROOT, 'Models', 'random_forest_model.pkl')
+needs_model = pytest.mark.skipif(not os.path.exists(MODEL_PKL),
+                                 reason="Models/random_forest_model.pkl belum dibangun (python train.py build --overwrite)")
+
+
+@pytest.fixture(scope='session')
+def scaler():
+    import joblib
+
+    from resources import SCALER_PKL
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')  # InconsistentVersionWarning: pickle dari versi sklearn lain
+        return joblib.load(SCALER_PKL)
@@ -0,0 +1,17 @@
+import pytest
+
+from api import _options, parse_user
+
+USER = {'gender': 'Male', 'age': 25, 'height': 1.7, 'weight': 65, 'activity': 'Sedentary'}
+
+
+@pytest.mark.parametrize('body', [{'top_n': True}, {'top_n': 25.5}, {'top_n': 0}, {'seed': True}])
+def test_opsi_tidak_valid_ditolak(body):
+    with pytest.raises(ValueError):
+        _options(body)
+
+
+def test_angka_bool_ditolak():
+    with pytest.raises(ValueError, match="'age' harus berupa angka"):
+        parse_user({**USER, 'age': True}, need_activity=False)
+    assert _options({'top_n': 3.0}) == (3, None)
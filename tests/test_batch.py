@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from batch import _features, predict_status_batch, validate_users
+from tests.conftest import needs_model
+
+
+@needs_model
+def test_status_batch_sama_dengan_sklearn():
+    from resources import get_resources
+    res = get_resources()
+    rng = np.random.default_rng(0)
+    n = 3000
+    users = pd.DataFrame({
+        'gender': rng.choice(["Male", "Female"], n),
+        'age': rng.integers(5, 100, n),                       # sebagian di luar grid
+        'height': rng.integers(140, 210, n) / 100,
+        'weight': np.round(rng.uniform(30, 150, n), 1),       # berat 1 desimal
+    })
+    users = pd.concat([users, users.iloc[:500]], ignore_index=True)  # baris kembar
+    got = predict_status_batch(users, res)
+    X = _features(validate_users(users)[0])
+    np.testing.assert_array_equal(got, res.best_rf.predict(res.scaler.transform(X)))
+
+
+def test_activity_dan_pal_tidak_valid_dilewati():
+    base = {'age': 30, 'gender': "Male", 'height': 1.75, 'weight': 70}
+    users = pd.DataFrame([{**base, 'activity': a} for a in ("Jogging", None, "Sedentary (little to no activity)")])
+    _, reason = validate_users(users)
+    assert reason.tolist() == ["activity tidak dikenal", '', '']
+
+    cohort = pd.DataFrame([{**base, 'PAL': p} for p in (0, -1.2, "abc", None, 1.55, 2.5)])
+    _, reason = validate_users(cohort)
+    assert [r != '' for r in reason] == [True, True, True, False, False, False]
+
+
+def test_alasan_kolom_wajib_menang():
+    users = pd.DataFrame([{'age': 500, 'gender': "Male", 'height': 1.75, 'weight': 70, 'activity': "Jogging"}])
+    assert validate_users(users)[1].tolist() == ["age kosong atau di luar 1–120"]
@@ -0,0 +1,30 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+from bulk_pdf import read_roster, write_zip
+
+
+def test_user_id_duplikat_ditolak(tmp_path):
+    path = tmp_path / 'roster.csv'
+    path.write_text("user_id,age,gender,height,weight\n7,20,Male,1.7,60\n7,30,Female,1.6,50\n")
+    with pytest.raises(ValueError, match="duplikat"):
+        read_roster(path)
+
+
+def test_user_id_otomatis_unik(tmp_path):
+    path = tmp_path / 'roster.csv'
+    path.write_text("age,gender,height,weight\n20,Male,1.7,60\n30,Female,1.6,50\n")
+    assert read_roster(path)['user_id'].tolist() == [1, 2]
+
+
+def test_index_mencatat_user_dilewati(tmp_path):
+    output = tmp_path / 'laporan.zip'
+    stats = write_zip([], output, workers=0, skipped=[(3, "di luar tabel AKG"), (4, "gender bukan Male/Female")])
+    with zipfile.ZipFile(output) as zf:
+        rows = list(csv.DictReader(io.StringIO(zf.read('index.csv').decode())))
+    assert stats['reports'] == 0 and stats['skipped'] == 2
+    assert [(r['user_id'], r['file'], r['dilewati']) for r in rows] == [
+        ('3', '', "di luar tabel AKG"), ('4', '', "gender bukan Male/Female")]
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalog_artifact import build_catalog, expand_compact, load_catalog
+from resources import NUTRI_CSV, file_sha256, load_nutri_df_csv
+
+# Kasus tepi: file generik (None → dibuang), nama kosong '' (tetap dipakai, seperti CSV),
+# duplikat nama (keep='first') dan nilai yang tidak muat persis di float32.
+EXTRA = [
+    ('recipe-image-legacy-id-1_11-abc1234.jpg', 10.0, 1.0),
+    ('12345-abc1.jpg', 11.0, 2.0),
+    ('67890-def2.jpg', 12.0, 3.0),
+    ('chicken-soup-abc1234.jpg', 13.0, 4.0),
+    ('chicken-soup-99999.jpg', 14.0, 5.0),
+    ('presisi-tinggi-abc1234.jpg', 0.1234567891, 6.0),
+]
+
+
+@pytest.fixture()
+def small_csv(tmp_path):
+    df = pd.read_csv(NUTRI_CSV, nrows=300)
+    extra = pd.DataFrame([{**df.iloc[0].to_dict(), 'image': img, 'carbs': carbs, 'fat': fat}
+                          for img, carbs, fat in EXTRA])
+    df = pd.concat([df, extra], ignore_index=True)
+    df['index'] = np.arange(1, len(df) + 1)
+    path = tmp_path / 'nutrients.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def _paths(tmp_path):
+    return {'path': str(tmp_path / 'catalog.npz'), 'meta_path': str(tmp_path / 'catalog.json')}
+
+
+def test_paritas_dengan_csv(small_csv, tmp_path):
+    summary = build_catalog(small_csv, **_paths(tmp_path))
+    got = load_catalog(file_sha256(small_csv), **_paths(tmp_path))
+    expected = load_nutri_df_csv(small_csv)
+    assert summary['menus'] == len(expected) and (expected['Menu'] == '').sum() == 1
+    pd.testing.assert_frame_equal(expand_compact(got), expected, check_dtype=False, check_exact=True)
+
+
+def test_dtype_tetap_ringkas(small_csv, tmp_path):
+    build_catalog(small_csv, **_paths(tmp_path))
+    got = load_catalog(**_paths(tmp_path))
+    assert got['kcal'].dtype == np.float32 and got['carbs'].dtype == np.float64
+    assert 'carbs' not in got.attrs['decimals'] and got.attrs['decimals']['kcal'] is not None
+
+
+def test_build_inkremental(small_csv, tmp_path):
+    first = build_catalog(small_csv, **_paths(tmp_path))
+    assert first['changed'] == first['rows'] and not first['skipped']
+    assert build_catalog(small_csv, **_paths(tmp_path))['skipped']
+
+    df = pd.read_csv(small_csv)
+    df.loc[5, 'kcal'] += 1
+    df.loc[len(df) - 5, 'image'] = '12345-zzz9.jpg'
+    df.to_csv(small_csv, index=False)
+    second = build_catalog(small_csv, **_paths(tmp_path))
+    assert second['changed'] == 2
+    got = load_catalog(file_sha256(small_csv), **_paths(tmp_path))
+    pd.testing.assert_frame_equal(expand_compact(got), load_nutri_df_csv(small_csv), check_dtype=False,
+                                  check_exact=True)
+
+
+def test_hash_sumber_beda_ditolak(small_csv, tmp_path):
+    build_catalog(small_csv, **_paths(tmp_path))
+    assert load_catalog('0' * 64, **_paths(tmp_path)) is None
+    assert load_catalog(path=str(tmp_path / 'tidak-ada.npz'), meta_path=str(tmp_path / 'tidak-ada.json')) is None
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from energy import (ENERGY_COLS, PAL_LEVELS, check_parity, hitung_energi, hitung_energi_batch, pal_dari_label,
+                    random_users)
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_batch_identik_dengan_skalar(seed):
+    check_parity(rows=2000, seed=seed)
+
+
+def test_check_parity_tidak_bergantung_assert(monkeypatch):
+    # Paritas harus gagal dengan exception biasa (tetap aktif di bawah python -O)
+    import energy
+
+    real = energy.hitung_energi_batch
+    monkeypatch.setattr(energy, 'hitung_energi_batch', lambda *a: {**real(*a), 'tee': real(*a)['tee'] + 1e-9})
+    with pytest.raises(RuntimeError, match='tee'):
+        energy.check_parity(rows=10)
+
+
+def test_skalar_di_broadcast():
+    u = random_users(50, seed=3)
+    for label, pal in PAL_LEVELS.items():
+        got = hitung_energi_batch(u['gender'], u['age'], u['height'], u['weight'], pal, u['status'])
+        expected = hitung_energi_batch(u['gender'], u['age'], u['height'], u['weight'],
+                                       pal_dari_label(np.full(50, label)), u['status'])
+        for col in ENERGY_COLS:
+            np.testing.assert_array_equal(got[col], expected[col])
+
+
+def test_satu_user():
+    e = hitung_energi("Female", 30, 1.6, 55.0, "Sedentary (little to no activity)", "Normal")
+    got = hitung_energi_batch(np.array(["Female"]), 30, 1.6, 55.0, 1.2, np.array(["Normal"]))
+    assert {c: got[c][0] for c in ENERGY_COLS} == e.to_dict()
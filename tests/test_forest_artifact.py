@@ -0,0 +1,100 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_artifact import FlatForest, build_forest, flatten_forest, load_forest, verify_forest
+from resources import FEATURES
+from tests.conftest import needs_model
+from train import load_training_frame
+
+
+@pytest.fixture(scope='module')
+def small_rf(scaler):
+    df, _ = load_training_frame()
+    X = scaler.transform(df[FEATURES])
+    best_rf = RandomForestClassifier(n_estimators=10, max_depth=8, random_state=0, n_jobs=1)
+    return best_rf.fit(X, df['WeightStatus'])
+
+
+@pytest.fixture()
+def artifact(small_rf, tmp_path):
+    paths = {'path': str(tmp_path / 'forest.bin'), 'meta_path': str(tmp_path / 'forest.json'),
+             'model_pkl': str(tmp_path / 'model.pkl')}
+    joblib.dump(small_rf, paths['model_pkl'])
+    build_forest(small_rf, **paths)
+    return paths
+
+
+def _rows(scaler, n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return scaler.transform(np.column_stack([rng.integers(0, 2, n), rng.uniform(0, 110, n),
+                                             rng.uniform(1.0, 2.3, n), rng.uniform(20, 200, n)]))
+
+
+def test_flatten_identik_dengan_rf(small_rf, scaler):
+    arrays, max_depth = flatten_forest(small_rf)
+    forest = FlatForest(arrays, small_rf.classes_, small_rf.n_features_in_, max_depth)
+    X = _rows(scaler)
+    np.testing.assert_array_equal(forest.predict(X), small_rf.predict(X))
+    np.testing.assert_array_equal(forest.predict_proba(X), small_rf.predict_proba(X))
+
+
+def test_build_load_roundtrip(small_rf, scaler, artifact):
+    forest = load_forest(**artifact)
+    assert forest is not None and not forest.feature.flags.writeable
+    total, label_diff, proba_diff = verify_forest(forest, scaler, small_rf, extra_rows=2000)
+    assert total > 0 and label_diff == 0 and proba_diff == 0
+
+
+def test_muat_tanpa_pickle(artifact):
+    os.remove(artifact['model_pkl'])
+    assert load_forest(**artifact) is not None
+
+
+def test_pickle_lain_ditolak(artifact):
+    with open(artifact['model_pkl'], 'ab') as f:
+        f.write(b'\0')  # stat dan sha256 berubah
+    assert load_forest(**artifact) is None
+
+
+def test_stat_berubah_isi_sama_tetap_dimuat(artifact):
+    st = os.stat(artifact['model_pkl'])
+    os.utime(artifact['model_pkl'], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert load_forest(**artifact) is not None
+
+
+def test_input_salah_bentuk(small_rf):
+    arrays, max_depth = flatten_forest(small_rf)
+    forest = FlatForest(arrays, small_rf.classes_, small_rf.n_features_in_, max_depth)
+    with pytest.raises(ValueError):
+        forest.predict(np.zeros((3, 2)))
+    with pytest.raises(ValueError):
+        forest.predict(np.full((1, 4), np.nan))
+
+
+@needs_model
+def test_artefak_lokal_cocok_dengan_pickle(scaler):
+    from resources import MODEL_PKL
+    forest = load_forest()
+    if forest is None:
+        pytest.skip("artefak lokal belum dibangun (python forest_artifact.py build)")
+    best_rf = joblib.load(MODEL_PKL)
+    best_rf.n_jobs = 1
+    X = _rows(scaler, seed=1)
+    np.testing.assert_array_equal(forest.predict(X), best_rf.predict(X))
+    np.testing.assert_array_equal(forest.predict_proba(X), best_rf.predict_proba(X))
+
+
+def test_model_for_memilih_rute():
+    from dataclasses import fields
+
+    from forest_artifact import FLAT_FOREST_MAX_ROWS
+    from resources import Resources
+    base = {f.name: None for f in fields(Resources)}
+    res = Resources(**{**base, 'best_rf': 'sklearn', 'flat_forest': 'datar'})
+    assert res.model_for(1) == 'datar' and res.model_for(FLAT_FOREST_MAX_ROWS) == 'datar'
+    assert res.model_for(FLAT_FOREST_MAX_ROWS + 1) == 'sklearn'
+    assert Resources(**{**base, 'best_rf': 'sklearn'}).model_for(1) == 'sklearn'
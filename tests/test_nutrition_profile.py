@@ -0,0 +1,27 @@
+import pytest
+
+from nutrition_profile import AKG_LABELS, check_akg, check_targets, get_profile
+
+
+def test_akg_padat_identik_dengan_mask():
+    assert check_akg() == 3 * 101
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_target_batch_identik_dengan_profil(seed):
+    check_targets(rows=500, seed=seed)
+
+
+def test_profil_dibagi_dan_read_only():
+    args = ("Male", 25, 1.75, 70.0, "Sedentary (little to no activity)", "Normal")
+    p = get_profile(*args)
+    assert get_profile(*args) is p
+    with pytest.raises(TypeError):
+        p.akg['Energy'] = 0
+    assert set(p.akg_table()) == set(AKG_LABELS.values())
+
+
+def test_di_luar_tabel_akg():
+    p = get_profile("Male", 5, 1.1, 20.0, "Sedentary (little to no activity)", "Normal")
+    assert p.akg is None
+    assert all(v is None for v in p.akg_table().values())
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from session_cache import (COHORT_CACHE_MAX_BYTES, SESSION_CACHE_MAX_BYTES, get_session_cache,
+                           result_nbytes)
+
+
+class _Space:
+    def __init__(self):
+        self.catalog = pd.DataFrame({'a': np.zeros(1000)})  # bersama, tidak dihitung
+        self.X = np.zeros((100, 5))
+        self.smax = np.zeros((5, 101, 5))
+
+
+class _Planner:
+    def __init__(self):
+        self.space = _Space()
+        self.plans = []
+
+
+def test_array_planner_ikut_dihitung():
+    menu = pd.DataFrame({'kalori': np.zeros(10)})
+    tanpa = result_nbytes({'menus': {'menu_rec': menu}})
+    dengan = result_nbytes({'menus': {'menu_rec': menu, 'planner': _Planner()}})
+    assert dengan - tanpa == 100 * 5 * 8 + 5 * 101 * 5 * 8
+
+
+def test_cache_kohort_punya_batas_sendiri():
+    state = {}
+    assert get_session_cache(state).max_bytes == SESSION_CACHE_MAX_BYTES
+    assert get_session_cache(state, name='cohort_cache').max_bytes == COHORT_CACHE_MAX_BYTES
+    assert state['cohort_cache'] is not state['result_cache']
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from resources import encode_gender
+from status_grid import (AGE_RANGE, GRID_VERSION, build_status_grid, grid_points, load_status_grid,
+                         verify_status_grid)
+from tests.conftest import needs_model
+
+
+class _Identity:
+    def transform(self, X):
+        return np.asarray(X, dtype=float)
+
+
+class _BmiModel:
+    """Model tiruan: status dari BMI + gender, cukup untuk menguji indeks grid."""
+    classes_ = np.array(['Normal', 'Obesity', 'Overweight', 'Underweight'], dtype=object)
+
+    def predict(self, X):
+        X = np.asarray(X)
+        bmi = X[:, 3] / X[:, 2] ** 2 + X[:, 0]  # gender menggeser ambang → sumbu gender ikut teruji
+        return np.select([bmi < 18.5, bmi < 25, bmi < 30], ['Underweight', 'Normal', 'Overweight'],
+                         'Obesity').astype(object)
+
+
+@pytest.fixture(scope='module')
+def fake_grid(tmp_path_factory):
+    d = tmp_path_factory.mktemp('grid')
+    path, meta_path = str(d / 'grid.npy'), str(d / 'grid.json')
+    meta = build_status_grid(_Identity(), _BmiModel(), path, meta_path)
+    return load_status_grid(path, meta_path, expected_fingerprint=meta['model_fingerprint'])
+
+
+def test_grid_identik_dengan_model(fake_grid):
+    total, mismatch = verify_status_grid(fake_grid, _Identity(), _BmiModel())
+    assert total == len(grid_points()) and mismatch == 0
+
+
+def test_lookup_di_luar_grid(fake_grid):
+    g = int(encode_gender("Male"))
+    for weight in (70, 70.3, 88.3, 40.1, 129.9):
+        assert fake_grid.lookup(g, 30, 1.70, weight) == _BmiModel().predict([[g, 30, 1.70, weight]])[0]
+    for args in [(g, AGE_RANGE[0] - 1, 1.70, 70), (g, 30, 1.705, 70), (g, 30, 1.70, 70.35), (2, 30, 1.70, 70),
+                 (g, 30, 2.01, 70)]:
+        assert fake_grid.lookup(*args) is None, args
+
+
+def test_fingerprint_lain_ditolak(tmp_path):
+    path, meta_path = str(tmp_path / 'g.npy'), str(tmp_path / 'g.json')
+    build_status_grid(_Identity(), _BmiModel(), path, meta_path)
+    assert load_status_grid(path, meta_path, expected_fingerprint='lain') is None
+    assert GRID_VERSION >= 1
+
+
+@needs_model
+def test_grid_lokal_cocok_dengan_model_lokal(scaler):
+    import joblib
+
+    from resources import MODEL_PKL
+    grid = load_status_grid()
+    if grid is None:
+        pytest.skip("grid lokal belum dibangun (python status_grid.py build)")
+    best_rf = joblib.load(MODEL_PKL)
+    X = grid_points()[np.random.default_rng(0).choice(len(grid_points()), 5000, replace=False)]
+    got, on_grid = grid.lookup_many(X[:, 0], X[:, 1], X[:, 2], X[:, 3])
+    assert on_grid.all()
+    np.testing.assert_array_equal(got, best_rf.predict(scaler.transform(X)))
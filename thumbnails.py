@@ -0,0 +1,225 @@
+# thumbnails.py
+"""
+Pipeline thumbnail untuk nutrients/images.
+
+Gambar asli (±2.000 JPEG, ±200 MB) terlalu besar untuk kartu kecil di grid
+rekomendasi maupun sel 45 pt di PDF. Modul ini membuat turunan berukuran tetap
+(default 160 px untuk UI dan 90 px untuk PDF), paralel dengan process pool,
+dengan nama file berbasis hash isi gambar. Build bersifat inkremental: gambar
+yang ukuran/mtime-nya sama dengan manifest dilewati, dan gambar yang isinya
+sama (hash sama) tidak di-encode ulang.
+
+    python thumbnails.py                      # build/update semua thumbnail
+    python thumbnails.py --format jpeg --workers 4
+
+UI dan PDF memakai thumbnail_path(); bila thumbnail tidak ada, file asli dipakai.
+Thumbnail disimpan di bawah static/ sehingga Streamlit (server.enableStaticServing)
+menyajikannya langsung lewat HTTP; tabel hasil di app.py cukup mengirim URL-nya
+(thumbnail_url()).
+"""
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+IMAGE_ROOT = os.path.join('nutrients', 'images')
+# Folder static serving Streamlit (lihat .streamlit/config.toml), URL: app/static/<path>
+STATIC_ROOT = 'static'
+THUMB_ROOT = os.path.join(STATIC_ROOT, 'thumbs')
+MANIFEST = os.path.join(THUMB_ROOT, 'manifest.json')
+
+SIZE_UI = 160
+SIZE_PDF = 90
+SIZES = (SIZE_UI, SIZE_PDF)
+
+_EXTS = ('.jpg', '.jpeg', '.png')
+_SAVE_ARGS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+def content_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _make_thumbs(job):
+    """
+    Worker (dijalankan di process pool): buat semua ukuran untuk satu gambar.
+    Return dict entri manifest; gambar rusak dicatat dengan 'error'.
+    """
+    from PIL import Image, ImageOps
+
+    name, src, digest, sizes, fmt, thumb_root = job
+    ext = 'webp' if fmt == 'webp' else 'jpg'
+    thumbs = {}
+    try:
+        with Image.open(src) as im:
+            im = ImageOps.exif_transpose(im)
+            if im.mode == 'P':   # palet + transparansi → lewat RGBA agar tidak ada warning/artefak
+                im = im.convert('RGBA')
+            im = im.convert('RGB')
+            for size in sizes:
+                rel = os.path.join(str(size), f"{digest[:16]}.{ext}")
+                out = os.path.join(thumb_root, rel)
+                if not os.path.exists(out):
+                    os.makedirs(os.path.dirname(out), exist_ok=True)
+                    # Crop tengah ke kotak size×size agar kartu seragam
+                    thumb = ImageOps.fit(im, (size, size), Image.LANCZOS)
+                    tmp = out + '.tmp'
+                    thumb.save(tmp, **_SAVE_ARGS[fmt])
+                    os.replace(tmp, out)
+                thumbs[str(size)] = rel
+        return name, {'thumbs': thumbs, 'error': None}
+    except Exception as exc:
+        return name, {'thumbs': {}, 'error': f"{type(exc).__name__}: {exc}"}
+
+
+def _read_manifest(path=MANIFEST):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'version': 1, 'images': {}}
+
+
+def build_thumbnails(image_root=IMAGE_ROOT, thumb_root=THUMB_ROOT, sizes=SIZES, fmt='webp', workers=None):
+    """Build inkremental. Return ringkasan (jumlah dibuat/dilewati/gagal)."""
+    manifest_path = os.path.join(thumb_root, 'manifest.json')
+    manifest = _read_manifest(manifest_path)
+    if manifest.get('format') not in (None, fmt) or manifest.get('sizes') not in (None, list(sizes)):
+        manifest = {'version': 1, 'images': {}}   # format/ukuran berubah → bangun ulang semua
+    old = manifest['images']
+    new = {}
+    jobs = []
+    skipped = 0
+
+    for name in sorted(os.listdir(image_root)):
+        if not name.lower().endswith(_EXTS):
+            continue
+        src = os.path.join(image_root, name)
+        st = os.stat(src)
+        entry = old.get(name)
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns and (
+            entry.get('error') or all(os.path.exists(os.path.join(thumb_root, p)) for p in entry['thumbs'].values())
+        ):
+            new[name] = entry
+            skipped += 1
+            continue
+        digest = content_hash(src)
+        new[name] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': digest}
+        jobs.append((name, src, digest, tuple(sizes), fmt, thumb_root))
+
+    failed = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for name, result in pool.map(_make_thumbs, jobs, chunksize=16):
+                new[name].update(result)
+                failed += result['error'] is not None
+
+    os.makedirs(thumb_root, exist_ok=True)
+    manifest = {'version': 1, 'format': fmt, 'sizes': list(sizes), 'images': new}
+    tmp = manifest_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, manifest_path)
+    return {'built': len(jobs) - failed, 'skipped': skipped, 'failed': failed, 'total': len(new)}
+
+
+# ---------------------------------------------
+# Lookup saat request (manifest di-cache per proses, dimuat ulang jika berubah)
+# ---------------------------------------------
+_lock = threading.Lock()
+_index = {'mtime_ns': None, 'images': {}}
+
+
+def get_thumbnail_index(manifest_path=MANIFEST):
+    """{image: {size(str): path thumbnail}} dari manifest terakhir. Satu os.stat per panggilan."""
+    try:
+        mtime = os.stat(manifest_path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    if mtime != _index['mtime_ns']:
+        with _lock:
+            if mtime != _index['mtime_ns']:
+                root = os.path.dirname(manifest_path)
+                images = _read_manifest(manifest_path)['images']
+                _index['images'] = {
+                    name: {size: os.path.join(root, rel) for size, rel in e.get('thumbs', {}).items()}
+                    for name, e in images.items()
+                }
+                _index['mtime_ns'] = mtime
+    return _index['images']
+
+
+def thumbnail_path(image, size=SIZE_UI, index=None, image_root=IMAGE_ROOT):
+    """Path thumbnail `size` untuk file gambar `image`; fallback ke file asli."""
+    index = get_thumbnail_index() if index is None else index
+    thumb = index.get(image, {}).get(str(size))
+    return thumb if thumb is not None else os.path.join(image_root, image)
+
+
+@lru_cache(maxsize=512)
+def _data_uri(path, size, version):
+    """JPEG size×size (crop tengah) sebagai data URI; None bila file tidak bisa dibaca."""
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(path) as im:
+            im = ImageOps.exif_transpose(im)
+            if im.mode == 'P':
+                im = im.convert('RGBA')
+            thumb = ImageOps.fit(im.convert('RGB'), (size, size), Image.LANCZOS)
+    except Exception:
+        return None
+    buf = io.BytesIO()
+    thumb.save(buf, format='JPEG', quality=82)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+
+
+def thumbnail_url(image, size=SIZE_UI, index=None, image_root=IMAGE_ROOT):
+    """
+    URL gambar untuk <img> / st.column_config.ImageColumn. Thumbnail di bawah
+    STATIC_ROOT → 'app/static/...' (diambil browser langsung, tidak lewat websocket);
+    fallback (thumbnail belum dibangun) → data URI JPEG kecil, di-cache per file.
+    """
+    path = thumbnail_path(image, size, index, image_root)
+    rel = os.path.relpath(path, STATIC_ROOT)
+    if not rel.startswith(os.pardir):
+        return 'app/static/' + rel.replace(os.sep, '/')
+    try:
+        version = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    return _data_uri(path, size, version)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--format', choices=sorted(_SAVE_ARGS), default='webp')
+    ap.add_argument('--sizes', default=','.join(map(str, SIZES)), help='ukuran sisi (px), pisahkan koma')
+    ap.add_argument('--workers', type=int, default=None, help='jumlah proses (default: semua core)')
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    summary = build_thumbnails(sizes=tuple(int(s) for s in args.sizes.split(',')), fmt=args.format,
+                               workers=args.workers)
+    elapsed = time.perf_counter() - t0
+    print(f"thumbnail: {summary['built']} dibuat, {summary['skipped']} dilewati, "
+          f"{summary['failed']} gagal dari {summary['total']} gambar ({elapsed:.1f} s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+# train.py
+"""
+Pipeline training model status gizi — pengganti sel training project_pi.ipynb.
+
+Melatih scaler.pkl, label_encoder.pkl dan random_forest_model.pkl dari
+bmi_dataset.csv secara reprodusibel (seed tetap), lalu menulis
+train_manifest.json (hash data, parameter, skor CV, akurasi uji, waktu per
+tahap) dan hutan datar (forest_artifact.py).
+
+Secara default semua artefak ditulis ke Models/build/, BUKAN ke Models/:
+scaler.pkl dan label_encoder.pkl di Models/ ikut repo dan dipakai app. Dengan
+--overwrite artefak langsung menggantikan Models/ (yang dipantau app) dan grid
+status (status_grid.py) ikut dibangun ulang; hasil di Models/build/ bisa juga
+disalin manual lalu `python status_grid.py build`.
+
+Beda dengan notebook:
+- Pembersihan outlier (z-score |z| < 3 lalu IQR 1.5×, BMI di-log1p seperti di
+  notebook) dihitung sebagai SATU mask boolean atas array NumPy, bukan filter
+  DataFrame berulang per kolom. Catatan: notebook menghitung pembersihan ini tapi
+  melatih model dari bmi_df mentah; --no-clean mereproduksi perilaku itu.
+- Tuning: HalvingRandomSearchCV (successive halving) dengan n_estimators sebagai
+  resource (18 → 54 → 162 → 486 pohon) alih-alih RandomizedSearchCV n_iter=30,
+  cv=10 dengan 100–500 pohon untuk setiap kandidat. Ruang parameter lain sama.
+- Fold CV (StratifiedKFold) dihitung sekali dan dipakai ulang oleh semua
+  kandidat di semua iterasi; fit per fold tersebar ke semua core (n_jobs=-1).
+
+    python train.py build [--no-clean] [--candidates 30] [--cv 10] [--jobs -1] [--seed 42]
+    python train.py build --overwrite   # tulis ke Models/ (menimpa scaler/label encoder repo)
+    python train.py verify [--dir Models/build]   # hash data/artefak cocok dengan manifest + akurasi uji
+
+Waktu training vs pendekatan notebook: benchmarks/bench_train.py.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy.stats import randint
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from forest_artifact import FOREST_BIN, FOREST_META, build_forest
+from resources import (BMI_CSV, FEATURES, GENDER_CLASSES, LABEL_ENCODER_PKL, MODEL_DIR, MODEL_PKL, SCALER_PKL,
+                       file_sha256)
+
+MANIFEST_JSON = os.path.join(MODEL_DIR, 'train_manifest.json')
+MANIFEST_VERSION = 1
+# Tujuan default `build`: terpisah dari Models/ (scaler/label encoder di sana ikut repo)
+BUILD_DIR = os.path.join(MODEL_DIR, 'build')
+
+# Kolom numerik yang dibersihkan dari outlier (sama dengan bmi_num_cols di notebook);
+# BMI di-log1p dulu untuk mengurangi skewness
+OUTLIER_COLS = ['Age', 'HeightM', 'WeightKg', 'PAL', 'BMI']
+LOG_COLS = ['BMI']
+Z_MAX = 3.0
+IQR_K = 1.5
+
+# Ruang parameter notebook; n_estimators menjadi resource successive halving
+RF_PARAM_DIST = {
+    'max_depth': [None, 10, 20, 30, 40, 50],
+    'min_samples_split': randint(2, 11),
+    'min_samples_leaf': randint(1, 5),
+    'max_features': ['sqrt', 'log2'],
+    'bootstrap': [True, False],
+}
+MAX_TREES = 500
+HALVING_FACTOR = 3
+
+DEFAULT_SEED = 42
+DEFAULT_CV = 10
+DEFAULT_CANDIDATES = 30
+TEST_SIZE = 0.2
+
+
+# ---------------------------------------------
+# Data
+# ---------------------------------------------
+def status_dari_bmi(bmi):
+    """resources.klasifikasi_bmi untuk array BMI."""
+    bmi = np.asarray(bmi, dtype=np.float64)
+    return np.select([bmi < 18.5, bmi < 25.0, bmi < 30.0], ['Underweight', 'Normal', 'Overweight'], 'Obesity')
+
+
+def load_training_frame(path=BMI_CSV):
+    """bmi_dataset.csv → kolom FEATURES (Gender sudah di-encode) + PAL, BMI, WeightStatus."""
+    df = pd.read_csv(path).rename(columns={'Weight (kg)': 'WeightKg', 'Height (m)': 'HeightM'})
+    if 'BMI' not in df.columns:
+        df['BMI'] = df['WeightKg'] / (df['HeightM'] ** 2)
+    df = df.dropna(subset=['Gender', 'Age', 'HeightM', 'WeightKg', 'BMI']).reset_index(drop=True)
+    # Encoding gender seperti notebook: LabelEncoder (urutan alfabet → Female 0, Male 1)
+    gender_enc = LabelEncoder()
+    df['Gender'] = gender_enc.fit_transform(df['Gender'])
+    # resources.encode_gender (jalur serving) memakai mapping tetap ini
+    if tuple(gender_enc.classes_) != GENDER_CLASSES:
+        raise ValueError(f"kelas Gender {list(gender_enc.classes_)} ≠ {list(GENDER_CLASSES)} (resources.encode_gender)")
+    df['WeightStatus'] = status_dari_bmi(df['BMI'])
+    return df, gender_enc
+
+
+def outlier_mask(df, cols=OUTLIER_COLS, log_cols=LOG_COLS, z_max=Z_MAX, iqr_k=IQR_K):
+    """
+    Mask baris yang dipertahankan: |z| < z_max di semua kolom, lalu di dalam baris
+    itu nilai berada di [Q1 - k·IQR, Q3 + k·IQR] untuk semua kolom. Satu array
+    (n, kolom), tanpa salinan DataFrame per kolom; kuartil dihitung sekali per kolom.
+    """
+    vals = df[cols].to_numpy(dtype=np.float64)
+    log_idx = [cols.index(c) for c in log_cols if c in cols]
+    vals[:, log_idx] = np.log1p(vals[:, log_idx])
+    z = np.abs(vals - vals.mean(axis=0)) / vals.std(axis=0)
+    keep = (z < z_max).all(axis=1)
+    q1, q3 = np.quantile(vals[keep], [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    keep &= ((vals >= q1 - iqr_k * iqr) & (vals <= q3 + iqr_k * iqr)).all(axis=1)
+    return keep
+
+
+def make_folds(y, n_splits=DEFAULT_CV, seed=DEFAULT_SEED):
+    """Indeks fold CV dihitung sekali; dipakai ulang oleh semua kandidat & iterasi halving."""
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return list(skf.split(np.zeros(len(y)), y))
+
+
+def halving_search(X, y, folds, n_candidates=DEFAULT_CANDIDATES, seed=DEFAULT_SEED, n_jobs=-1):
+    """HalvingRandomSearchCV dengan n_estimators sebagai resource; return objek search yang sudah di-fit."""
+    search = HalvingRandomSearchCV(
+        RandomForestClassifier(random_state=seed),
+        param_distributions=RF_PARAM_DIST,
+        n_candidates=n_candidates,
+        resource='n_estimators',
+        max_resources=MAX_TREES,
+        min_resources='exhaust',
+        factor=HALVING_FACTOR,
+        cv=folds,
+        scoring='accuracy',
+        random_state=seed,
+        n_jobs=n_jobs,
+        refit=True,
+    )
+    search.fit(X, y)
+    return search
+
+
+# ---------------------------------------------
+# Build
+# ---------------------------------------------
+def _dump_atomic(obj, path):
+    # Tulis ke file sementara lalu rename: app yang sedang berjalan (resources.py
+    # memantau Models/*.pkl) tidak pernah membaca pickle setengah jadi
+    tmp = path + '.tmp'
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def artifact_paths(out_dir):
+    """Lokasi artefak training di out_dir (nama file sama dengan di Models/)."""
+    return {name: os.path.join(out_dir, os.path.basename(p)) for name, p in (
+        ('scaler', SCALER_PKL), ('label_encoder', LABEL_ENCODER_PKL), ('model', MODEL_PKL),
+        ('forest', FOREST_BIN), ('forest_meta', FOREST_META), ('manifest', MANIFEST_JSON))}
+
+
+def build(path=BMI_CSV, clean=True, n_candidates=DEFAULT_CANDIDATES, cv=DEFAULT_CV, n_jobs=-1,
+          seed=DEFAULT_SEED, grid=True, out_dir=BUILD_DIR):
+    """
+    Latih ulang scaler + label encoder + Random Forest; tulis artefak + manifest ke
+    out_dir. Grid status hanya dibangun bila out_dir = Models/ (fingerprint grid
+    terikat ke file di Models/). Return manifest.
+    """
+    paths = artifact_paths(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    timings = {}
+    t_total = time.perf_counter()
+
+    t0 = time.perf_counter()
+    df, gender_enc = load_training_frame(path)
+    rows_raw = len(df)
+    if clean:
+        df = df[outlier_mask(df)].reset_index(drop=True)
+    timings['load_clean'] = time.perf_counter() - t0
+
+    X = df[FEATURES]
+    y = df['WeightStatus'].to_numpy()
+    status_enc = LabelEncoder().fit(y)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=TEST_SIZE, random_state=seed)
+
+    t0 = time.perf_counter()
+    folds = make_folds(y_train, cv, seed)
+    search = halving_search(X_train, y_train, folds, n_candidates, seed, n_jobs)
+    timings['search'] = time.perf_counter() - t0 - search.refit_time_
+    timings['refit'] = search.refit_time_
+    best_rf = search.best_estimator_
+    test_accuracy = float(best_rf.score(X_test, y_test))
+
+    _dump_atomic(scaler, paths['scaler'])
+    _dump_atomic(status_enc, paths['label_encoder'])
+    _dump_atomic(best_rf, paths['model'])
+
+    t0 = time.perf_counter()
+    build_forest(best_rf, paths['forest'], paths['forest_meta'], model_pkl=paths['model'])
+    timings['forest_export'] = time.perf_counter() - t0
+
+    if grid and os.path.samefile(out_dir, MODEL_DIR):
+        t0 = time.perf_counter()
+        from status_grid import build_status_grid  # import lokal: status_grid memuat inference/resources
+        build_status_grid(scaler, best_rf)
+        timings['status_grid'] = time.perf_counter() - t0
+    timings['total'] = time.perf_counter() - t_total
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'data': {'path': path, 'sha256': file_sha256(path), 'rows': rows_raw, 'rows_used': len(df),
+                 'outlier_cleaning': clean},
+        'features': FEATURES,
+        'gender_classes': [str(c) for c in gender_enc.classes_],
+        'classes': [str(c) for c in best_rf.classes_],
+        'split': {'test_size': TEST_SIZE, 'train': len(y_train), 'test': len(y_test)},
+        'search': {
+            'method': 'HalvingRandomSearchCV', 'resource': 'n_estimators', 'max_resources': MAX_TREES,
+            'factor': HALVING_FACTOR, 'n_candidates': n_candidates, 'cv': cv,
+            'resources_per_iter': [int(r) for r in search.n_resources_],
+            'candidates_per_iter': [int(c) for c in search.n_candidates_],
+            'fits': int(sum(search.n_candidates_) * cv),
+        },
+        'best_params': {k: _to_json(v) for k, v in search.best_params_.items()},
+        'cv_accuracy': float(search.best_score_),
+        'test_accuracy': test_accuracy,
+        'seconds': {k: round(v, 3) for k, v in timings.items()},
+        'n_jobs': n_jobs,
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'sklearn': sklearn.__version__,
+        'artifacts': {os.path.basename(paths[k]): file_sha256(paths[k])
+                      for k in ('scaler', 'label_encoder', 'model', 'forest')},
+    }
+    with open(paths['manifest'], 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def verify(out_dir=BUILD_DIR):
+    """
+    Cek data & artefak di out_dir masih sama dengan manifest-nya dan akurasi uji
+    tereproduksi. Return daftar masalah.
+    """
+    paths = artifact_paths(out_dir)
+    with open(paths['manifest']) as f:
+        manifest = json.load(f)
+    problems = []
+    if tuple(manifest.get('gender_classes', ())) != GENDER_CLASSES:
+        problems.append(f"gender_classes manifest {manifest.get('gender_classes')} ≠ {list(GENDER_CLASSES)}")
+    data = manifest['data']
+    if file_sha256(data['path']) != data['sha256']:
+        problems.append(f"{data['path']} berubah sejak training")
+    for name, sha in manifest['artifacts'].items():
+        path = os.path.join(out_dir, os.path.basename(name))
+        if not os.path.exists(path):
+            problems.append(f"{path} tidak ada")
+        elif file_sha256(path) != sha:
+            problems.append(f"{path} tidak cocok dengan manifest")
+    if problems:
+        return problems
+
+    df, _ = load_training_frame(data['path'])
+    if data['outlier_cleaning']:
+        df = df[outlier_mask(df)].reset_index(drop=True)
+    scaler = joblib.load(paths['scaler'])
+    best_rf = joblib.load(paths['model'])
+    _, X_test, _, y_test = train_test_split(scaler.transform(df[FEATURES]), df['WeightStatus'].to_numpy(),
+                                            test_size=manifest['split']['test_size'], random_state=manifest['seed'])
+    acc = float(best_rf.score(X_test, y_test))
+    if acc != manifest['test_accuracy']:
+        problems.append(f"akurasi uji {acc:.4f} ≠ manifest {manifest['test_accuracy']:.4f}")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build')
+    p.add_argument('--data', default=BMI_CSV)
+    p.add_argument('--no-clean', dest='clean', action='store_false', help='latih dari data mentah (seperti notebook)')
+    p.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES)
+    p.add_argument('--cv', type=int, default=DEFAULT_CV)
+    p.add_argument('--jobs', type=int, default=-1, help='worker joblib (-1 = semua core)')
+    p.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    p.add_argument('--no-grid', dest='grid', action='store_false',
+                   help='jangan bangun ulang status_grid (hanya berlaku dengan --overwrite)')
+    p.add_argument('--out-dir', default=BUILD_DIR, help='folder artefak (default: %(default)s)')
+    p.add_argument('--overwrite', action='store_true',
+                   help='tulis langsung ke Models/, menimpa scaler.pkl/label_encoder.pkl yang ikut repo')
+    v = sub.add_parser('verify')
+    v.add_argument('--dir', default=BUILD_DIR, help='folder berisi train_manifest.json (default: %(default)s)')
+    args = ap.parse_args(argv)
+
+    if args.command == 'build':
+        out_dir = MODEL_DIR if args.overwrite else args.out_dir
+        if not args.overwrite and os.path.abspath(out_dir) == os.path.abspath(MODEL_DIR):
+            print(f"--out-dir {out_dir} akan menimpa {SCALER_PKL} dan {LABEL_ENCODER_PKL} — tambahkan --overwrite",
+                  file=sys.stderr)
+            return 2
+        m = build(args.data, args.clean, args.candidates, args.cv, args.jobs, args.seed, args.grid, out_dir)
+        s, d = m['search'], m['data']
+        print(f"data: {d['rows_used']}/{d['rows']} baris ({'dibersihkan' if d['outlier_cleaning'] else 'mentah'})\n"
+              f"halving: kandidat {s['candidates_per_iter']} × pohon {s['resources_per_iter']}, "
+              f"{s['fits']} fit, cv={s['cv']}\n"
+              f"best: {m['best_params']}\n"
+              f"akurasi CV {m['cv_accuracy']:.4f}, uji {m['test_accuracy']:.4f}\n"
+              f"waktu: " + ", ".join(f"{k} {v:.1f} s" for k, v in m['seconds'].items()) + "\n"
+              f"artefak + manifest → {out_dir}"
+              + ("" if args.overwrite else f" (pakai di app: salin ke {MODEL_DIR}/ atau jalankan dengan --overwrite)"))
+        return 0
+
+    manifest = artifact_paths(args.dir)['manifest']
+    if not os.path.exists(manifest):
+        print(f"{manifest} tidak ada — manifest tidak ikut repo; jalankan `python train.py build` dulu",
+              file=sys.stderr)
+        return 2
+    problems = verify(args.dir)
+    for msg in problems:
+        print(msg, file=sys.stderr)
+    if not problems:
+        print(f"artefak cocok dengan {manifest}; akurasi uji tereproduksi")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())